@@ -4,6 +4,8 @@
 • 대상 : verify_db.T_X_IMG_VERIFY  중  c_admin IS NULL
 • 좌측 800×600 원본 이미지  ┃ 우측 검수 결과·코멘트·관리자 입력
 • 승인(A) / 반려(R)  →  c_admin, t_admin_comment, c_admin_user, d_admin
+• 대기 목록은 keyset 페이지(PAGE_SIZE 건)로 받아오고, 끝에 가까워지면 다음 페이지
+• 이미지는 고정 워커 풀에서 앞쪽 PREFETCH_AHEAD 건을 WHERE i_img IN (...) 한 번으로 선읽기
 • 모든 QThread 보관 → 안전 종료 (no “Destroyed while thread is running”)
 ────────────────────────────────────────────────────────────────
 필수 패키지
@@ -11,44 +13,28 @@
     pip install pandas requests
 """
 
-import sys, os, traceback, configparser, requests
+import sys, os, traceback, requests
 from datetime import datetime
-import psycopg2, psycopg2.pool
-import mysql.connector.pooling
+from utils.pool import make_pool as _make_pool
 from PyQt5.QtCore    import Qt, QThread, pyqtSignal, QUrl
 from PyQt5.QtGui     import QPixmap
+from utils.qt_prefetch import PixmapLRU, Prefetcher, fit_pixmap
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QPushButton, QTextEdit,
     QHBoxLayout, QVBoxLayout, QSplitter, QMessageBox, QInputDialog
 )
 
-# ───────────────── 1. DB 풀 ─────────────────────────────────
-class MySQLPoolAdapter:
-    def __init__(self, p): self._p = p
-    def getconn(self):     return self._p.get_connection()
-    def putconn(self, c):  c.close()
+PAGE_SIZE       = int(os.getenv("ADMIN_PAGE_SIZE", "200"))    # 대기 목록 한 번에 받을 건수
+PAGE_MARGIN     = 20                                           # 남은 항목이 이만큼이면 다음 페이지
+PREFETCH_AHEAD  = int(os.getenv("PREFETCH_AHEAD", "5"))
+PREFETCH_BATCH  = 8                                            # IN (...) 한 번에 묶을 이미지 수
+CACHE_MAX_BYTES = int(os.getenv("REVIEW_CACHE_MAX_BYTES", str(256 << 20)))
 
+# ───────────────── 1. DB 풀 ─────────────────────────────────
 def make_pool(section, ini="db_config.ini"):
-    cfg = configparser.ConfigParser(inline_comment_prefixes=(';', '#'))
-    cfg.read(ini, encoding="utf-8")
-    p = cfg[section]
-    drv = p.get("driver", "postgres").lower()
+    # 웹 앱과 같은 풀 구현 사용 (postgres / mariadb 모두 getconn/putconn, 스레드 안전)
     try:
-        if drv == "postgres":
-            pool = psycopg2.pool.SimpleConnectionPool(
-                1, int(p.get("pool_max", 10)),
-                host=p["host"], port=p["port"],
-                dbname=p["dbname"], user=p["user"], password=p["password"])
-        else:
-            mp = mysql.connector.pooling.MySQLConnectionPool(
-                pool_name   = f"{section}_pool",
-                pool_size   = int(p.get("pool_max", 10)),
-                host        = p["host"], port=int(p["port"]),
-                database    = p["dbname"],
-                user        = p["user"], password=p["password"],
-                autocommit  = True)
-            pool = MySQLPoolAdapter(mp)
-
+        pool = _make_pool(section, ini)
         pool.putconn(pool.getconn())  # 연결 테스트
         return pool
     except Exception as e:
@@ -56,31 +42,49 @@ def make_pool(section, ini="db_config.ini"):
 
 # ───────────────── 2. 스레드 ────────────────────────────────
 class FetchPending(QThread):
-    done = pyqtSignal(list); err = pyqtSignal(str)
-    def __init__(self, pool): super().__init__(); self.pool = pool
+    """
+    대기 목록 한 페이지 (d_verify, i_img) keyset — after 다음부터 limit 건
+    MariaDB 오름차순은 NULL 이 맨 앞 → 마지막 행의 d_verify 가 NULL 이면
+    남은 NULL 행(i_img 순) + NULL 아닌 행 전부가 다음 페이지
+    """
+    done = pyqtSignal(list, bool); err = pyqtSignal(str)
+    def __init__(self, pool, after=None, limit=PAGE_SIZE):
+        super().__init__(); self.pool = pool; self.after = after; self.limit = limit
     def run(self):
         try:
-            cn = self.pool.getconn(); cur = cn.cursor(dictionary=True)
-            cur.execute(
-                "SELECT i_img,c_verify,t_comment,c_reviewer "
-                "FROM T_X_IMG_VERIFY WHERE c_admin IS NULL "
-                "ORDER BY d_verify"
-            )
-            rows = cur.fetchall(); self.pool.putconn(cn)
-            self.done.emit(rows)
+            sql = ("SELECT i_img,c_verify,t_comment,c_reviewer,d_verify "
+                   "FROM T_X_IMG_VERIFY WHERE c_admin IS NULL")
+            params = []
+            if self.after:
+                d, i = self.after
+                if d is None:
+                    sql += " AND ((d_verify IS NULL AND i_img > %s) OR d_verify IS NOT NULL)"
+                    params += [i]
+                else:
+                    sql += " AND (d_verify > %s OR (d_verify = %s AND i_img > %s))"
+                    params += [d, d, i]
+            sql += " ORDER BY d_verify, i_img LIMIT %s"
+            cn = self.pool.getconn()
+            try:
+                cur = self.pool.cursor(cn, dict_cursor=True)
+                cur.execute(sql, params + [self.limit + 1])
+                rows = [dict(r) for r in cur.fetchall()]; cur.close()
+            finally:
+                self.pool.putconn(cn)
+            self.done.emit(rows[:self.limit], len(rows) > self.limit)
         except Exception: self.err.emit(traceback.format_exc())
 
-class FetchImage(QThread):
-    done = pyqtSignal(bytes); err = pyqtSignal(str)
-    def __init__(self, pool, i_img): super().__init__(); self.pool=pool; self.i_img=i_img
-    def run(self):
-        try:
-            cn=self.pool.getconn(); cur=cn.cursor()
-            cur.execute("SELECT b_img FROM T_X_IMG WHERE i_img=%s",(self.i_img,))
-            row=cur.fetchone(); self.pool.putconn(cn)
-            if not row or row[0] is None: self.err.emit("이미지 없음"); return
-            self.done.emit(bytes(row[0]))
-        except Exception: self.err.emit(traceback.format_exc())
+def fetch_images(pool, keys):
+    """i_img 여러 개 → {i_img: b_img} (워커 풀에서 호출, 한 번의 IN 조회)"""
+    cn = pool.getconn()
+    try:
+        cur = cn.cursor()
+        cur.execute("SELECT i_img,b_img FROM T_X_IMG WHERE i_img IN (%s)"
+                    % ",".join(["%s"] * len(keys)), tuple(keys))
+        rows = cur.fetchall(); cur.close()
+    finally:
+        pool.putconn(cn)
+    return {r[0]: r[1] for r in rows if r[1] is not None}
 
 class SaveAdmin(QThread):
     done = pyqtSignal(); err = pyqtSignal(str)
@@ -117,8 +121,19 @@ class AdminReview(QWidget):
         self.pool_img    = make_pool("image_db")
         self.pool_verify = make_pool("verify_db")
 
-        # 대기목록 로딩
+        # 대기목록 로딩 (keyset 페이지)
         self.pending = []; self.idx = 0
+        self.more = True; self.loading = False
+        self.after = None            # 마지막으로 받은 (d_verify, i_img)
+        self.wait_step = None        # 페이지 끝에서 이동 요청 → 받은 뒤 이어서 이동
+
+        # 이미지 선읽기 (고정 워커 풀 + 바이트 상한 LRU)
+        self.cache = PixmapLRU(CACHE_MAX_BYTES)
+        self.prefetch = Prefetcher(fetch_many=lambda keys: fetch_images(self.pool_img, keys),
+                                   batch=PREFETCH_BATCH, size=(800, 600), workers=2,
+                                   cache=self.cache, parent=self)
+        self.prefetch.loaded.connect(self.on_image)
+        self.prefetch.failed.connect(self.on_image_fail)
 
         # --- UI ----------
         self.pic = QLabel(alignment=Qt.AlignCenter)
@@ -171,40 +186,71 @@ class AdminReview(QWidget):
         self.logs=self.logs[-3:]+[f"[{t}] {m}"]
         self.log.setPlainText("\n".join(self.logs))
 
-    # ------- 초기 목록 -------
+    # ------- 대기 목록 (페이지 단위) -------
     def load_pending(self):
-        th = FetchPending(self.pool_verify); self._track(th)
-        th.done.connect(self.set_pending); th.err.connect(self.error)
+        if self.loading or not self.more: return
+        th = FetchPending(self.pool_verify, self.after); self._track(th)
+        th.done.connect(self.add_pending); th.err.connect(self.error)
+        self.loading = True
         th.start(); self._log("대기 목록 로딩…")
 
-    def set_pending(self, rows):
-        if not rows:
+    def add_pending(self, rows, more):
+        self.loading = False; self.more = more
+        first = not self.pending
+        self.pending += rows
+        if rows: self.after = (rows[-1]['d_verify'], rows[-1]['i_img'])
+        if not self.pending:
             QMessageBox.information(self,"완료","미승인 항목이 없습니다."); self.close(); return
-        self.pending = rows; self.idx = 0; self.show_current()
+        step, self.wait_step = self.wait_step, None
+        if first: self.idx = 0; self.show_current()
+        elif step is not None: self.move(step)
+        else: self._update_title()
+
+    def _need_more(self):
+        if self.more and len(self.pending) - self.idx <= PAGE_MARGIN: self.load_pending()
+
+    def _update_title(self):
+        it = self.pending[self.idx]
+        total = f"{len(self.pending)}{'+' if self.more else ''}"
+        self.setWindowTitle(f"{it['i_img']}  ({self.idx+1}/{total})")
 
     # ------- 표시 -------
     def show_current(self):
         it = self.pending[self.idx]
         i_img = it['i_img']
+        self._need_more()
         self.info.setHtml(
             f"<b>이미지 ID:</b> {i_img}<br>"
             f"<b>검수자:</b> {it['c_reviewer']}<br>"
             f"<b>결과:</b> {it['c_verify']}<br>"
             f"<b>검수자 코멘트:</b><br>{it['t_comment']}"
         )
-        # 이미지
-        fx = FetchImage(self.pool_img, i_img); self._track(fx)
-        fx.done.connect(self._set_pixmap); fx.err.connect(self.error); fx.start()
-
-        self.setWindowTitle(f"{i_img}  ({self.idx+1}/{len(self.pending)})")
+        # 이미지: 캐시에 있으면 즉시, 아니면 현재 + 앞쪽 PREFETCH_AHEAD 건 선읽기
+        pix = self.cache.pixmap(i_img)
+        if pix is not None: self.pic.setPixmap(fit_pixmap(pix, self.pic.size()))
+        else: self.pic.setText("🔄 로딩…")
+        n = len(self.pending)
+        ahead = [self.pending[(self.idx + k) % n]['i_img'] for k in range(min(PREFETCH_AHEAD + 1, n))]
+        self.prefetch.request(ahead + [self.pending[self.idx - 1]['i_img']])
+
+        self._update_title()
         self.comment.clear()
 
-    def _set_pixmap(self, blob: bytes):
-        pix = QPixmap(); pix.loadFromData(blob)
-        self.pic.setPixmap(pix)
+    def on_image(self, i_img, blob, img):
+        pix = QPixmap.fromImage(img); self.cache.put(i_img, blob, pix)
+        if self.pending and i_img == self.pending[self.idx]['i_img']:
+            self.pic.setPixmap(fit_pixmap(pix, self.pic.size()))
+
+    def on_image_fail(self, i_img, msg):
+        if not self.pending or i_img != self.pending[self.idx]['i_img']: return
+        if "\n" in msg.strip(): self.error(msg)
+        else: self.pic.setText(msg); self._log(f"{msg}: {i_img}")
 
     # ------- 네비 -------
     def move(self, step):
+        # 아직 안 받은 페이지가 있으면 끝에서 처음으로 돌지 않고 대기
+        if self.more and self.idx + step >= len(self.pending):
+            self.wait_step = step; self.load_pending(); self._log("다음 페이지 로딩 중…"); return
         self.idx = (self.idx + step) % len(self.pending)
         self.show_current()
 
@@ -222,6 +268,10 @@ class AdminReview(QWidget):
     def after_save(self, i_img):
         self._log(f"저장 완료: {i_img}")
         del self.pending[self.idx]
+        if self.more and self.idx >= len(self.pending):
+            # 받아 둔 목록 끝 → 다음 페이지를 받은 뒤 그 첫 항목으로
+            self.idx = len(self.pending) - 1; self.wait_step = 1
+            self.load_pending(); return
         if not self.pending:
             QMessageBox.information(self, "완료", "모든 항목 처리 완료"); self.close(); return
         if self.idx >= len(self.pending): self.idx = 0
@@ -232,6 +282,7 @@ class AdminReview(QWidget):
         QMessageBox.critical(self,"오류",msg); self._log("오류")
 
     def closeEvent(self, e):
+        self.prefetch.shutdown()
         for th in list(self._threads):
             if th.isRunning():
                 th.quit(); th.wait()
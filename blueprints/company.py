@@ -1,9 +1,17 @@
 # blueprints/company.py
 from flask import Blueprint, request, jsonify, current_app
-import os, configparser, re
+import os, configparser, re, threading
 from utils.db import db_select_all, db_execute 
+from utils.schema import SCHEMA
+from utils.name_index import CompanyNameIndex, NAMES_TAG, score_batch
+from utils.navtree import NAV, NAV_TAG, changed as nav_changed
+from utils.respcache import cached, purge, tag_version
+from utils.geocode import stored_coord_columns
+from utils.dedup import DupStore, run_scan
+from extensions import logger
 from functools import lru_cache
-from typing import List, Tuple, Dict, Optional
+from types import MappingProxyType
+from typing import List, Tuple, Dict, Optional, Mapping
 
 company_bp = Blueprint("company", __name__, url_prefix="/api/company")
 
@@ -87,28 +95,8 @@ def _row_to_dict(row):
             raise
 
 def _columns_of_table(conn, dialect: str, table: str) -> List[str]:
-    cur = _cursor(conn, dialect, dict_cursor=False)
-    try:
-        if dialect == "postgresql":
-            cur.execute("""
-                SELECT column_name
-                  FROM information_schema.columns
-                 WHERE table_schema = 'public' AND table_name = %s
-            """, (table,))
-            cols = [r[0] for r in cur.fetchall()]
-        elif dialect == "mysql":
-            cur.execute("""
-                SELECT column_name
-                  FROM information_schema.columns
-                 WHERE table_schema = DATABASE() AND table_name = %s
-            """, (table,))
-            cols = [r[0] for r in cur.fetchall()]
-        else:  # sqlite
-            cur.execute(f"PRAGMA table_info({table})")
-            cols = [r[1] for r in cur.fetchall()]
-        return cols
-    finally:
-        cur.close()
+    # information_schema 조회는 SCHEMA 캐시가 테이블당 1회(TTL)만 수행
+    return list(SCHEMA.columns(conn, dialect, table))
 
 def _get_connection():
     cp = _load_db_config()
@@ -155,14 +143,24 @@ def _pick_first(cols_lc: set, *cands) -> Optional[str]:
             return cand
     return None
 
-def _ensure_company_colmap(conn, dialect: str):
+_COLMAP_SNAPSHOT = {}   # (dialect, table, columns) -> MappingProxyType
+
+def _ensure_company_colmap(conn, dialect: str) -> Mapping[str, Optional[str]]:
     """
     환경변수로 지정되지 않았거나 실제 테이블에 없는 경우,
     흔한 컬럼명 패턴을 기반으로 보조 매핑을 시도합니다.
+    결과는 읽기 전용 스냅샷으로 고정되며, 컬럼 목록이 같으면 재계산하지 않습니다.
+    (전역 COLMAP 은 수정하지 않음 → 요청 스레드 간 경합 없음)
     """
-    cm = COLMAP["companies"]
-    table = cm["table"]
-    cols = _columns_of_table(conn, dialect, table)
+    base = COLMAP["companies"]
+    table = base["table"]
+    cols = tuple(_columns_of_table(conn, dialect, table))
+    key = (dialect, table, cols)
+    snap = _COLMAP_SNAPSHOT.get(key)
+    if snap is not None:
+        return snap
+
+    cm = dict(base)
     cols_lc = {c.lower(): c for c in cols}  # lc -> original
     def resolve(*names):  # 실제 존재하는 원본 컬럼명 반환
         pick = _pick_first(set(cols_lc.keys()), *names)
@@ -179,7 +177,7 @@ def _ensure_company_colmap(conn, dialect: str):
     if cm["emd"] not in cols:
         cm["emd"] = resolve("emd", "emd_nm", "dong", "dong_nm", "li_nm", "eupmyeon", "eupmyeondong")
     # address variants
-    for key, candidates in {
+    for key_, candidates in {
         "address": ("address", "addr", "full_addr", "addr_full"),
         "road_addr": ("road_addr", "rd_addr", "rdnm_addr", "roadaddress", "raddr"),
         "jibun_addr": ("jibun_addr", "lotno_addr", "lno_addr", "jibunaddress", "jaddr"),
@@ -195,10 +193,15 @@ def _ensure_company_colmap(conn, dialect: str):
         "category": ("category", "cate", "induty", "industry", "bupjong", "업종"),
         "ceo": ("ceo", "owner", "repr_nm", "대표자명"),
     }.items():
-        if cm.get(key) not in cols:
+        if cm.get(key_) not in cols:
             guessed = resolve(*candidates)
             if guessed:
-                cm[key] = guessed
+                cm[key_] = guessed
+
+    snap = MappingProxyType(cm)
+    _COLMAP_SNAPSHOT.clear()        # 스키마가 바뀌었으면 이전 스냅샷은 폐기
+    _COLMAP_SNAPSHOT[key] = snap
+    return snap
 
 # ------------------------------------------------------------------------------
 # [4] 주소/메타 정규화(응답용)
@@ -243,13 +246,47 @@ def _normalize_company_name(s: str) -> str:
         s = s.replace(w, "")
     return s
 
-def _score_similarity(a: str, b: str) -> int:
+# 회사명 n-gram 역색인 (pg_trgm 없을 때 python fuzzy 경로에서 사용)
+NAME_INDEX = CompanyNameIndex(
+    _normalize_company_name,
+    refresh_ttl=float(os.getenv("NAME_INDEX_REFRESH_TTL", "60")),
+    full_ttl=float(os.getenv("NAME_INDEX_FULL_TTL", "3600")),
+)
+NAME_INDEX_ENABLED = os.getenv("NAME_INDEX", "1") == "1"
+
+def _names_changed():
+    """병합/삭제로 색인을 고친 뒤 호출 → 다른 워커의 NAME_INDEX 도 다음 검색 때 전체 재적재"""
+    prev = tag_version(NAMES_TAG)
+    purge(NAMES_TAG)
+    NAME_INDEX.adopt(prev, tag_version(NAMES_TAG))
+
+def _name_index_rows(conn, dialect: str, cm: Mapping, since=None):
+    idc, namec, emdc = cm.get("id"), cm.get("name"), cm.get("emd") or cm.get("dong")
+    ph = _param_placeholder(dialect)
+    where = f"WHERE c.{idc} > {ph}" if since is not None else ""
+    cur = _cursor(conn, dialect, dict_cursor=False)
     try:
-        from rapidfuzz import fuzz
-        return max(int(fuzz.ratio(a, b)), int(fuzz.partial_ratio(a, b)))
-    except Exception:
-        from difflib import SequenceMatcher
-        return int(round(100 * SequenceMatcher(None, a, b).ratio()))
+        cur.execute(f"SELECT c.{idc}, c.{namec}, c.{emdc} FROM {cm['table']} c {where} ORDER BY c.{idc}",
+                    [since] if since is not None else [])
+        while True:
+            chunk = cur.fetchmany(5000)
+            if not chunk:
+                break
+            yield from chunk
+    finally:
+        cur.close()
+
+def _name_index_search(conn, dialect: str, cm: Mapping, emd: str, company: str,
+                       threshold: float, limit: int):
+    """색인으로 (id, score) 목록 반환. 색인 사용 불가/해당 동 없음 → None"""
+    if not NAME_INDEX_ENABLED or not cm.get("id") or not (cm.get("emd") or cm.get("dong")):
+        return None
+    NAME_INDEX.ensure_fresh(
+        lambda: _name_index_rows(conn, dialect, cm),
+        lambda since: _name_index_rows(conn, dialect, cm, since),
+        tag_version(NAMES_TAG),
+    )
+    return NAME_INDEX.search(emd, company, threshold, limit)
 
 def _as_bool(v) -> bool:
     return str(v).strip().lower() in {"1", "true", "t", "yes", "y", "on"}
@@ -281,9 +318,11 @@ def _find_companies(
     threshold: float = 70.0,
     pool: int = 300,
     return_scores: bool = False,
+    columns: Optional[List[str]] = None,
 ):
-    cm = COLMAP["companies"]
-    _ensure_company_colmap(conn, dialect)  # 자동 보정
+    """columns 지정 시 SELECT * 대신 해당 컬럼만 조회"""
+    cm = _ensure_company_colmap(conn, dialect)  # 자동 보정 (캐시된 스냅샷)
+    sel = ", ".join(f"c.{col}" for col in columns) if columns else "c.*"
 
     table = cm["table"]
     namec = cm["name"]
@@ -309,7 +348,7 @@ def _find_companies(
     if not fuzzy:
         where_addr, n_addr = _build_or_like_clause("c", all_filters, ph) if all_filters else ("TRUE", 0)
         sql = f"""
-        SELECT *
+        SELECT {sel}
           FROM {table} c
          WHERE {where_addr}
            AND LOWER(COALESCE(c.{namec}, '')) LIKE {ph}
@@ -334,7 +373,7 @@ def _find_companies(
         th = threshold/100.0 if threshold > 1 else float(th)
         where_addr, n_addr = _build_or_like_clause("c", all_filters, ph) if all_filters else ("TRUE", 0)
         sql = f"""
-        SELECT c.*, similarity(LOWER(c.{namec}), {ph}) AS score
+        SELECT {sel}, similarity(LOWER(c.{namec}), {ph}) AS score
           FROM {table} c
          WHERE {where_addr}
            AND LOWER(c.{namec}) % {ph}
@@ -356,10 +395,36 @@ def _find_companies(
                                "method": "pg_trgm", "query": q_company}
         return rows
 
-    # 2-2) 기타 → 주소 조건으로 후보 pool 뽑은 후 파이썬에서 유사도
+    # 2-2) 회사명 n-gram 색인 → 후보 id 만 DB 에서 조회
+    hits = _name_index_search(conn, dialect, cm, emd, q_company, threshold, limit)
+    if hits is not None:
+        if not hits:
+            return []
+        ids = [h[0] for h in hits]
+        if dialect == "postgresql":
+            cond, params = f"c.{idc} = ANY({ph})", [ids]
+        else:
+            cond, params = f"c.{idc} IN ({', '.join([ph] * len(ids))})", ids
+        cur = _cursor(conn, dialect, dict_cursor=True)
+        try:
+            cur.execute(f"SELECT {sel} FROM {table} c WHERE {cond}", params)
+            by_id = {str(r[idc]): r for r in (_row_to_dict(x) for x in cur.fetchall())}
+        finally:
+            cur.close()
+        rows = []
+        for cid, sc in hits:
+            r = by_id.get(str(cid))
+            if r is None:
+                continue
+            if return_scores:
+                r["_match"] = {"score": sc, "method": "ngram_index", "query": q_company}
+            rows.append(r)
+        return rows
+
+    # 2-3) 기타 → 주소 조건으로 후보 pool 뽑은 후 파이썬에서 유사도
     where_addr, n_addr = _build_or_like_clause("c", all_filters, ph) if all_filters else ("TRUE", 0)
     sql_pool = f"""
-    SELECT *
+    SELECT {sel}
       FROM {table} c
      WHERE {where_addr}
      LIMIT {pool}
@@ -371,10 +436,10 @@ def _find_companies(
     finally:
         cur.close()
 
+    # 후보 전체를 한 번에 점수 계산 (행마다 cdist 를 부르면 스레드 풀 기동 비용이 후보 수만큼)
+    scores = score_batch(q_norm, [_normalize_company_name(str(r.get(namec, "")).strip()) for r in cand])
     rescored: List[Tuple[dict, int]] = []
-    for r in cand:
-        name_val = str(r.get(namec, "")).strip()
-        s = _score_similarity(_normalize_company_name(name_val), q_norm)
+    for r, s in zip(cand, scores):
         if s >= threshold:
             if return_scores:
                 r["_match"] = {"score": s, "method": "python_fuzzy", "query": q_company}
@@ -385,7 +450,7 @@ def _find_companies(
 # 간판 연계: company_id → bizno → (회사명+주소) 순
 def _find_signboards_for_company(conn, dialect: str, company_row: dict, emd: str, limit: int = 100):
     s = COLMAP["signboards"]
-    c = COLMAP["companies"]
+    c = _ensure_company_colmap(conn, dialect)
     t_s = s["table"]
     sb_cols = set(_columns_of_table(conn, dialect, t_s))
     ph = _param_placeholder(dialect)
@@ -401,7 +466,7 @@ def _find_signboards_for_company(conn, dialect: str, company_row: dict, emd: str
             cur.close()
 
     # 2) 사업자번호(bizno)
-    if s["bizno"] in sb_cols and c["bizno"] in company_row and company_row.get(c["bizno"]):
+    if s["bizno"] in sb_cols and c.get("bizno") in company_row and company_row.get(c["bizno"]):
         cur = _cursor(conn, dialect, dict_cursor=True)
         try:
             cur.execute(f"SELECT * FROM {t_s} WHERE {s['bizno']} = {ph} LIMIT {limit}",
@@ -429,6 +494,69 @@ def _find_signboards_for_company(conn, dialect: str, company_row: dict, emd: str
     finally:
         cur.close()
 
+def _company_columns(conn, dialect: str, cm: Mapping) -> List[str]:
+    """COLMAP(스냅샷)이 가리키는 회사 컬럼 중 실제 존재하는 것만 (응답 조립에 필요한 최소 집합)"""
+    cols = set(_columns_of_table(conn, dialect, cm["table"]))
+    return sorted({v for k, v in cm.items() if k != "table" and v and v in cols})
+
+def _find_signboards_for_companies(conn, dialect: str, companies: List[dict], cm: Mapping,
+                                   emd: str, limit: int = 100) -> Dict[int, List[dict]]:
+    """
+    여러 회사의 간판을 FK 기준 한 번의 쿼리로 조회 (회사별 최대 limit 건).
+    반환: {companies 리스트 인덱스: [간판 dict, ...]}
+    FK 값이 없는 회사만 기존 단건 로직(bizno / 회사명+주소)으로 폴백.
+    """
+    s = COLMAP["signboards"]
+    t_s = s["table"]
+    sb_cols = set(_columns_of_table(conn, dialect, t_s))
+    fk, idc = s["company_id"], cm.get("id")
+    out: Dict[int, List[dict]] = {i: [] for i in range(len(companies))}
+
+    by_id: Dict[str, List[int]] = {}
+    rest = []
+    for i, comp in enumerate(companies):
+        if fk in sb_cols and idc and comp.get(idc) is not None:
+            by_id.setdefault(str(comp[idc]), []).append(i)
+        else:
+            rest.append(i)
+
+    if by_id:
+        proj = sorted({v for k, v in s.items() if k != "table" and v and v in sb_cols})
+        sel = ", ".join(f"s.{col}" for col in proj)
+        order = f"s.{s['id']}" if s["id"] in sb_cols else f"s.{fk}"
+        ids = [companies[idx[0]][idc] for idx in by_id.values()]   # 원래 타입 유지 → FK 인덱스 사용
+        if dialect == "postgresql":
+            cond, params = f"s.{fk} = ANY(%s)", [ids]
+        else:
+            ph = _param_placeholder(dialect)
+            cond, params = f"s.{fk} IN ({', '.join([ph] * len(ids))})", list(ids)
+        sql = f"""
+        SELECT {', '.join(proj)}
+          FROM (
+                SELECT {sel},
+                       ROW_NUMBER() OVER (PARTITION BY s.{fk} ORDER BY {order}) AS _rn
+                  FROM {t_s} s
+                 WHERE {cond}
+               ) x
+         WHERE x._rn <= {int(limit)}
+        """
+        cur = _cursor(conn, dialect, dict_cursor=True)
+        try:
+            cur.execute(sql, params)
+            for r in cur.fetchall():
+                d = _row_to_dict(r)
+                for i in by_id.get(str(d.get(fk)), ()):
+                    out[i].append(d)
+        finally:
+            cur.close()
+
+    for i in rest:
+        out[i] = _find_signboards_for_company(conn, dialect, companies[i], emd, limit=limit)
+    return out
+
+def _sanitize(d: dict):
+    return {k: (v.isoformat() if hasattr(v, "isoformat") else v) for k, v in d.items()}
+
 # ------------------------------------------------------------------------------
 # [7] API 엔드포인트
 # ------------------------------------------------------------------------------
@@ -443,6 +571,9 @@ def api_company_signboards():
     return_scores = _as_bool(request.args.get("return_scores", "0"))
     threshold = request.args.get("threshold", type=float) or 70.0
     pool = request.args.get("pool", type=int) or 300
+    # engine=batch(기본): 회사 1쿼리 + 간판 1쿼리, 필요한 컬럼만 조회
+    # engine=legacy     : 회사별 간판 조회(SELECT *) – 기존 응답과 동일한 컬럼이 필요할 때
+    engine = (request.args.get("engine") or "batch").strip().lower()
 
     if not emd or not company:
         return jsonify({"ok": False, "error": "필수 파라미터 누락: emd, company"}), 400
@@ -453,6 +584,7 @@ def api_company_signboards():
     dialect = "postgresql"   # image_db가 postgres라면 이렇게 고정
 
     try:
+        cm = _ensure_company_colmap(conn, dialect)
         companies = _find_companies(
             conn, dialect,
             emd=emd,
@@ -462,16 +594,19 @@ def api_company_signboards():
             threshold=threshold,
             pool=pool,
             return_scores=return_scores,
+            columns=_company_columns(conn, dialect, cm) if engine == "batch" else None,
         )
 
-        cm = COLMAP["companies"]
+        if engine == "batch":
+            sb_map = _find_signboards_for_companies(conn, dialect, companies, cm, emd, limit=sbk)
+
         results = []
-        for comp in companies:
+        for i, comp in enumerate(companies):
             view = _compose_address_view(cm, comp)
-            signboards = _find_signboards_for_company(conn, dialect, comp, emd, limit=sbk)
-
-            def _sanitize(d: dict):
-                return {k: (v.isoformat() if hasattr(v, "isoformat") else v) for k, v in d.items()}
+            if engine == "batch":
+                signboards = sb_map[i]
+            else:
+                signboards = _find_signboards_for_company(conn, dialect, comp, emd, limit=sbk)
 
             comp_aug = _sanitize(comp)
             comp_aug.update(view)
@@ -484,7 +619,8 @@ def api_company_signboards():
 
         return jsonify({
             "ok": True,
-            "query": {"emd": emd, "company": company, "fuzzy": fuzzy, "threshold": threshold, "pool": pool},
+            "query": {"emd": emd, "company": company, "fuzzy": fuzzy, "threshold": threshold, "pool": pool,
+                      "engine": engine},
             "count": len(results),
             "results": results,
         }), 200
@@ -536,8 +672,7 @@ def api_company_search():
 
     try:
         # 테이블/컬럼 매핑 자동 보정 (t_b_cpn 기준)
-        _ensure_company_colmap(conn, dialect)
-        cm = COLMAP["companies"]
+        cm = _ensure_company_colmap(conn, dialect)
         id_col = cm.get("id")
         name_col = cm.get("name")
         emd_col = cm.get("emd") or cm.get("dong")
@@ -625,78 +760,74 @@ def api_company_search():
         except Exception:
             pass
 
+# ======================
+# 스키마 캐시 무효화 (컬럼 추가/변경 후 호출)
+# ======================
+@company_bp.post("/schema/refresh")
+def api_schema_refresh():
+    SCHEMA.invalidate()
+    _COLMAP_SNAPSHOT.clear()
+    return jsonify({"ok": True, "generation": SCHEMA.generation})
+
+# ======================
+# 동/번지/회사 탐색 트리 (utils.navtree.NAV)
+# ======================
+def _nav_load():
+    c = cfg()
+    companies = q(f"""
+      SELECT {c['COL_ID']},
+             COALESCE({c['COL_COMP']}, {c['COL_COMP_FALLBACK']}),
+             {c['COL_DONG']},
+             {c['COL_BUNJI']},
+             COALESCE({c['COL_BUNJI2']}, '')
+        FROM {c['META_TABLE']}
+    """)
+    counts = q(f"""
+      SELECT {c['COL_CP_IDX']}, COUNT({c['COL_ADIDX']})
+        FROM {c['SIGN_TABLE']}
+       GROUP BY {c['COL_CP_IDX']}
+    """)
+    return companies, counts
+
+def nav():
+    # 공유 태그 버전이 바뀌었으면(다른 워커의 병합/삭제) TTL 전이라도 재적재
+    NAV.ensure_fresh(_nav_load, tag_version(NAV_TAG))
+    return NAV
+
+@company_bp.post("/nav/refresh")
+def api_nav_refresh():
+    NAV.invalidate()
+    purge(NAV_TAG)                   # 다른 워커도 재적재
+    nav()
+    return jsonify({"ok": True})
+
 # ======================
 # 동 목록
 # ======================
 @company_bp.get("/dongs")
+@cached(ttl=300, tags=lambda: ["dongs", NAV_TAG])
 def api_dongs():
-    c = cfg()
-    sql = f"""
-      SELECT DISTINCT {c['COL_DONG']}
-        FROM {c['META_TABLE']}
-       WHERE {c['COL_DONG']} IS NOT NULL AND TRIM({c['COL_DONG']})<>''
-       ORDER BY {c['COL_DONG']}
-    """
-    rows = q(sql)
-    return jsonify({"dongs": [r[0] for r in rows]})
+    return jsonify({"dongs": nav().dongs()})
 
 # ======================
 # 동 통계
 # ======================
 @company_bp.get("/dongs_with_stats")
 def api_dongs_with_stats():
-    c = cfg()
-    # 🔎 디버깅: 현재 config에 들어간 값 확인
-    print("=== DEBUG: COL_ID 매핑 확인 ===")
-    print("COL_ID =", c.get("COL_ID"))
-    print("COL_CP_IDX =", c.get("COL_CP_IDX"))
-    print("META_TABLE =", c.get("META_TABLE"))
-    print("SIGN_TABLE =", c.get("SIGN_TABLE"))
-
-
-    sql = f"""
-      SELECT dong,
-             COUNT(*) AS total,
-             SUM(CASE WHEN sign_count > 0 THEN 1 ELSE 0 END) AS reviewed
-        FROM (
-            SELECT c.{c['COL_DONG']} AS dong,
-                   c.{c['COL_ID']}   AS company_id,
-                   COUNT(s.{c['COL_ADIDX']}) AS sign_count
-              FROM {c['META_TABLE']} c
-         LEFT JOIN {c['SIGN_TABLE']} s
-                ON s.{c['COL_CP_IDX']} = c.{c['COL_ID']}  -- ✅ i_cpn = c_id
-             WHERE c.{c['COL_DONG']} IS NOT NULL
-               AND TRIM(c.{c['COL_DONG']}) <> ''
-             GROUP BY c.{c['COL_DONG']}, c.{c['COL_ID']}
-        ) t
-    GROUP BY dong
-    ORDER BY dong
-    """
-    rows = db_select_all(sql, (), use=c["META_POOL"])
-    return jsonify({
-        "dongs": [{"dong": r[0], "total": int(r[1]), "reviewed": int(r[2])} for r in rows]
-    })
+    # total = 동 내 회사 수, reviewed = 간판이 1건 이상 연결된 회사 수
+    return jsonify({"dongs": nav().dongs_with_stats()})
 
 # ======================
 # 번지 목록
 # ======================
 @company_bp.get("/bunjis/<path:dong>")
 def api_get_bunjis(dong):
-    c = cfg()
     dong = (dong or "").strip()
     if not dong:
         return jsonify({"bunjis": []})
 
     # 부분 일치 허용 (예: "부산광역시 사하구 당리동" 에서 "당리동"만 넣어도 매칭)
-    sql = f"""
-      SELECT DISTINCT {c['COL_BUNJI']}
-        FROM {c['META_TABLE']}
-       WHERE {c['COL_DONG']} LIKE %s
-         AND {c['COL_BUNJI']} IS NOT NULL AND TRIM({c['COL_BUNJI']})<>''
-       ORDER BY {c['COL_BUNJI']}
-    """
-    rows = q(sql, (f"%{dong}%",))
-    return jsonify({"bunjis": [r[0] for r in rows]})
+    return jsonify({"bunjis": nav().bunjis(dong)})
 
 
 # ======================
@@ -704,37 +835,20 @@ def api_get_bunjis(dong):
 # ======================
 @company_bp.get("/companies/<path:dong>/<path:bunji>")
 def api_get_companies(dong, bunji):
-    c = cfg()
     dong, bunji = (dong or "").strip(), (bunji or "").strip()
     if not dong or not bunji:
         return jsonify({"companies": []})
-
-    sql = f"""
-        SELECT
-            c.{c['COL_ID']} AS cidx,
-            COALESCE(c.{c['COL_COMP']}, c.{c['COL_COMP_FALLBACK']}) AS company_name,
-            COALESCE(c.{c['COL_BUNJI2']}, '') AS addr2,
-            COUNT(s.{c['COL_ADIDX']}) AS ad_count
-          FROM {c['META_TABLE']} c
-     LEFT JOIN {c['SIGN_TABLE']} s
-            ON s.{c['COL_CP_IDX']} = c.{c['COL_ID']}
-         WHERE c.{c['COL_DONG']} LIKE %s AND c.{c['COL_BUNJI']}=%s
-         GROUP BY
-            c.{c['COL_ID']},
-            COALESCE(c.{c['COL_COMP']}, c.{c['COL_COMP_FALLBACK']}),
-            COALESCE(c.{c['COL_BUNJI2']}, '')
-         ORDER BY 2, 1
-    """
-    rows = q(sql, (f"%{dong}%", bunji))
-    comps = [{"id": str(r[0]), "name": r[1], "addr2": r[2], "ad_count": int(r[3])} for r in rows]
-    return jsonify({"companies": comps})
+    return jsonify({"companies": nav().companies(dong, bunji)})
 
 # ======================
 # 회사 상세 (/api/company/info/<company_id>)
 # ======================
 @company_bp.get("/info/<company_id>")
+@cached(ttl=300, tags=lambda company_id: [f"cpn:{company_id}"])
 def api_company_info(company_id):
     c = cfg()
+    coord_cols = stored_coord_columns(c)
+    coord_sel = f"{coord_cols[0]}, {coord_cols[1]}" if coord_cols else "NULL, NULL"
     sql = f"""
       SELECT {c['COL_ID']},
              {c['COL_COMP']},
@@ -742,7 +856,8 @@ def api_company_info(company_id):
              {c['COL_BUNJI']},
              {c['COL_BUNJI2']},
              COALESCE(t_add_road, '') AS road,
-             COALESCE(t_tel, '') AS tel
+             COALESCE(t_tel, '') AS tel,
+             {coord_sel}
         FROM {c['META_TABLE']}
        WHERE {c['COL_ID']}=%s
        LIMIT 1
@@ -751,7 +866,7 @@ def api_company_info(company_id):
     if not rows:
         return jsonify({"ok": False, "msg": "not found"}), 404
 
-    cid, name, dong, bunji, bunji2, road, tel = rows[0]
+    cid, name, dong, bunji, bunji2, road, tel, lat, lng = rows[0]
     return jsonify({"ok": True, "info": {
         "company_id": str(cid),
         "company_name": name,
@@ -759,7 +874,9 @@ def api_company_info(company_id):
         "bunji": bunji,
         "bunji2": bunji2,
         "road": road,
-        "tel": tel
+        "tel": tel,
+        "lat": float(lat) if lat is not None else None,   # 저장 좌표 (없으면 null)
+        "lng": float(lng) if lng is not None else None,
     }})
 
 
@@ -828,6 +945,11 @@ def api_company_delete():
             f"DELETE FROM {c['META_TABLE']} WHERE {c['COL_ID']}=%s",
             (i_cpn,), use=c["META_POOL"]
         )
+        NAME_INDEX.remove(i_cpn)
+        NAV.remove_company(i_cpn)
+        _names_changed()
+        nav_changed()
+        purge(f"cpn:{i_cpn}", "dongs", "illegal")
         return jsonify({"ok": True})
     except Exception as e:
         # 서버 로그로 정확한 원인 확인에 도움
@@ -849,11 +971,95 @@ def api_merge_companies():
     ph = ",".join(["%s"] * len(ids))
     ex(f"UPDATE {c['META_TABLE']} SET {c['COL_COMP']}=%s WHERE {c['COL_ID']} IN ({ph})",
        [canonical] + ids, pool="META_POOL")
+    for cid in ids:
+        NAME_INDEX.upsert(cid, canonical)
+        NAV.rename(cid, canonical)
 
     targets = [x for x in ids if x != canonical_id]
     if targets:
         ph2 = ",".join(["%s"] * len(targets))
         ex(f"UPDATE {c['SIGN_TABLE']} SET {c['COL_CP_IDX']}=%s WHERE {c['COL_CP_IDX']} IN ({ph2})",
            [canonical_id] + targets, pool="IMG_POOL")
+        NAV.move_signs(targets, canonical_id)
+    _names_changed()
+    nav_changed()
+    purge(*[f"cpn:{x}" for x in ids], "company_names", "illegal")
+    _dup_store().resolve(ids, how="merge")     # 병합한 회사끼리는 중복 후보에서 제외
 
     return jsonify({"ok": True, "canonical_id": canonical_id, "merged_ids": targets})
+
+# ------------------------------------------------------------------------------
+# [8] 중복 후보 (utils.dedup — 전체 스캔 결과를 SQLite 에서 페이지 조회)
+# ------------------------------------------------------------------------------
+def _dup_store() -> DupStore:
+    c = cfg()
+    if "DUP_STORE" not in c:
+        c["DUP_STORE"] = DupStore(c["DUPES_DB"])
+    return c["DUP_STORE"]
+
+@company_bp.get("/duplicates")
+def api_duplicates():
+    """?after=<rank>&limit=50&dong=&min_score=&all=1 (all: 처리된 묶음 포함)"""
+    store = _dup_store()
+    run_id = request.args.get("run", type=int) or store.current_run()
+    if run_id is None:
+        return jsonify({"ok": True, "run": None, "total": 0, "items": [], "next_after": None})
+    after = request.args.get("after", 0, type=int)
+    limit = max(1, min(request.args.get("limit", 50, type=int), 500))
+    dong = (request.args.get("dong") or "").strip() or None
+    include = _as_bool(request.args.get("all", "0"))
+    items = store.page(run_id, after=after, limit=limit, dong=dong,
+                       min_score=request.args.get("min_score", type=float), include_dismissed=include)
+    return jsonify({
+        "ok": True, "run": run_id, "items": items,
+        "total": store.count(run_id, dong=dong, include_dismissed=include),
+        "next_after": items[-1]["rank"] if len(items) == limit else None,
+    })
+
+@company_bp.get("/duplicates/runs")
+def api_duplicate_runs():
+    return jsonify({"ok": True, "runs": _dup_store().runs()})
+
+@company_bp.post("/duplicates/scan")
+def api_duplicate_scan():
+    """전체 스캔을 백그라운드로 시작 → 202 (진행 상황은 /duplicates/runs)"""
+    c = cfg()
+    store, pool = _dup_store(), c["META_POOL"]
+    cols = {"id": c["COL_ID"], "name": c["COL_COMP"], "dong": c["COL_DONG"],
+            "bunji": c["COL_BUNJI"], "road": c.get("COL_ROAD")}
+    started = threading.Event()
+    box = {}
+
+    def on_start(run_id):
+        box["run"] = run_id
+        started.set()
+
+    def work():
+        try:
+            if run_scan(store, pool, _normalize_company_name, c["META_TABLE"], cols,
+                        workers=c.get("DUP_WORKERS", 0), log=logger.info, on_start=on_start) is None:
+                box["busy"] = True
+        except Exception as e:
+            box["error"] = f"{type(e).__name__}: {e}"
+            logger.exception("[/api/company/duplicates/scan] ERROR")
+        finally:
+            started.set()
+    threading.Thread(target=work, name="dup-scan", daemon=True).start()
+    started.wait(30)
+    if box.get("run") is not None:
+        return jsonify({"ok": True, "run": box["run"]}), 202
+    if box.get("busy"):
+        return jsonify({"ok": False, "msg": "이미 실행 중인 스캔이 있습니다."}), 409
+    if "error" in box:
+        return jsonify({"ok": False, "msg": box["error"]}), 500
+    # 30초 안에 시작 못 함 (스키마 조회 지연 등) — 스캔은 계속 진행, 상태는 /duplicates/runs
+    return jsonify({"ok": True, "run": None, "msg": "스캔 시작 대기 중"}), 202
+
+@company_bp.post("/duplicates/<int:rank>/dismiss")
+def api_duplicate_dismiss(rank):
+    """묶음을 '중복 아님'으로 처리 (다음 스캔부터 같은 조합 제외)"""
+    store = _dup_store()
+    run_id = request.args.get("run", type=int) or store.current_run()
+    if run_id is None or store.dismiss(run_id, rank) is None:
+        return jsonify({"ok": False, "msg": "후보 묶음 없음"}), 404
+    return jsonify({"ok": True, "run": run_id, "rank": rank})
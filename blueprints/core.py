@@ -1,6 +1,7 @@
 # blueprints/core.py
 
-from flask import Blueprint, render_template, session, redirect, url_for, request
+from flask import Blueprint, render_template, session, redirect, url_for, request, jsonify, current_app
+from utils.http import HTTP
 
 core_bp = Blueprint("core", __name__)
 
@@ -28,6 +29,10 @@ def home():
 def company_merge():
     return render_template("company_merge.html")
 
+@core_bp.route("/duplicates")
+def duplicates_page():
+    return render_template("duplicates.html")
+
 @core_bp.route("/review-sheet")
 def review_sheet_page():
     if "reviewer_name" not in session:
@@ -45,3 +50,15 @@ def sign_edit():
 @core_bp.route("/view_reviews")
 def view_reviews():
     return render_template("view_reviews.html")
+
+# === DB 풀 상태 ===
+@core_bp.route("/api/pools")
+def api_pool_stats():
+    c = current_app.config
+    return jsonify({k: c[k].stats() for k in ("META_POOL", "IMG_POOL", "VER_POOL")
+                    if hasattr(c.get(k), "stats")})
+
+# === 외부 HTTP 호출 통계 (호스트별) ===
+@core_bp.route("/api/http_stats")
+def api_http_stats():
+    return jsonify(HTTP.metrics())
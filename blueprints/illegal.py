@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify, render_template, session, current_app
 from utils.db import db_select_all
+from utils.respcache import cached
 
 illegal_bp = Blueprint("illegal", __name__)
 
@@ -10,6 +11,7 @@ def illegal_page():
 
 # === 불법/신고 간판 존재하는 동 목록 ===
 @illegal_bp.route("/dongs")
+@cached(ttl=300, tags=lambda: ["dongs", "illegal"])
 def api_illegal_dongs():
     c = current_app.config
     sql = f"""
@@ -2,8 +2,7 @@
 import os, base64
 from datetime import datetime
 from flask import Blueprint, current_app, request, render_template, jsonify, send_from_directory
-from PIL import Image
-import io as _io
+from utils.imgproc import ImageBusy, encode_jpeg
 
 # Flask Blueprint
 images_bp = Blueprint("images", __name__, url_prefix="/images")
@@ -24,12 +23,14 @@ def get_maria():
 def is_aspect_4_3(w, h, tol=0.02):
     return abs((w/h) - (4/3)) <= tol
 
-def save_pil(img: Image.Image, subdir: str, stem: str):
+def save_jpeg(data: bytes, subdir: str, stem: str):
+    """이미 인코딩된 JPEG 바이트 저장 → (상대경로, 절대경로)"""
     d = os.path.join(upload_folder(), subdir)
     os.makedirs(d, exist_ok=True)
     fname = f"{stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg"
     fpath = os.path.join(d, fname)
-    img.convert("RGB").save(fpath, quality=90)
+    with open(fpath, "wb") as fp:
+        fp.write(data)
     rel = os.path.relpath(fpath, upload_folder()).replace("\\","/")
     return rel, fpath
 
@@ -49,8 +50,14 @@ def images_upload():
     if "file" not in request.files:
         return jsonify(ok=False, error="No file"), 400
     f = request.files["file"]
-    img = Image.open(f.stream)
-    rel, _ = save_pil(img, "originals", "img")
+    # 디코딩/인코딩은 이미지 프로세스 풀에서 (JPEG 은 그대로 통과)
+    try:
+        data = current_app.config["IMAGE_SERVICE"].run(encode_jpeg, f.read(), 90)
+    except ImageBusy as e:
+        resp = jsonify(ok=False, error=str(e)); resp.status_code = 503
+        resp.headers["Retry-After"] = "2"
+        return resp
+    rel, _ = save_jpeg(data, "originals", "img")
     return jsonify(ok=True, relpath=rel)
 
 @images_bp.route("/uploads/<path:filename>")
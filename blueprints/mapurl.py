@@ -1,61 +1,57 @@
 # blueprints/mapurl.py
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from urllib.parse import quote_plus
 from utils.db import db_select_all, db_execute
-from utils.geocode import geocode_kakao, GeocodeError
+from utils.geocode import compose_address, stored_coord_columns
 from extensions import logger
-
-# META_TABLE, META_POOL, COL_ID, COL_DONG, COL_BUNJI, COL_BUNJI2는 config에서 import
-# 예시:
-# from config import META_TABLE, META_POOL, COL_ID, COL_DONG, COL_BUNJI, COL_BUNJI2
+from utils.respcache import purge
 
 mapurl_bp = Blueprint("mapurl", __name__, url_prefix="/api/map")
 
 # === 로드뷰 URL 조회 ===
+def _roadview_url(lng, lat):
+    return f"https://map.naver.com/v5/roadview/{lat},{lng}?c={lng},{lat},0,0,0,dh"
+
+
 @mapurl_bp.route("/roadview_url")
 def api_company_roadview_url():
     """
     /api/map/roadview_url?i_cpn=...
-    1) META_TABLE에서 도로명 주소(t_add_road)를 우선 조회
-    2) Kakao 지오코딩으로 (lng, lat) 좌표 → 네이버 v5 로드뷰 URL 반환
-    3) 실패 시 네이버 검색 URL 폴백
+    1) META_TABLE 에 저장된 좌표(COL_LAT/COL_LON, geocode_backfill.py)가 있으면 그대로 사용
+    2) 없으면 주소로 네이버 검색 URL 폴백 (주소도 없으면 404)
+    요청 경로에서는 지오코딩/DB 갱신을 하지 않음 — 좌표는 geocode_backfill.py 로 채움
     """
     i_cpn = (request.args.get("i_cpn") or "").strip()
     if not i_cpn:
         return jsonify({"ok": False, "msg": "i_cpn required"}), 400
 
+    c = current_app.config
     try:
-        # 회사 주소 조회 (도로명 주소 포함)
+        coord_cols = stored_coord_columns(c)
+        coord_sel = f", {coord_cols[0]}, {coord_cols[1]}" if coord_cols else ", NULL, NULL"
+
+        # 회사 주소 + 저장 좌표 조회
         rows = db_select_all(
-            f"SELECT t_add_road, {COL_DONG}, {COL_BUNJI}, {COL_BUNJI2} "
-            f"FROM {META_TABLE} WHERE {COL_ID}=%s LIMIT 1",
-            (i_cpn,), use=META_POOL
+            f"SELECT t_add_road, {c['COL_DONG']}, {c['COL_BUNJI']}, {c['COL_BUNJI2']}{coord_sel} "
+            f"FROM {c['META_TABLE']} WHERE {c['COL_ID']}=%s LIMIT 1",
+            (i_cpn,), use=c["META_POOL"]
         )
         if not rows:
             return jsonify({"ok": False, "msg": "company not found"}), 404
 
-        road, dong, bunji, bunji2 = rows[0]
+        road, dong, bunji, bunji2, lat, lng = rows[0]
+        addr = compose_address(road, dong, bunji, bunji2)
 
-        # 주소 문자열: 도로명 주소 > 동/번지 조합
-        if road and str(road).strip():
-            addr = str(road).strip()
-        else:
-            parts = [x for x in [dong, bunji, bunji2] if x]
-            addr = " ".join(map(str, parts)).strip()
+        if lat is not None and lng is not None:
+            lng, lat = float(lng), float(lat)
+            return jsonify({"ok": True, "url": _roadview_url(lng, lat), "addr": addr,
+                            "lng": lng, "lat": lat, "source": "stored"})
 
+        # 좌표가 없으면 요청 경로에서 지오코딩하지 않음 (geocode_backfill.py 가 채움)
         if not addr:
-            return jsonify({"ok": False, "msg": "empty address"}), 400
-
-        # Kakao 지오코딩 → 네이버 로드뷰 URL
-        try:
-            result = geocode_kakao(addr)
-            lng, lat = result["lng"], result["lat"]
-            url = f"https://map.naver.com/v5/roadview/{lat},{lng}?c={lng},{lat},0,0,0,dh"
-            return jsonify({"ok": True, "url": url, "addr": addr, "lng": lng, "lat": lat})
-        except GeocodeError as e:
-            logger.warning("[roadview_url] geocode ERROR: %s", e)
-            url = f"https://map.naver.com/v5/search/{quote_plus(addr)}"
-            return jsonify({"ok": True, "url": url, "addr": addr, "lng": None, "lat": None})
+            return jsonify({"ok": False, "msg": "no stored coordinates and empty address"}), 404
+        url = f"https://map.naver.com/v5/search/{quote_plus(addr)}"
+        return jsonify({"ok": True, "url": url, "addr": addr, "lng": None, "lat": None, "source": "search"})
 
     except Exception as e:
         logger.error("[/api/map/roadview_url] fetch meta ERROR: %s", e)
@@ -83,7 +79,8 @@ def api_company_roadview_save():
         DO UPDATE SET navrv_url=EXCLUDED.navrv_url, updated_at=NOW()
     """
     try:
-        db_execute(sql, (i_cpn, navrv_url))
+        db_execute(sql, (i_cpn, navrv_url), use=current_app.config["META_POOL"])
+        purge(f"cpn:{i_cpn}")
         return jsonify({"ok": True})
     except Exception as e:
         logger.error("[/api/map/roadview_save] ERROR: %s", e)
@@ -1,18 +1,71 @@
-from flask import Blueprint, request, jsonify, render_template, session, send_file
-from utils.db import db_select_all, db_execute
+from flask import Blueprint, request, jsonify, render_template, session, current_app, Response, stream_with_context, send_file
+from config import Config
+from utils.db import db_select_all, db_execute, db_iter
+from utils.journal import WriteBehindQueue
 import datetime as dt
-import pandas as pd
-from io import BytesIO
+import atexit, base64, csv, io, json, os, re, tempfile
 
 review_bp = Blueprint("review", __name__)
 
+def ver_pool():
+    return current_app.config["VER_POOL"]
+
 # === 검수 요약 페이지 ===
 @review_bp.route("/summary-page")
 def review_summary_page():
     return render_template("summary.html", reviewer=session.get("reviewer_name", ""))
 
 
-# === 검수 로그 기록 ===
+# === 검수 로그 기록 (write-behind) ===
+# 클릭 → 로컬 저널에 fsync 후 바로 응답, 백그라운드 flusher 가 여러 건을 한 번의
+# multi-row INSERT 로 반영. verify DB 가 잠깐 끊겨도 저널에 남아 있다가 재시도됨.
+# created_at 은 DB 반영 시각이 아니라 요청을 받은 시각(앱 서버 기준).
+LOG_INSERT_COLS = "i_info, i_cpn, `action`, comment, reviewer, created_at"
+
+# 큐에 넣은 뒤(ok:true 응답 후)에 DB 가 거부하지 않도록 요청 단계에서 먼저 검사
+LOG_FIELD_MAX = {"i_info": 50, "i_cpn": 50, "action": 30, "comment": 1000, "reviewer": 50}
+_ACTION_RE = re.compile(r"^[a-z][a-z0-9_]*$")
+
+def _validate_log_record(rec):
+    """문제 있으면 오류 메시지, 없으면 None"""
+    for k, n in LOG_FIELD_MAX.items():
+        if rec[k] is not None and len(rec[k]) > n:
+            return f"{k} 는 {n}자 이하여야 합니다."
+    if not _ACTION_RE.match(rec["action"]):
+        return "action 형식이 올바르지 않습니다."
+    return None
+
+def _insert_review_logs(pool, records):
+    """records 를 한 트랜잭션, 한 문장으로 INSERT (group commit)"""
+    values = ", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(records))
+    params = []
+    for r in records:
+        params += [r["i_info"], r["i_cpn"], r["action"], r["comment"], r["reviewer"], r["created_at"]]
+    c = pool.getconn()
+    ok = False
+    try:
+        cur = c.cursor()
+        cur.execute(f"INSERT INTO T_X_REVIEW_LOG ({LOG_INSERT_COLS}) VALUES {values}", params)
+        cur.close()
+        c.commit()
+        ok = True
+    finally:
+        pool.putconn(c, close=not ok)      # 실패한 연결은 폐기 → 재시도 때 새 연결
+
+
+@review_bp.record_once
+def _start_review_queue(state):
+    app = state.app
+    if not app.config.get("REVIEW_LOG_WRITE_BEHIND", Config.REVIEW_LOG_WRITE_BEHIND):
+        return
+    pool = app.config["VER_POOL"]
+    q = WriteBehindQueue(Config.REVIEW_JOURNAL_DIR, flush=lambda recs: _insert_review_logs(pool, recs),
+                         name="review_log", batch_max=Config.REVIEW_FLUSH_MAX_ROWS,
+                         interval=Config.REVIEW_FLUSH_INTERVAL)
+    app.config["REVIEW_QUEUE"] = q.start()
+    atexit.register(q.stop)
+
+
 @review_bp.route("/log", methods=["POST"])
 def api_review_log():
     data = request.get_json(force=True, silent=True) or {}
@@ -26,37 +79,101 @@ def api_review_log():
         return jsonify({"ok": False, "msg": "i_info 또는 i_cpn 중 하나는 필수입니다."}), 400
     if not action:
         action = "inspect" if i_info else "company_review"
+    err = _validate_log_record({"i_info": i_info, "i_cpn": i_cpn, "action": action,
+                                "comment": comment, "reviewer": reviewer})
+    if err:
+        return jsonify({"ok": False, "msg": err}), 400
 
-    sql = """
-      INSERT INTO T_X_REVIEW_LOG (i_info, i_cpn, `action`, comment, reviewer, created_at)
-      VALUES (%s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
-    """
+    now = dt.datetime.now()
+    q = current_app.config.get("REVIEW_QUEUE")
     try:
-        db_execute(sql, (i_info, i_cpn, action, comment, reviewer), use=VER_POOL)
+        if q is not None:
+            q.put({"i_info": i_info, "i_cpn": i_cpn, "action": action, "comment": comment,
+                   "reviewer": reviewer, "created_at": now.strftime("%Y-%m-%d %H:%M:%S"),
+                   "queued_at": now.timestamp()})
+            return jsonify({"ok": True, "queued": True})
+        # write-behind 끔(REVIEW_LOG_WRITE_BEHIND=0) → 바로 INSERT
+        sql = """
+          INSERT INTO T_X_REVIEW_LOG (i_info, i_cpn, `action`, comment, reviewer, created_at)
+          VALUES (%s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
+        """
+        db_execute(sql, (i_info, i_cpn, action, comment, reviewer), use=ver_pool(), prepared=True)
         return jsonify({"ok": True})
     except Exception as e:
         print("[/api/review/log] ERROR:", e)
         return jsonify({"ok": False, "msg": str(e)}), 500
 
 
+# === 검수 로그 큐 상태 (대기 건수 / 마지막 flush / 오류) ===
+@review_bp.route("/log/status")
+def api_review_log_status():
+    q = current_app.config.get("REVIEW_QUEUE")
+    if q is None:
+        return jsonify({"ok": True, "enabled": False, "depth": 0})
+    return jsonify({"ok": True, "enabled": True, **q.status()})
+
+
+# === keyset 페이지네이션 (created_at DESC, id DESC) ===
+# ?cursor=<이전 응답의 next> 로 다음 페이지. OFFSET 이 없어 깊은 페이지도 첫 페이지와 같은 비용
+# (인덱스: migrations/001_review_log_keyset_indexes.sql)
+LOG_COLS = "id,i_info,i_cpn,`action`,comment,reviewer,created_at"
+
+class BadCursor(ValueError):
+    pass
+
+def _encode_cursor(created_at, id_):
+    raw = json.dumps([created_at.isoformat(sep=" ") if created_at else None, id_])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def _decode_cursor(tok):
+    try:
+        raw = base64.urlsafe_b64decode(tok + "=" * (-len(tok) % 4))
+        ts, id_ = json.loads(raw)
+        return (dt.datetime.fromisoformat(ts) if ts else None), int(id_)
+    except Exception:
+        raise BadCursor("invalid cursor")
+
+def _page_args(default_limit, max_limit=1000):
+    limit = max(1, min(request.args.get("limit", default_limit, type=int) or default_limit, max_limit))
+    tok = (request.args.get("cursor") or "").strip()
+    return limit, (_decode_cursor(tok) if tok else None)
+
+def _keyset_select(where, params, limit, after):
+    """where/params + (created_at, id) < after → (rows, next 토큰 | None)"""
+    where, params = list(where), list(params)
+    if after is not None:
+        ts, id_ = after
+        if ts is None:                  # created_at NULL 행은 맨 뒤 → id 로만 이어감
+            where.append("(created_at IS NULL AND id < %s)")
+            params.append(id_)
+        else:
+            where.append("(created_at < %s OR (created_at = %s AND id < %s) OR created_at IS NULL)")
+            params += [ts, ts, id_]
+    sql = f"SELECT {LOG_COLS} FROM T_X_REVIEW_LOG"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY created_at DESC, id DESC LIMIT %s"
+    rows = db_select_all(sql, params + [limit + 1], use=ver_pool())
+    nxt = _encode_cursor(rows[limit - 1][6], rows[limit - 1][0]) if len(rows) > limit else None
+    return rows[:limit], nxt
+
+def _log_items(rows):
+    return [{
+        "id": r[0], "i_info": r[1], "i_cpn": r[2], "action": r[3],
+        "comment": r[4], "reviewer": r[5],
+        "created_at": r[6].isoformat() if r[6] else None
+    } for r in rows]
+
+
 # === 간판 단위 로그 조회 ===
 @review_bp.route("/by_sign/<i_info>")
 def api_review_by_sign(i_info):
-    sql = """
-      SELECT id,i_info,i_cpn,`action`,comment,reviewer,created_at
-        FROM T_X_REVIEW_LOG
-       WHERE i_info=%s
-       ORDER BY created_at DESC
-       LIMIT 200
-    """
     try:
-        rows = db_select_all(sql, (i_info,), use=VER_POOL)
-        items = [{
-            "id": r[0], "i_info": r[1], "i_cpn": r[2], "action": r[3],
-            "comment": r[4], "reviewer": r[5],
-            "created_at": r[6].isoformat() if r[6] else None
-        } for r in rows]
-        return jsonify({"ok": True, "items": items})
+        limit, after = _page_args(200)
+        rows, nxt = _keyset_select(["i_info=%s"], [i_info], limit, after)
+        return jsonify({"ok": True, "items": _log_items(rows), "next": nxt})
+    except BadCursor as e:
+        return jsonify({"ok": False, "msg": str(e)}), 400
     except Exception as e:
         print("[/api/review/by_sign] ERROR:", e)
         return jsonify({"ok": False, "msg": str(e)}), 500
@@ -65,34 +182,23 @@ def api_review_by_sign(i_info):
 # === 회사 단위 로그 조회 ===
 @review_bp.route("/by_company/<i_cpn>")
 def api_review_by_company(i_cpn):
-    sql = """
-      SELECT id,i_info,i_cpn,`action`,comment,reviewer,created_at
-        FROM T_X_REVIEW_LOG
-       WHERE i_cpn=%s
-       ORDER BY created_at DESC
-       LIMIT 500
-    """
     try:
-        rows = db_select_all(sql, (i_cpn,), use=VER_POOL)
-        items = [{
-            "id": r[0], "i_info": r[1], "i_cpn": r[2], "action": r[3],
-            "comment": r[4], "reviewer": r[5],
-            "created_at": r[6].isoformat() if r[6] else None
-        } for r in rows]
-        return jsonify({"ok": True, "items": items})
+        limit, after = _page_args(500)
+        rows, nxt = _keyset_select(["i_cpn=%s"], [i_cpn], limit, after)
+        return jsonify({"ok": True, "items": _log_items(rows), "next": nxt})
+    except BadCursor as e:
+        return jsonify({"ok": False, "msg": str(e)}), 400
     except Exception as e:
         print("[/api/review/by_company] ERROR:", e)
         return jsonify({"ok": False, "msg": str(e)}), 500
 
 
 # === 검수 요약 조회 ===
-@review_bp.route("/summary")
-def api_review_summary():
+def _summary_filters():
+    """summary / summary_export 공통 WHERE 절 (기간·종류)"""
     d_from = (request.args.get("from") or "").strip()
     d_to   = (request.args.get("to") or "").strip()
-    dong_f = (request.args.get("dong") or "").strip()
     kind   = (request.args.get("kind") or "all").strip()
-    limit  = int(request.args.get("limit") or 1000)
 
     where, params = [], []
 
@@ -113,14 +219,18 @@ def api_review_summary():
     elif kind == "company":
         where.append("`action` = %s"); params.append("company_review")
 
-    sql_log = "SELECT id,i_info,i_cpn,`action`,comment,reviewer,created_at FROM T_X_REVIEW_LOG"
-    if where:
-        sql_log += " WHERE " + " AND ".join(where)
-    sql_log += " ORDER BY created_at DESC LIMIT %s"
-    params2 = params + [limit]
+    return where, params
+
+
+@review_bp.route("/summary")
+def api_review_summary():
+    where, params = _summary_filters()
 
     try:
-        rows_log = db_select_all(sql_log, params2, use=VER_POOL)
+        limit, after = _page_args(1000, max_limit=5000)
+        rows_log, nxt = _keyset_select(where, params, limit, after)
+    except BadCursor as e:
+        return jsonify({"ok": False, "msg": str(e)}), 400
     except Exception as e:
         print("[/api/review/summary] log query ERROR:", e)
         return jsonify({"ok": False, "msg": str(e)}), 500
@@ -130,33 +240,82 @@ def api_review_summary():
         "comment": r[4], "reviewer": r[5], "created_at": r[6]
     } for r in rows_log]
 
-    return jsonify({"ok": True, "rows": items})
+    return jsonify({"ok": True, "rows": items, "next": nxt})
+
+
+# === 검수 요약 다운로드 (xlsx / csv, 스트리밍) ===
+EXPORT_HEADER = ["간판ID", "회사ID", "작업종류", "검수내용", "작업자", "일시"]
+EXPORT_CHUNK = 2000
 
+def _export_rows(sql, params):
+    """server-side 커서 → (간판ID, 회사ID, 작업종류, 검수내용, 작업자, 일시) 청크"""
+    for chunk in db_iter(sql, params, use=ver_pool(), chunk=EXPORT_CHUNK):
+        yield [(r[1], r[2], r[3], r[4], r[5],
+                r[6].strftime("%Y-%m-%d %H:%M:%S") if r[6] else None) for r in chunk]
+
+def _csv_stream(sql, params):
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    w.writerow(EXPORT_HEADER)
+    yield "\ufeff" + buf.getvalue()          # BOM: 엑셀에서 한글 깨짐 방지
+    for rows in _export_rows(sql, params):
+        buf.seek(0); buf.truncate()
+        w.writerows(rows)
+        yield buf.getvalue()
+
+def _xlsx_tempfile(sql, params):
+    """write-only 워크북에 청크 단위로 append → 임시 파일 (행 수와 무관하게 메모리 일정)"""
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("검수요약")
+    ws.append(EXPORT_HEADER)
+    for rows in _export_rows(sql, params):
+        for r in rows:
+            ws.append(r)
+    tmp = tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False)
+    tmp.close()
+    try:
+        wb.save(tmp.name)
+    except Exception:
+        os.unlink(tmp.name)
+        raise
+    return tmp.name
 
-# === 검수 요약 Excel 다운로드 ===
 @review_bp.route("/summary_export")
 def api_review_summary_export():
-    resp = api_review_summary()
-    data = resp[0].get_json() if isinstance(resp, tuple) else resp.get_json()
-    if not data.get("ok"):
-        return jsonify(data), 500
-
-    rows = data.get("rows", [])
-    if not rows:
-        df = pd.DataFrame(columns=["동","세부주소","회사명","간판ID","작업종류","검수내용","작업자","일시"])
-    else:
-        df = pd.DataFrame(rows).rename(columns={
-            "dong":"동","addr":"세부주소","company_name":"회사명","i_info":"간판ID",
-            "action":"작업종류","comment":"검수내용","reviewer":"작업자","created_at":"일시"
-        })
-
-    buf = BytesIO()
-    with pd.ExcelWriter(buf, engine="openpyxl") as writer:
-        df.to_excel(writer, index=False, sheet_name="검수요약")
-    buf.seek(0)
-    return send_file(
-        buf,
-        as_attachment=True,
-        download_name="review_summary.xlsx",
-        mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
+    """?format=xlsx(기본)|csv, 행 수 제한 없음 (limit 을 주면 그만큼만)"""
+    fmt = (request.args.get("format") or "xlsx").lower()
+    where, params = _summary_filters()
+    sql_log = f"SELECT {LOG_COLS} FROM T_X_REVIEW_LOG"
+    if where:
+        sql_log += " WHERE " + " AND ".join(where)
+    sql_log += " ORDER BY created_at DESC, id DESC"
+    limit = request.args.get("limit", type=int)
+    if limit:
+        sql_log += " LIMIT %s"
+        params = params + [limit]
+    stamp = dt.datetime.now().strftime("%Y%m%d_%H%M")
+
+    if fmt == "csv":
+        # 첫 청크부터 바로 전송
+        return Response(
+            stream_with_context(_csv_stream(sql_log, params)),
+            mimetype="text/csv; charset=utf-8",
+            headers={"Content-Disposition": f"attachment; filename=review_summary_{stamp}.csv"})
+
+    try:
+        path = _xlsx_tempfile(sql_log, params)
+    except Exception as e:
+        print("[/api/review/summary_export] ERROR:", e)
+        return jsonify({"ok": False, "msg": str(e)}), 500
+    try:
+        resp = send_file(path, as_attachment=True, download_name=f"review_summary_{stamp}.xlsx",
+                         mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+    except Exception:
+        os.unlink(path)
+        raise
+    # 전송 전에 연결이 끊겨도 응답 close 시점에 삭제
+    # (direct_passthrough 면 WSGI 서버가 파일 래퍼만 닫고 call_on_close 는 호출되지 않음)
+    resp.direct_passthrough = False
+    resp.call_on_close(lambda: os.unlink(path))
+    return resp
@@ -1,6 +1,13 @@
-from flask import Blueprint, request, jsonify, send_file, current_app, redirect
-import io, os
+from flask import Blueprint, request, jsonify, send_file, current_app, redirect, render_template, url_for
+import hashlib, io, os, json, mimetypes, re, struct, uuid
 import pathlib
+from utils.thumbs import thumb_box, derivative_key, make_thumbnail
+from utils.navtree import NAV, changed as nav_changed
+from utils.respcache import cached, purge
+from utils.img_history import replace_image, history_index, history_blob
+from utils.imgproc import ImageBusy, prepare_upload
+from utils.imgsource import SOURCES, DB as SRC_DB
+from utils.static_index import StaticImageIndex
 
 sign_bp = Blueprint("sign", __name__)
 
@@ -20,59 +27,258 @@ def db_select(sql, params=(), pool="IMG_POOL"):
         pool.putconn(conn)
 
 def db_exec(sql, params=(), pool="IMG_POOL"):
+    """실행 후 커밋. RETURNING 등 결과 행이 있으면 반환"""
     pool = cfg()[pool]
     conn = pool.getconn()
     try:
         cur = conn.cursor()
         cur.execute(sql, params)
+        rows = cur.fetchall() if cur.description else None
         conn.commit()
         cur.close()
+        return rows
     finally:
         pool.putconn(conn)
 
 
 # === 이미지 BLOB ===
-@sign_bp.route("/image_blob/<ad_id>")
-def api_image_blob(ad_id):
+def _not_modified(etag):
+    resp = current_app.response_class(status=304)
+    resp.set_etag(etag)
+    resp.cache_control.no_cache = True
+    return resp
+
+def _send_cached(entry):
+    # ETag = 내용 해시 → 브라우저는 매번 재검증하지만 변경 없으면 304 (본문 없음)
+    return send_file(io.BytesIO(entry.data), mimetype="image/jpeg",
+                     etag=entry.etag, last_modified=entry.mtime, conditional=True)
+
+def _load_blob(key):
+    """BLOB 캐시 → T_X_IMG 순으로 조회. 없으면 None"""
+    cache = cfg()["BLOB_CACHE"]
+    entry = cache.get(key)
+    if entry:
+        return entry
+
     pool = cfg()["IMG_POOL"]
     conn = pool.getconn()
     try:
         cur = conn.cursor()
-        cur.execute("SELECT b_img FROM T_X_IMG WHERE i_img=%s", (f"p_if_pk_{ad_id}",))
+        cur.execute("SELECT b_img FROM T_X_IMG WHERE i_img=%s", (key,))
         row = cur.fetchone()
         cur.close()
-        if row and row[0]:
-            blob = row[0]
-            if isinstance(blob, memoryview):
-                blob = bytes(blob)
-            return send_file(io.BytesIO(blob), mimetype="image/jpeg")
     finally:
         pool.putconn(conn)
+    if not row or not row[0]:
+        return None
+    blob = row[0]
+    if isinstance(blob, memoryview):
+        blob = bytes(blob)
+    return cache.put(key, blob)
+
+def _load_derivative(src, box):
+    """원본 entry → 크기 변형 entry (캐시에 없으면 생성 후 저장)"""
+    cache = cfg()["BLOB_CACHE"]
+    dkey = derivative_key(src.etag, box)
+    entry = cache.get(dkey)
+    if entry:
+        return entry
+    try:
+        return cache.put(dkey, make_thumbnail(src.data, box))
+    except Exception as e:
+        current_app.logger.warning(f"썸네일 생성 실패({dkey}): {e}")
+        return src
+
+def _cached_etag(key, box):
+    """키 인덱스만으로 현재 ETag (box 면 그 크기 변형본의 ETag). 캐시에 없으면 None"""
+    cache = cfg()["BLOB_CACHE"]
+    hit = cache.lookup(key)
+    if hit and box:
+        hit = cache.lookup(derivative_key(hit.etag, box))
+    return hit.etag if hit else None
+
+@sign_bp.route("/image_blob/<ad_id>")
+def api_image_blob(ad_id):
+    """?w=, ?h= 지정 시 해당 박스에 맞춘 썸네일(JPEG) 반환"""
+    key = f"p_if_pk_{ad_id}"
+    w = request.args.get("w", type=int)
+    h = request.args.get("h", type=int)
+    box = thumb_box(w, h, cfg()["MAX_IMAGE_W"], cfg()["MAX_IMAGE_H"]) if (w or h) else None
+
+    # 1) 키 인덱스만으로 304 판정 (BLOB/DB 접근 없음)
+    etag = _cached_etag(key, box)
+    if etag and request.if_none_match.contains(etag):
+        return _not_modified(etag)
 
-    # fallback: SIGN_TABLE 내 컬럼들
-    table = cfg()["SIGN_TABLE"]
-    cand_cols = ["bns", "img_path", "image_path", "img_file", "img_url"]
-    for col in cand_cols:
+    # 2) 위치 인덱스: 파일/URL 로 알려진 id 는 T_X_IMG 생략, 이미지 없는 id 는 바로 404
+    src = SOURCES.get(ad_id)
+    if src is not None and src.kind != "db":
+        resp = _send_source(ad_id, src, box)
+        if resp is not None:
+            return resp
+
+    # 3) 메모리/디스크 캐시 → T_X_IMG
+    entry = _load_blob(key)
+    if entry:
+        SOURCES.put(ad_id, SRC_DB)
+        return _send_cached(_load_derivative(entry, box) if box else entry)
+
+    # 4) SIGN_TABLE 후보 컬럼 (있는 컬럼만 SELECT 1회, 결과는 인덱스에 기록)
+    try:
+        src = SOURCES.lookup_columns(cfg()["IMG_POOL"], cfg()["SIGN_TABLE"], cfg()["COL_ADIDX"], ad_id)
+    except Exception as e:
+        current_app.logger.warning(f"이미지 위치 조회 실패({ad_id}): {e}")
+        return "이미지 없음", 404
+    return _send_source(ad_id, src, box) or ("이미지 없음", 404)
+
+def _send_file_thumb(base, path, box):
+    """
+    파일 → box 축소본 응답. BLOB_CACHE 에 파생본 보관 (base 에 mtime·크기 포함 → 파일이 바뀌면 키도 바뀜).
+    파일이 없으면 None
+    """
+    cache = cfg()["BLOB_CACHE"]
+    dkey = derivative_key(base, box)
+    hit = cache.lookup(dkey)
+    if hit and request.if_none_match.contains(hit.etag):
+        return _not_modified(hit.etag)
+    entry = cache.get(dkey)
+    if entry is None:
         try:
-            rows = db_select(
-                f"SELECT {col} FROM {table} WHERE {cfg()['COL_ADIDX']}=%s LIMIT 1",
-                (ad_id,)
-            )
-            if rows and rows[0][0]:
-                path = str(rows[0][0]).strip()
-                if path.lower().startswith(("http://", "https://")):
-                    return redirect(path, code=302)
-                if os.path.exists(path):
-                    with open(path, "rb") as f:
-                        return send_file(io.BytesIO(f.read()), mimetype="image/jpeg")
-        except Exception:
-            continue
-
-    return "이미지 없음", 404
+            raw = pathlib.Path(path).read_bytes()
+            data = cfg()["IMAGE_SERVICE"].run(make_thumbnail, raw, box) \
+                if "IMAGE_SERVICE" in cfg() else make_thumbnail(raw, box)
+        except ImageBusy as ex:
+            return _busy(ex)
+        except FileNotFoundError:
+            return None
+        entry = cache.put(dkey, data)
+    return _send_cached(entry)
+
+def _send_source(ad_id, src, box=None):
+    """인덱스 항목 → 응답 (box 면 축소본). 파일이 사라졌으면 항목을 지우고 None (다시 조회)"""
+    if src.kind == "none":
+        return "이미지 없음", 404
+    if src.kind == "url":
+        return redirect(src.value, code=302)
+    if src.kind == "file":
+        if box and os.path.isfile(src.value):
+            # 목록 썸네일(?h=200)에 원본 전체를 보내지 않도록 /static_thumb 와 같은 방식으로 축소
+            st = os.stat(src.value)
+            path_id = hashlib.sha1(src.value.encode("utf-8")).hexdigest()
+            resp = _send_file_thumb(f"file_{path_id}_{st.st_mtime_ns}_{st.st_size}", src.value, box)
+            if resp is not None:
+                return resp
+        elif os.path.isfile(src.value):
+            # 경로로 넘겨 wsgi.file_wrapper(sendfile) 사용, ETag/Range/304 처리
+            return send_file(src.value, mimetype=mimetypes.guess_type(src.value)[0] or "image/jpeg",
+                             conditional=True, etag=True, max_age=300)
+        SOURCES.invalidate(ad_id)
+    return None
+
+
+# === 이미지 일괄 조회 (갤러리 1회 왕복) ===
+BATCH_MAX = 200
+
+def _load_blobs(keys):
+    """여러 i_img 를 캐시 → T_X_IMG(ANY 1회) 순으로 조회. {key: entry}"""
+    cache = cfg()["BLOB_CACHE"]
+    found, missing = {}, []
+    for k in keys:
+        entry = cache.get(k)
+        if entry:
+            found[k] = entry
+        else:
+            missing.append(k)
+    if missing:
+        rows = db_select("SELECT i_img, b_img FROM T_X_IMG WHERE i_img = ANY(%s)", (missing,))
+        for k, blob in rows:
+            if blob:
+                found[k] = cache.put(k, bytes(blob) if isinstance(blob, memoryview) else blob)
+    return found
+
+def _int_arg(v):
+    try:
+        return int(v) if v not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+@sign_bp.route("/image_batch", methods=["GET", "POST"])
+def api_image_batch():
+    """
+    GET  /api/sign/image_batch?ids=1,2,3&h=200&format=packed
+    POST /api/sign/image_batch  { "ids": [...], "w":.., "h":.., "format": "multipart"|"packed",
+                                  "have": {i_info: etag, ...} }
+    - multipart : multipart/mixed, 파트마다 Content-ID=<i_info>, ETag
+    - packed    : [u32 BE 헤더길이][헤더 JSON][이미지 바이트 연속]
+                  헤더 = {"items":[{i_info, etag, offset, length}], "missing":[...], "unchanged":[...]}
+    - have      : 클라이언트가 이미 가진 ETag → 그대로면 본문 없이 unchanged 로만 알림 (개별 GET 의 304 대응)
+    """
+    data = (request.get_json(silent=True) or {}) if request.method == "POST" else {}
+    args = {**request.args.to_dict(), **data}
+    ids = args.get("ids") or []
+    if isinstance(ids, str):
+        ids = ids.split(",")
+    ids = list(dict.fromkeys(str(x).strip() for x in ids if str(x).strip()))
+    if not ids:
+        return jsonify({"ok": False, "msg": "ids required"}), 400
+    if len(ids) > BATCH_MAX:
+        return jsonify({"ok": False, "msg": f"ids 최대 {BATCH_MAX}개"}), 400
+
+    # 쿼리는 request.args(type=int) 와 같게, JSON 본문 값은 숫자가 아니면 무시
+    w = _int_arg(data.get("w")) if "w" in data else request.args.get("w", type=int)
+    h = _int_arg(data.get("h")) if "h" in data else request.args.get("h", type=int)
+    box = thumb_box(w, h, cfg()["MAX_IMAGE_W"], cfg()["MAX_IMAGE_H"]) if (w or h) else None
+    fmt = (args.get("format") or "multipart").lower()
+
+    have = data.get("have") if isinstance(data.get("have"), dict) else {}
+    unchanged = [i for i in ids if have.get(i) and have[i] == _cached_etag(f"p_if_pk_{i}", box)]
+    skip = set(unchanged)
+    todo = [i for i in ids if i not in skip]
+
+    entries = _load_blobs([f"p_if_pk_{i}" for i in todo])
+    items = []
+    for i in todo:
+        e = entries.get(f"p_if_pk_{i}")
+        if e:
+            items.append((i, _load_derivative(e, box) if box else e))
+    missing = [i for i in todo if f"p_if_pk_{i}" not in entries]
+
+    if fmt == "packed":
+        index, offset = [], 0
+        for i, e in items:
+            index.append({"i_info": i, "etag": e.etag, "offset": offset, "length": len(e.data)})
+            offset += len(e.data)
+        header = json.dumps({"items": index, "missing": missing, "unchanged": unchanged}).encode("utf-8")
+
+        def gen_packed():
+            yield struct.pack(">I", len(header)) + header
+            for _, e in items:
+                yield e.data
+        return current_app.response_class(
+            gen_packed(), mimetype="application/octet-stream",
+            headers={"Content-Length": str(4 + len(header) + offset), "X-Missing-Ids": ",".join(missing)})
+
+    boundary = uuid.uuid4().hex
+
+    def gen_multipart():
+        for i, e in items:
+            yield (f"--{boundary}\r\n"
+                   f"Content-Type: image/jpeg\r\n"
+                   f"Content-ID: <{i}>\r\n"
+                   f'ETag: "{e.etag}"\r\n'
+                   f"Content-Length: {len(e.data)}\r\n\r\n").encode("ascii")
+            yield e.data
+            yield b"\r\n"
+        yield f"--{boundary}--\r\n".encode("ascii")
+    return current_app.response_class(
+        gen_multipart(), mimetype=f"multipart/mixed; boundary={boundary}",
+        headers={"X-Missing-Ids": ",".join(missing), "X-Unchanged-Ids": ",".join(unchanged)})
+
 
 
 # === 간판 상세 정보 ===
 @sign_bp.route("/detail/<ad_id>")
+@cached(ttl=300, tags=lambda ad_id: [f"sign:{ad_id}", "company_names"])
 def api_sign_detail(ad_id):
     c = cfg()
     sql = f"""
@@ -109,96 +315,57 @@ def api_sign_detail(ad_id):
 
 
 # === 이미지 교체 ===
+def _replace_task(app, svc, i_info, data, reserved=False):
+    """디코딩/리사이즈는 이미지 프로세스 풀, 이력+업서트는 한 트랜잭션 → 결과 dict"""
+    c = app.config
+    run = svc.run_reserved if reserved else svc.run
+    out = run(prepare_upload, data, c["MAX_IMAGE_W"], c["MAX_IMAGE_H"])
+    with app.app_context():
+        sha, owners = replace_image(c["IMG_POOL"], i_info, out["data"], out["orig_w"], out["orig_h"],
+                                    c["SIGN_TABLE"], c["COL_ADIDX"], c["COL_CP_IDX"])
+        c["BLOB_CACHE"].invalidate(f"p_if_pk_{i_info}")
+        SOURCES.invalidate(i_info)
+        purge(f"sign:{i_info}", *[f"cpn:{x}" for x in owners])
+    return {"orig_w": out["orig_w"], "orig_h": out["orig_h"], "sha": sha,
+            "passthrough": out["passthrough"]}
+
+def _busy(e):
+    resp = jsonify({"ok": False, "msg": str(e), "busy": True})
+    resp.status_code = 503
+    resp.headers["Retry-After"] = "2"
+    return resp
+
 @sign_bp.route("/image_replace", methods=["POST"])
 def api_sign_image_replace():
-    """multipart/form-data: i_info, image"""
+    """
+    multipart/form-data: i_info, image [, async=1]
+    async=1 → 202 {job_id} 후 /api/sign/image_job/<job_id> 로 결과 조회
+    """
     i_info = (request.form.get("i_info") or "").strip()
     file = request.files.get("image")
     if not i_info or not file:
         return jsonify({"ok": False, "msg": "i_info and image required"}), 400
 
-    from PIL import Image
-    MAX_W, MAX_H = 800, 600
-
+    app = current_app._get_current_object()
+    svc = cfg()["IMAGE_SERVICE"]
+    data = file.read()
     try:
-        # === 기존 이미지 히스토리 백업 ===
-        pool = cfg()["IMG_POOL"]
-        conn = pool.getconn()
-        try:
-            cur = conn.cursor()
-            cur.execute("SELECT b_img FROM T_X_IMG WHERE i_img=%s", (f"p_if_pk_{i_info}",))
-            row = cur.fetchone()
-            if row and row[0]:
-                blob = row[0]
-                if isinstance(blob, memoryview):
-                    blob = bytes(blob)
-                # static/history 에 파일 저장
-                import pathlib, datetime
-                hist_dir = pathlib.Path(current_app.static_folder) / "history"
-                hist_dir.mkdir(parents=True, exist_ok=True)
-                ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                fname = hist_dir / f"{i_info}_{ts}.jpg"
-                with open(fname, "wb") as f:
-                    f.write(blob)
-
-                # DB 히스토리 테이블에 기록 (있을 경우)
-                try:
-                    cur.execute(
-                        "INSERT INTO T_X_IMG_HISTORY (i_info, i_img, b_img, created_at) VALUES (%s, %s, %s, now())",
-                        (i_info, f"p_if_pk_{i_info}", blob)
-                    )
-                    conn.commit()
-                except Exception as e:
-                    current_app.logger.warning(f"이미지 히스토리 테이블 기록 실패: {e}")
-            cur.close()
-        finally:
-            pool.putconn(conn)
-
-        # === 새 이미지 처리 ===
-        img = Image.open(file.stream).convert("RGB")
-        orig_w, orig_h = img.size
-
-        # 리사이즈
-        img_to_store = img
-        if orig_w > MAX_W or orig_h > MAX_H:
-            img_to_store = img.copy()
-            img_to_store.thumbnail((MAX_W, MAX_H), Image.LANCZOS)
-
-        buf = io.BytesIO()
-        img_to_store.save(buf, format="JPEG", quality=92)
-        data = buf.getvalue()
-
-        # 새 이미지 업서트
-        pool = cfg()["IMG_POOL"]
-        conn = pool.getconn()
-        try:
-            cur = conn.cursor()
-            try:
-                cur.execute(
-                    "INSERT INTO T_X_IMG (i_img, b_img) VALUES (%s,%s) "
-                    "ON CONFLICT (i_img) DO UPDATE SET b_img=EXCLUDED.b_img",
-                    (f"p_if_pk_{i_info}", data)
-                )
-            except Exception:
-                cur.execute(
-                    "INSERT INTO T_X_IMG (i_img, b_img) VALUES (%s,%s) "
-                    "ON DUPLICATE KEY UPDATE b_img=VALUES(b_img)",
-                    (f"p_if_pk_{i_info}", data)
-                )
-            # 원본 크기 업데이트
-            cur.execute(
-                f"UPDATE {cfg()['SIGN_TABLE']} SET q_img_w=%s, q_img_h=%s WHERE {cfg()['COL_ADIDX']}=%s",
-                (orig_w, orig_h, i_info)
-            )
-            conn.commit()
-            cur.close()
-        finally:
-            pool.putconn(conn)
-
-        return jsonify({"ok": True, "orig_w": orig_w, "orig_h": orig_h})
+        if (request.form.get("async") or request.args.get("async")) in ("1", "true"):
+            job_id = svc.start_job(lambda: _replace_task(app, svc, i_info, data, reserved=True))
+            return jsonify({"ok": True, "job_id": job_id,
+                            "status_url": f"/api/sign/image_job/{job_id}"}), 202
+        return jsonify({"ok": True, **_replace_task(app, svc, i_info, data)})
+    except ImageBusy as e:
+        return _busy(e)
     except Exception as e:
         return jsonify({"ok": False, "msg": str(e)}), 500
 
+@sign_bp.route("/image_job/<job_id>")
+def api_image_job(job_id):
+    j = cfg()["IMAGE_SERVICE"].job(job_id)
+    if j is None:
+        return jsonify({"ok": False, "msg": "job not found"}), 404
+    return jsonify({"ok": j.get("status") != "error", "job_id": job_id, **j})
 
 
 # === 간판 삭제 ===
@@ -208,42 +375,92 @@ def api_sign_delete():
     i_info = (data.get("i_info") or "").strip()
     if not i_info:
         return jsonify({"ok": False, "msg":"i_info required"}), 400
-    sql = f"DELETE FROM {cfg()['SIGN_TABLE']} WHERE {cfg()['COL_ADIDX']}=%s"
-    db_exec(sql, (i_info,), pool="IMG_POOL")
+    sql = (f"DELETE FROM {cfg()['SIGN_TABLE']} WHERE {cfg()['COL_ADIDX']}=%s "
+           f"RETURNING {cfg()['COL_CP_IDX']}")
+    rows = db_exec(sql, (i_info,), pool="IMG_POOL")
+    for (i_cpn,) in rows or []:
+        NAV.add_signs(i_cpn, -1)      # 탐색 트리 간판 수 즉시 반영
+        purge(f"cpn:{i_cpn}")
+    if rows:
+        nav_changed()
+    SOURCES.invalidate(i_info)
+    purge(f"sign:{i_info}", "illegal")
     return jsonify({"ok": True, "deleted": i_info})
 
-# blueprints/sign.py
-
+# === 이미지 교체 이력 ===
 @sign_bp.route("/history/<i_info>")
 def sign_history(i_info):
-    """
-    간판 이미지 교체 이력을 보여주는 페이지
-    예: T_X_IMG_HISTORY 테이블이나 별도 로그 테이블 필요
-    """
-    rows = db_select(
-        "SELECT id, i_img, created_at FROM T_X_IMG_HISTORY WHERE i_info=%s ORDER BY created_at DESC",
-        (i_info,),
-        pool="IMG_POOL"
-    )
+    """교체 이력 페이지 (?format=json 이면 목록 JSON). 이미지는 /history_blob/<sha>"""
+    rows = history_index(cfg()["IMG_POOL"], i_info)
+    if request.args.get("format") == "json":
+        return jsonify({"ok": True, "i_info": i_info, "history": [
+            {**r, "created_at": str(r["created_at"]), "url": f"/api/sign/history_blob/{r['sha']}"}
+            for r in rows if r["sha"]]})
     return render_template("sign_history.html", rows=rows, i_info=i_info)
 
+_SHA_RE = re.compile(r"[0-9a-f]{64}")
+
+@sign_bp.route("/history_blob/<sha>")
+def api_history_blob(sha):
+    """보관된 이전 이미지 (내용 해시 주소 → 바뀌지 않으므로 장기 캐시)"""
+    sha = sha.lower()
+    if not _SHA_RE.fullmatch(sha):
+        return "bad sha", 400
+    if request.if_none_match.contains(sha):
+        return _not_modified(sha)
+    cache = cfg()["BLOB_CACHE"]
+    key = f"hist_{sha}"
+    entry = cache.get(key)
+    if entry is None:
+        blob = history_blob(cfg()["IMG_POOL"], sha)
+        if blob is None:
+            return "이미지 없음", 404
+        entry = cache.put(key, blob)
+    resp = _send_cached(entry)
+    resp.cache_control.no_cache = None
+    resp.cache_control.public = True
+    resp.cache_control.max_age = 365 * 86400
+    resp.cache_control.immutable = True
+    return resp
+
+# === 동/번지 사진 (static/images/{dong}_{bunji}_*.jpg|png) ===
+def _static_index():
+    c = cfg()
+    if "STATIC_IMAGES" not in c:
+        c["STATIC_IMAGES"] = StaticImageIndex(pathlib.Path(current_app.static_folder) / "images")
+    return c["STATIC_IMAGES"]
+
 @sign_bp.route("/static_images")
 def api_static_images():
+    """images: URL 목록(기존 형식) / items: 크기·썸네일 URL 포함 (?tw= 썸네일 폭, 기본 200)"""
     dong = (request.args.get("dong") or "").strip()
     bunji = (request.args.get("bunji") or "").strip()
-    base = pathlib.Path(current_app.static_folder) / "images"
-
     if not dong or not bunji:
-        return jsonify({"images": []})
+        return jsonify({"images": [], "items": []})
 
-    # 예: 파일명이 dong_bunji_*.jpg 로 저장되어 있다고 가정
-    pattern = f"{dong}_{bunji}_*"
-    files = list(base.glob(pattern + ".jpg")) + list(base.glob(pattern + ".png"))
-    urls = [f"/static/images/{f.name}" for f in files]
+    tw = request.args.get("tw", 200, type=int)
+    items = [{
+        "url": url_for("static", filename=f"images/{e['name']}"),
+        "thumb": url_for("sign.api_static_thumb", name=e["name"], w=tw),
+        "name": e["name"], "w": e["w"], "h": e["h"], "bytes": e["bytes"],
+    } for e in _static_index().find(dong, bunji)]
+    return jsonify({"images": [it["url"] for it in items], "items": items})
 
-    return jsonify({"images": urls})
+@sign_bp.route("/static_thumb/<name>")
+def api_static_thumb(name):
+    """인덱스에 있는 파일만 축소본 제공 (BLOB_CACHE 에 파생본 보관, 파일이 바뀌면 키도 바뀜)"""
+    e = _static_index().get(name)
+    if e is None:
+        return "이미지 없음", 404
+    w = request.args.get("w", type=int)
+    h = request.args.get("h", type=int)
+    box = thumb_box(w, h, cfg()["MAX_IMAGE_W"], cfg()["MAX_IMAGE_H"])
+    path = pathlib.Path(current_app.static_folder) / "images" / e["name"]
+    return _send_file_thumb(f"static_{e['name']}_{e['mtime_ns']}_{e['bytes']}", path, box) \
+        or ("이미지 없음", 404)
 
 @sign_bp.route("/list/<i_cpn>")
+@cached(ttl=300, tags=lambda i_cpn: [f"cpn:{i_cpn}"])
 def api_sign_list(i_cpn):
     c = cfg()
     sql = f"""
@@ -265,6 +482,6 @@ def api_sign_list(i_cpn):
             "i_sc_sbd": sbd,
             "i_sc_sbc": sbc,
             "width": w, "height": h,
-            "thumb": f"/api/sign/image_blob/{i_info}"
+            "thumb": f"/api/sign/image_blob/{i_info}?h=200"
         })
     return jsonify({"ok": True, "signs": signs})
@@ -1,28 +1,62 @@
-import os, uuid
-import pandas as pd
+import os, uuid, threading, traceback, time
 from flask import Blueprint, request, render_template, redirect, url_for, session, jsonify
-from werkzeug.utils import secure_filename
 from config import Config
+from extensions import logger
+from utils.upload_store import UploadStore, store_path, migrate_legacy_json, expire_uploads
+from utils.xlsx_ingest import ingest, IngestError
 
 upload_bp = Blueprint("upload", __name__)
 
-# 내부 세션 데이터 저장
-def _save_session_data(upload_id, rows, addr_full, reviewer):
-    path = Config.DATA_DIR / f"{upload_id}.json"
-    with path.open("w", encoding="utf-8") as f:
-        import json
-        json.dump({"rows": rows, "addr_full": addr_full, "reviewer": reviewer}, f, ensure_ascii=False)
+# 검수 시트 컬럼 (헤더명)
+BASE_COLS = [Config.XLS_COL_ADIDX, Config.XLS_COL_COMP, Config.XLS_COL_DONG, Config.XLS_COL_BUNJI]
+VIEW_COLS = BASE_COLS + [c for c in Config.XLS_EXTRA_COLS if c and c not in BASE_COLS]
 
-def _load_session_data():
-    upload_id = session.get("upload_id")
+
+# 업로드별 저장소 (DATA_DIR/uploads/<upload_id>.sqlite3, 예전 JSON 은 첫 접근 시 변환)
+def _open_store(upload_id=None):
+    upload_id = upload_id or session.get("upload_id")
     if not upload_id:
         return None
-    path = Config.DATA_DIR / f"{upload_id}.json"
-    if not path.exists():
-        return None
-    import json
-    with path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    store = UploadStore.open(store_path(Config.DATA_DIR, upload_id))
+    if store is None:
+        store = migrate_legacy_json(Config.DATA_DIR, upload_id, Config.XLS_COL_ADIDX)
+    return store
+
+
+# 오래된 업로드 정리 (프로세스당 1시간에 한 번, 백그라운드)
+_last_expire = 0.0
+
+def _maybe_expire():
+    global _last_expire
+    if time.monotonic() - _last_expire < 3600:
+        return
+    _last_expire = time.monotonic()
+
+    def job():
+        try:
+            st = expire_uploads(Config.DATA_DIR, Config.UPLOAD_FOLDER,
+                                Config.UPLOAD_RETENTION_DAYS, Config.XLS_COL_ADIDX)
+            logger.info("[upload] cleanup: %s", st)
+        except Exception as e:
+            logger.warning("[upload] cleanup ERROR: %s", e)
+    threading.Thread(target=job, daemon=True).start()
+
+
+def _ingest_job(path, upload_id):
+    """백그라운드 적재: 요청은 바로 응답하고 진행 상황은 store meta 로 조회"""
+    store = _open_store(upload_id)
+    try:
+        n = ingest(path, store, Config.XLS_COL_ADIDX, VIEW_COLS, Config.XLS_COL_BUNJI2,
+                   chunk=Config.UPLOAD_CHUNK_ROWS)
+        store.set_meta(status="done")
+        logger.info("[upload] %s: %d rows", upload_id, n)
+    except IngestError as e:
+        store.set_meta(status="error", error=str(e))
+    except Exception as e:
+        logger.error("[upload] %s ERROR: %s\n%s", upload_id, e, traceback.format_exc())
+        store.set_meta(status="error", error=f"엑셀 읽기 오류: {e}")
+    finally:
+        store.close()
 
 
 # === XLS 업로드 페이지 ===
@@ -38,43 +72,100 @@ def upload_index():
         if not f.filename.lower().endswith((".xls", ".xlsx")):
             return render_template("index.html", error="허용되지 않는 파일 형식입니다.", reviewer=session["reviewer_name"])
 
-        path = os.path.join(Config.UPLOAD_FOLDER, secure_filename(f.filename))
+        # secure_filename 은 한글 파일명을 지워버림("이학성.xlsx" → "xlsx") → upload_id + 확장자로 저장
+        upload_id = uuid.uuid4().hex
+        ext = os.path.splitext(f.filename)[1].lower()
+        path = os.path.join(Config.UPLOAD_FOLDER, f"{upload_id}{ext}")
         f.save(path)
 
-        try:
-            df = pd.read_excel(path)
-        except Exception as e:
-            return render_template("index.html", error=f"엑셀 읽기 오류: {e}", reviewer=session["reviewer_name"])
-
-        # 기본 컬럼
-        base_cols = [COL_ADIDX, COL_COMP, COL_DONG, COL_BUNJI]
-        for c in base_cols:
-            if c not in df.columns:
-                df[c] = ""
-
-        # 확장 컬럼
-        view_cols = base_cols + ["ad_specification", "ad_height", "ad_type"]
-        for c in view_cols:
-            if c not in df.columns:
-                df[c] = ""
+        UploadStore.create(store_path(Config.DATA_DIR, upload_id), session["reviewer_name"],
+                           VIEW_COLS, source=f.filename).close()
+        threading.Thread(target=_ingest_job, args=(path, upload_id), daemon=True).start()
 
-        rows_df = df[view_cols].fillna("")
-        addr_full = df.get(COL_BUNJI2, pd.Series([""] * len(df))).fillna("").tolist()
-
-        # 세션 데이터 저장
-        upload_id = uuid.uuid4().hex
-        _save_session_data(upload_id, rows_df.to_dict("records"), addr_full, session["reviewer_name"])
         session["upload_id"] = upload_id
-        session["cursor"] = 0
-
-        return redirect(url_for("review.review"))  # review 블루프린트와 연동
+        _maybe_expire()
+        return render_template("index.html", upload_id=upload_id, reviewer=session["reviewer_name"])
 
     return render_template("index.html", reviewer=session["reviewer_name"])
 
 
+# === 적재 진행 상황 ===
+@upload_bp.route("/progress/<upload_id>")
+def api_progress(upload_id):
+    store = _open_store(upload_id)
+    if store is None:
+        return jsonify({"ok": False, "msg": "upload not found"}), 404
+    try:
+        return jsonify({"ok": True, **store.progress()})
+    finally:
+        store.close()
+
+
 # === 업로드 상태 확인 ===
 @upload_bp.route("/state")
 def api_state():
-    data = _load_session_data() or {"rows": []}
-    idx = int(session.get("cursor", 0))
-    return jsonify({"index": idx, "total": len(data["rows"])})
+    store = _open_store()
+    if store is None:
+        return jsonify({"index": 0, "total": 0})
+    with store:
+        return jsonify({"index": store.cursor(), "total": store.count(),
+                        "counts": store.status_counts(), **store.progress()})
+
+
+# === 행 조회 / 이동 / 검수 결과 (커서는 업로드 store 에 저장 → 세션이 바뀌어도 이어서) ===
+@upload_bp.route("/row/<int:index>")
+def api_row(index):
+    store = _open_store()
+    if store is None:
+        return jsonify({"ok": False, "msg": "no upload"}), 404
+    with store:
+        r = store.row(index)
+    if r is None:
+        return jsonify({"ok": False, "msg": "out of range"}), 404
+    return jsonify({"ok": True, **r})
+
+
+@upload_bp.route("/nav", methods=["POST"])
+def api_nav():
+    """payload: { step: -1|+1 } 또는 { index: n } → 이동 후 해당 행"""
+    data = request.get_json(force=True, silent=True) or {}
+    store = _open_store()
+    if store is None:
+        return jsonify({"ok": False, "msg": "no upload"}), 404
+    with store:
+        try:
+            index = int(data["index"]) if "index" in data else None
+            step = int(data.get("step", 0))
+        except (TypeError, ValueError):
+            return jsonify({"ok": False, "msg": "invalid params"}), 400
+        i = store.move(index=index, step=step, reviewer=session.get("reviewer_name"))
+        return jsonify({"ok": True, "index": i, "total": store.count(), "row": store.row(i)})
+
+
+@upload_bp.route("/row/<int:index>/status", methods=["POST"])
+def api_row_status(index):
+    """payload: { result: "Y"|"N"|"U", comment } → 이벤트 추가 + 행 상태 갱신"""
+    data = request.get_json(force=True, silent=True) or {}
+    result = (data.get("result") or "").strip()
+    if not result:
+        return jsonify({"ok": False, "msg": "result required"}), 400
+    store = _open_store()
+    if store is None:
+        return jsonify({"ok": False, "msg": "no upload"}), 404
+    with store:
+        ok = store.set_status(index, result, (data.get("comment") or "").strip(),
+                              reviewer=session.get("reviewer_name"))
+    if not ok:
+        return jsonify({"ok": False, "msg": "out of range"}), 404
+    return jsonify({"ok": True})
+
+
+@upload_bp.route("/events")
+def api_events():
+    store = _open_store()
+    if store is None:
+        return jsonify({"ok": False, "msg": "no upload"}), 404
+    index = request.args.get("index", type=int)
+    limit = min(request.args.get("limit", 100, type=int), 1000)
+    with store:
+        return jsonify({"ok": True, "events": store.events(index, limit)})
@@ -24,6 +24,34 @@ class Config:
     MAX_IMAGE_W = int(os.getenv("MAX_IMAGE_W", "800"))
     MAX_IMAGE_H = int(os.getenv("MAX_IMAGE_H", "600"))
 
+    # --- 이미지 처리 프로세스 풀 (업로드 디코딩/리사이즈/인코딩) ---
+    IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "0"))          # 0 = CPU 수 기준 자동
+    IMAGE_MAX_PENDING = int(os.getenv("IMAGE_MAX_PENDING", "0"))  # 0 = 워커 수 × 4, 넘으면 503
+    IMAGE_JOB_TTL = float(os.getenv("IMAGE_JOB_TTL", "600"))      # 비동기 작업 결과 보관(초)
+    IMAGE_JOBS_DIR = pathlib.Path(os.getenv("IMAGE_JOBS_DIR", str(DATA_DIR / "image_jobs")))
+
+    # --- 이미지 BLOB 캐시 (메모리 LRU + 디스크 spill) ---
+    BLOB_CACHE_DIR = pathlib.Path(os.getenv("BLOB_CACHE_DIR", str(DATA_DIR / "blob_cache")))
+    BLOB_CACHE_MAX_BYTES = int(os.getenv("BLOB_CACHE_MAX_BYTES", str(64 << 20)))
+    BLOB_CACHE_DISK_MAX_BYTES = int(os.getenv("BLOB_CACHE_DISK_MAX_BYTES", str(1 << 30)))
+
+    # --- static/images 파일명 인덱스: 폴더 변경 확인 주기(초) ---
+    STATIC_INDEX_POLL = float(os.getenv("STATIC_INDEX_POLL", "2"))
+
+    # --- API 응답 캐시 (memory: 프로세스 내 / file: 워커 간 공유) ---
+    RESP_CACHE_BACKEND = os.getenv("RESP_CACHE_BACKEND", "file")
+    RESP_CACHE_DIR = pathlib.Path(os.getenv("RESP_CACHE_DIR", str(DATA_DIR / "resp_cache")))
+
+    # --- 검수 로그 write-behind (로컬 저널 → 일괄 INSERT) ---
+    REVIEW_LOG_WRITE_BEHIND = os.getenv("REVIEW_LOG_WRITE_BEHIND", "1") == "1"
+    REVIEW_JOURNAL_DIR = pathlib.Path(os.getenv("REVIEW_JOURNAL_DIR", str(DATA_DIR / "review_journal")))
+    REVIEW_FLUSH_MAX_ROWS = int(os.getenv("REVIEW_FLUSH_MAX_ROWS", "500"))
+    REVIEW_FLUSH_INTERVAL = float(os.getenv("REVIEW_FLUSH_INTERVAL", "0.5"))   # 초
+
+    # --- 회사 중복 후보 탐지 (utils.dedup / dedup_scan.py) ---
+    DUPES_DB = pathlib.Path(os.getenv("DUPES_DB", str(DATA_DIR / "dup_candidates.sqlite3")))
+    DUP_WORKERS = int(os.getenv("DUP_WORKERS", "0"))             # 0 = CPU 수 기준 자동
+
     # --- DB 스키마(테이블/컬럼 상수) ---
     META_TABLE = os.getenv("META_TABLE", "public.t_b_cpn")
     SIGN_TABLE = os.getenv("SIGN_TABLE", "public.t_sb_info")
@@ -34,6 +62,9 @@ class Config:
     COL_DONG = os.getenv("COL_DONG", "t_add_3")
     COL_BUNJI = os.getenv("COL_BUNJI", "t_add_num")
     COL_BUNJI2 = os.getenv("COL_BUNJI2", "t_add_2")
+    COL_ROAD = os.getenv("COL_ROAD", "t_add_road")   # 도로명주소 (없으면 무시)
+    COL_LAT = os.getenv("COL_LAT", "lat")            # 지오코딩 좌표 (geocode_backfill.py 로 채움)
+    COL_LON = os.getenv("COL_LON", "lon")
 
     COL_ADIDX = os.getenv("COL_ADIDX", "i_info")     # 간판 PK
     COL_CP_IDX = os.getenv("COL_CP_IDX", "i_cpn")    # FK → 회사 PK
@@ -41,6 +72,16 @@ class Config:
     COL_SBD = os.getenv("COL_SBD", "i_sc_sbd")
     COL_SBC = os.getenv("COL_SBC", "i_sc_sbc")
 
+    # --- 업로드 엑셀(검수 시트) 헤더 ---
+    XLS_COL_ADIDX = os.getenv("XLS_COL_ADIDX", "ad_idx")
+    XLS_COL_COMP = os.getenv("XLS_COL_COMP", "company_name")
+    XLS_COL_DONG = os.getenv("XLS_COL_DONG", "읍면동")
+    XLS_COL_BUNJI = os.getenv("XLS_COL_BUNJI", "번지")
+    XLS_COL_BUNJI2 = os.getenv("XLS_COL_BUNJI2", "번지2")      # 전체 주소
+    XLS_EXTRA_COLS = os.getenv("XLS_EXTRA_COLS", "광고물규격,광고물높이,광고물종류").split(",")
+    UPLOAD_CHUNK_ROWS = int(os.getenv("UPLOAD_CHUNK_ROWS", "1000"))
+    UPLOAD_RETENTION_DAYS = float(os.getenv("UPLOAD_RETENTION_DAYS", "30"))   # 지난 업로드 자동 삭제
+
     SBF_ALLOWED = set(os.getenv(
         "SBF_ALLOWED",
         "SBF01,SBF02,SBF03,SBF04,SBF05,SBF06"
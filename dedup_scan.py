@@ -0,0 +1,58 @@
+# dedup_scan.py
+"""
+회사 중복 후보 전체 스캔 (META_TABLE → DATA_DIR/dup_candidates.sqlite3)
+
+    python dedup_scan.py                         # CPU 수만큼 프로세스
+    python dedup_scan.py --workers 8 --top 30    # 상위 30 묶음 출력
+    python dedup_scan.py --name-threshold 92     # 이름만 비슷한 후보 기준 완화
+
+• 결과는 /api/company/duplicates 와 같은 저장소에 새 실행으로 기록 (웹 화면에서 바로 조회)
+• 병합/무시 처리된 회사 조합은 제외 (utils.dedup.DupStore.resolved)
+"""
+import argparse
+
+from blueprints.company import _normalize_company_name
+from config import Config
+from utils import dedup
+from utils.pool import make_pool
+
+
+def run(args):
+    pool = make_pool(args.section, Config.DB_INI)
+    store = dedup.DupStore(Config.DUPES_DB)
+    cols = {"id": Config.COL_ID, "name": Config.COL_COMP, "dong": Config.COL_DONG,
+            "bunji": Config.COL_BUNJI, "road": Config.COL_ROAD}
+    try:
+        run_id = dedup.run_scan(
+            store, pool, _normalize_company_name, Config.META_TABLE, cols,
+            workers=args.workers or Config.DUP_WORKERS, log=lambda m: print(m, flush=True),
+            addr_threshold=args.addr_threshold, name_threshold=args.name_threshold,
+            bands=args.bands, rows_per_band=args.rows, block_max=args.block_max)
+    finally:
+        pool.closeall()
+    if run_id is None:
+        print("[dedup] 이미 실행 중인 스캔이 있습니다 (웹 또는 다른 프로세스).")
+        return
+    print(f"[dedup] LSH 경계 Jaccard ≈ {dedup.lsh_threshold(args.bands, args.rows)}")
+    for c in store.page(run_id, limit=args.top):
+        names = " | ".join(f"{m['id']}:{m['name']}" for m in c["members"][:6])
+        print(f"#{c['rank']:<5} {c['score']:5.1f} ({','.join(c['reasons'])}) [{c['dong']}] {names}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="회사 중복 후보 전체 스캔")
+    ap.add_argument("--section", default="meta_db", help="db_config.ini 섹션")
+    ap.add_argument("--workers", type=int, default=0, help="프로세스 수 (기본 DUP_WORKERS / CPU 수)")
+    ap.add_argument("--addr-threshold", type=int, default=dedup.ADDR_THRESHOLD,
+                    help="같은 번지/도로명 안 후보 점수 하한")
+    ap.add_argument("--name-threshold", type=int, default=dedup.NAME_THRESHOLD,
+                    help="주소 근거 없이 이름만 비슷한 후보 점수 하한")
+    ap.add_argument("--bands", type=int, default=dedup.LSH_BANDS, help="MinHash LSH band 수")
+    ap.add_argument("--rows", type=int, default=dedup.LSH_ROWS, help="band 당 해시 수")
+    ap.add_argument("--block-max", type=int, default=dedup.BLOCK_MAX, help="이보다 큰 블록은 건너뜀")
+    ap.add_argument("--top", type=int, default=20, help="끝나고 출력할 상위 묶음 수")
+    run(ap.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,12 @@
 import logging, sys, os
-import mysql.connector.pooling, psycopg2.pool
-import configparser
+import pathlib
 from config import Config
+from utils.blobcache import BlobCache
+from utils.respcache import make_backend, FileBackend
+from utils.imgproc import ImageService, default_workers
+from utils.static_index import StaticImageIndex
+from utils.dedup import DupStore
+from utils.pool import make_pool
 
 logger = logging.getLogger("signboard")
 if not logger.handlers:
@@ -19,19 +24,28 @@ def init_extensions(app):
     app.config["IMG_POOL"]  = make_pool("image_db", ini)
     app.config["VER_POOL"]  = make_pool("verify_db", ini)
 
+    # 이미지 BLOB 캐시 (/api/sign/image_blob)
+    app.config["BLOB_CACHE"] = BlobCache(
+        Config.BLOB_CACHE_DIR,
+        max_bytes=Config.BLOB_CACHE_MAX_BYTES,
+        disk_max_bytes=Config.BLOB_CACHE_DISK_MAX_BYTES)
 
-# DB 풀 생성 함수
-def make_pool(section, ini_file):
-    cfg = configparser.ConfigParser(inline_comment_prefixes=(';', '#'))
-    cfg.read(ini_file, encoding="utf-8")
-    p = cfg[section]; drv = p.get("driver","postgres").lower()
-    if drv == "postgres":
-        return psycopg2.pool.SimpleConnectionPool(
-            1, int(p.get("pool_max",10)),
-            host=p["host"], port=p["port"], dbname=p["dbname"],
-            user=p["user"], password=p["password"])
-    else:
-        return mysql.connector.pooling.MySQLConnectionPool(
-            pool_name=f"{section}_pool", pool_size=int(p.get("pool_max",10)),
-            host=p["host"], port=int(p["port"]), database=p["dbname"],
-            user=p["user"], password=p["password"], autocommit=True)
+    # 이미지 처리 프로세스 풀 (sign.image_replace / images.upload)
+    workers = Config.IMAGE_WORKERS or default_workers()
+    app.config["IMAGE_SERVICE"] = ImageService(
+        workers=workers,
+        max_pending=Config.IMAGE_MAX_PENDING or workers * 4,
+        job_ttl=Config.IMAGE_JOB_TTL,
+        jobs_dir=Config.IMAGE_JOBS_DIR)
+
+    # static/images 파일명 인덱스 (/api/sign/static_images)
+    app.config["STATIC_IMAGES"] = StaticImageIndex(
+        pathlib.Path(app.static_folder) / "images", poll=Config.STATIC_INDEX_POLL).start()
+
+    # 회사 중복 후보 결과 (/api/company/duplicates, dedup_scan.py)
+    app.config["DUP_STORE"] = DupStore(Config.DUPES_DB)
+
+    # 읽기 API 응답 캐시 (utils.respcache.cached / purge)
+    app.config["RESP_CACHE"] = make_backend(Config.RESP_CACHE_BACKEND, Config.RESP_CACHE_DIR)
+    if isinstance(app.config["RESP_CACHE"], FileBackend):
+        app.config["RESP_CACHE"].sweep()
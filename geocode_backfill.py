@@ -0,0 +1,230 @@
+# geocode_backfill.py
+"""
+회사 좌표 일괄 백필 (META_TABLE.COL_LAT / COL_LON 채우기)
+
+    python geocode_backfill.py                   # 체크포인트부터 이어서
+    python geocode_backfill.py --ensure-columns  # 좌표 컬럼 없으면 추가 후 실행
+    python geocode_backfill.py --restart --all   # 처음부터, 이미 채워진 행도 다시
+
+• META_TABLE 을 COL_ID 기준 keyset 페이지(--page)로 순회 (OFFSET 안 씀)
+• 페이지 안의 주소는 스레드 풀(--workers)로 동시 지오코딩, 토큰 버킷(--rate/초)으로 API 호출 제한
+  (utils.geocode 영구 캐시를 거치므로 이미 조회한 주소는 API 호출 없음)
+• 페이지마다 UPDATE ... FROM (VALUES ...) 1문장으로 저장 → 체크포인트(마지막 id) 기록
+• API 오류(429·5xx·타임아웃)로 실패한 id 는 체크포인트의 failed_ids 에 남겨
+  그 실행 끝에 한 번 더, 그래도 실패하면 다음 실행 끝에 다시 시도 ("결과 없음"은 재시도 안 함)
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import Config
+from utils.pool import make_pool
+from utils.geocode import geocode, GeocodeError, compose_address
+from utils.schema import SCHEMA
+
+CHECKPOINT = Config.DATA_DIR / "geocode_backfill.json"
+
+
+class TokenBucket:
+    """초당 rate 개, 최대 burst 개까지 몰아서 허용"""
+
+    def __init__(self, rate: float, burst: int = None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1, int(rate)))
+        self.tokens = self.capacity
+        self.stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+                self.stamp = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# === 체크포인트 ===
+def load_checkpoint() -> dict:
+    try:
+        with open(CHECKPOINT, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_checkpoint(state: dict):
+    CHECKPOINT.parent.mkdir(parents=True, exist_ok=True)
+    tmp = CHECKPOINT.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp, CHECKPOINT)
+
+
+# === DB ===
+def ensure_columns(pool, table: str, lat: str, lon: str):
+    conn = pool.getconn()
+    try:
+        cur = conn.cursor()
+        for col in (lat, lon):
+            cur.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {col} DOUBLE PRECISION")
+        conn.commit()
+        cur.close()
+    finally:
+        pool.putconn(conn)
+    SCHEMA.invalidate(table)
+
+
+def _select(pool, sql, params):
+    conn = pool.getconn()
+    try:
+        cur = conn.cursor()
+        cur.execute(sql, params)
+        rows = cur.fetchall()
+        cur.close()
+        return rows
+    finally:
+        pool.putconn(conn)
+
+
+def _row_cols() -> str:
+    c = Config
+    return f"{c.COL_ID}, t_add_road, {c.COL_DONG}, {c.COL_BUNJI}, {c.COL_BUNJI2}"
+
+
+def fetch_page(pool, last_id, size: int, only_missing: bool):
+    c = Config
+    where = [f"{c.COL_ID} > %s"] if last_id is not None else []
+    if only_missing:
+        where.append(f"{c.COL_LAT} IS NULL")
+    sql = (f"SELECT {_row_cols()} FROM {c.META_TABLE} "
+           + (f"WHERE {' AND '.join(where)} " if where else "")
+           + f"ORDER BY {c.COL_ID} LIMIT %s")
+    params = ((last_id,) if last_id is not None else ()) + (size,)
+    return _select(pool, sql, params)
+
+
+def fetch_ids(pool, ids):
+    """재시도할 id 목록의 행 (삭제된 id 는 빠짐)"""
+    c = Config
+    ph = ", ".join(["%s"] * len(ids))
+    sql = f"SELECT {_row_cols()} FROM {c.META_TABLE} WHERE {c.COL_ID} IN ({ph}) ORDER BY {c.COL_ID}"
+    return _select(pool, sql, tuple(ids))
+
+
+def write_coords(pool, found):
+    """found: [(id, lat, lon)] → 한 문장으로 갱신"""
+    if not found:
+        return
+    c = Config
+    if pool.dialect == "postgresql":
+        values = ", ".join(["(%s, %s, %s)"] * len(found))
+        sql = (f"UPDATE {c.META_TABLE} AS t SET {c.COL_LAT} = v.lat, {c.COL_LON} = v.lon "
+               f"FROM (VALUES {values}) AS v(id, lat, lon) WHERE t.{c.COL_ID} = v.id")
+    else:
+        values = " UNION ALL ".join(["SELECT %s AS id, %s AS lat, %s AS lon"] * len(found))
+        sql = (f"UPDATE {c.META_TABLE} AS t JOIN ({values}) AS v ON t.{c.COL_ID} = v.id "
+               f"SET t.{c.COL_LAT} = v.lat, t.{c.COL_LON} = v.lon")
+    params = [x for row in found for x in row]
+    conn = pool.getconn()
+    try:
+        cur = conn.cursor()
+        cur.execute(sql, params)
+        conn.commit()
+        cur.close()
+    finally:
+        pool.putconn(conn)
+
+
+# === 실행 ===
+def run(args):
+    pool = make_pool(args.section, Config.DB_INI)
+    if args.ensure_columns:
+        ensure_columns(pool, Config.META_TABLE, Config.COL_LAT, Config.COL_LON)
+
+    state = {} if args.restart else load_checkpoint()
+    last_id = state.get("last_id")
+    stats = {k: state.get(k, 0) for k in ("scanned", "found", "missed", "failed")}
+    failed_ids = list(state.get("failed_ids", []))      # 지난 실행에서 API 오류로 남은 id
+    retry = []                                           # 재시도 단계에서 아직 안 한 id
+    bucket = TokenBucket(args.rate, args.burst)
+    key = args.key or Config.KAKAO_KEY
+
+    def work(row):
+        cid, road, dong, bunji, bunji2 = row
+        addr = compose_address(road, dong, bunji, bunji2)
+        if not addr:
+            return cid, None, "missed"
+        try:
+            r = geocode(addr, key=key, limiter=bucket)
+            return cid, (r["lat"], r["lng"]), "found"
+        except GeocodeError as e:
+            return cid, None, "missed" if str(e).startswith("no result") else "failed"
+
+    def checkpoint():
+        if not args.dry_run:               # dry-run 이 체크포인트를 밀면 다음 실제 실행이 그만큼 건너뜀
+            save_checkpoint({"last_id": last_id, "failed_ids": failed_ids + retry, **stats})
+
+    with ThreadPoolExecutor(max_workers=args.workers) as ex:
+        def geocode_rows(rows):
+            """→ 좌표를 찾은 행 수. API 오류 id 는 failed_ids 로"""
+            found = []
+            for cid, coords, kind in ex.map(work, rows):
+                stats[kind] += 1
+                if coords:
+                    found.append((cid, coords[0], coords[1]))
+                elif kind == "failed":
+                    failed_ids.append(cid)
+            if not args.dry_run:
+                write_coords(pool, found)
+            return len(found)
+
+        while True:
+            t0 = time.perf_counter()
+            rows = fetch_page(pool, last_id, args.page, not args.all)
+            if not rows:
+                break
+            n_found = geocode_rows(rows)
+            stats["scanned"] += len(rows)
+            last_id = rows[-1][0]
+            checkpoint()
+            print(f"[backfill] ~{last_id}  page={len(rows)} found={n_found} "
+                  f"total={stats}  {time.perf_counter() - t0:.1f}s", flush=True)
+
+        # API 오류로 건너뛴 행 재시도 (이번 실행 + 지난 실행분). 또 실패하면 다음 실행으로
+        retry, failed_ids = failed_ids, []
+        while retry:
+            chunk, retry = retry[:args.page], retry[args.page:]
+            stats["failed"] -= len(chunk)
+            n_found = geocode_rows(fetch_ids(pool, chunk))
+            checkpoint()
+            print(f"[backfill] retry {len(chunk)} found={n_found} total={stats}", flush=True)
+
+    print(f"[backfill] done: {stats}")
+    pool.closeall()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="회사 좌표 일괄 지오코딩 백필")
+    ap.add_argument("--section", default="meta_db", help="db_config.ini 섹션")
+    ap.add_argument("--page", type=int, default=500, help="keyset 페이지 크기")
+    ap.add_argument("--workers", type=int, default=8, help="동시 지오코딩 스레드 수")
+    ap.add_argument("--rate", type=float, default=10.0, help="초당 API 호출 상한")
+    ap.add_argument("--burst", type=int, default=None, help="토큰 버킷 최대치 (기본 rate)")
+    ap.add_argument("--key", default=None, help="Kakao REST 키 (기본 KAKAO_KEY)")
+    ap.add_argument("--all", action="store_true", help="이미 좌표가 있는 행도 다시 계산")
+    ap.add_argument("--restart", action="store_true", help="체크포인트 무시하고 처음부터")
+    ap.add_argument("--ensure-columns", action="store_true", help="좌표 컬럼이 없으면 추가")
+    ap.add_argument("--dry-run", action="store_true", help="DB 에 쓰지 않음")
+    run(ap.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,74 +1,39 @@
-import sys, os, traceback, configparser, urllib.parse, webbrowser
+import sys, os, traceback, urllib.parse, webbrowser
 from datetime import datetime
 import pandas as pd
-import psycopg2, psycopg2.pool
-import mysql.connector.pooling
+from utils.pool import make_pool as _make_pool
 from PyQt5.QtCore    import Qt, QThread, pyqtSignal, QUrl
 from PyQt5.QtGui     import QPixmap, QFont, QDesktopServices
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QPushButton, QTextEdit,
     QHBoxLayout, QVBoxLayout, QSplitter, QFileDialog, QMessageBox
 )
-import requests
+from utils.geocode import geocode_kakao   # 웹 앱과 같은 영구 캐시(DATA_DIR) 사용
+from utils.qt_prefetch import PixmapLRU, Prefetcher, fit_pixmap, neighbours
 KAKAO_KEY = "364d1d857bf47a507fe237a9e20f00e4"  # ← 실제 키로 변경
-
-def geocode_kakao(addr: str):
-    """
-    주소 → (longitude, latitude)
-    실패 시 (None, None) 반환
-    """
-
-    if not KAKAO_KEY:
-            return None, None
-    url = "https://dapi.kakao.com/v2/local/search/address.json"
-    headers = {"Authorization": f"KakaoAK {KAKAO_KEY}"}
-    r = requests.get(url, params={"query": addr}, headers=headers, timeout=5)
-    if r.status_code != 200 or not r.json().get("documents"):
-        return None, None
-    doc = r.json()["documents"][0]
-    return float(doc["x"]), float(doc["y"])          # (lng, lat)
+PREFETCH_AHEAD  = int(os.getenv("PREFETCH_AHEAD", "3"))              # 앞/뒤 몇 장 미리 읽을지
+CACHE_MAX_BYTES = int(os.getenv("REVIEW_CACHE_MAX_BYTES", str(256 << 20)))
     
 # ───── DB 풀 팩토리 ───────────────────────────────────────────
-class MySQLPoolAdapter:
-    def __init__(self,p): self._p=p
-    def getconn(self):  return self._p.get_connection()
-    def putconn(self,c): c.close()
-
 def make_pool(sec, ini="db_config.ini"):
-    cfg=configparser.ConfigParser(inline_comment_prefixes=(';', '#'))
-    cfg.read(ini,encoding="utf-8")
-    p=cfg[sec]; drv=p.get("driver","postgres").lower()
+    # 웹 앱과 같은 풀 구현 사용 (postgres / mariadb 모두 getconn/putconn, 스레드 안전)
     try:
-        if drv=="postgres":
-            pool=psycopg2.pool.SimpleConnectionPool(
-                1,int(p.get("pool_max",10)),
-                host=p["host"], port=p["port"], dbname=p["dbname"],
-                user=p["user"], password=p["password"])
-        else:
-            mp=mysql.connector.pooling.MySQLConnectionPool(
-                pool_name=f"{sec}_pool", pool_size=int(p.get("pool_max",10)),
-                host=p["host"], port=int(p["port"]), database=p["dbname"],
-                user=p["user"], password=p["password"], autocommit=True)
-            pool=MySQLPoolAdapter(mp)
+        pool=_make_pool(sec, ini)
         pool.putconn(pool.getconn())  # test
         return pool, None
     except Exception as e:
         return None, str(e)
 
+# ───── 이미지 조회 (Prefetcher 워커 스레드에서 호출) ───────────
+def fetch_img(pool,i_img):
+    c=pool.getconn()
+    try:
+        cur=c.cursor(); cur.execute("SELECT b_img FROM T_X_IMG WHERE i_img=%s",(i_img,))
+        row=cur.fetchone(); cur.close()
+    finally: pool.putconn(c)
+    return row[0] if row and row[0] is not None else None
+
 # ───── 스레드 ────────────────────────────────────────────────
-class FetchOne(QThread):
-    done=pyqtSignal(str,bytes); err=pyqtSignal(str)
-    def __init__(self,pool,i_img):
-        super().__init__(); self.pool=pool; self.i_img=i_img
-    def run(self):
-        try:
-            c=self.pool.getconn(); cur=c.cursor()
-            cur.execute("SELECT b_img FROM T_X_IMG WHERE i_img=%s",(self.i_img,))
-            row=cur.fetchone(); self.pool.putconn(c)
-            if not row or row[0] is None: self.err.emit(f"이미지 없음: {self.i_img}"); return
-            blob=row[0]; blob=bytes(blob) if isinstance(blob, memoryview) else blob
-            self.done.emit(self.i_img, blob)
-        except Exception: self.err.emit(traceback.format_exc())
 
 class Save(QThread):
     done=pyqtSignal(str); err=pyqtSignal(str)
@@ -141,8 +106,11 @@ class Reviewer(QWidget):
 
         lay=QVBoxLayout(self); lay.addWidget(split); lay.addLayout(nav); lay.addLayout(act); lay.addWidget(self.memo); lay.addWidget(self.log)
 
-        # 상태
-        self.idx=0; self.cache={}; self.thread=None
+        # 상태 — 이미지: 앞/뒤 PREFETCH_AHEAD 장 선읽기 + 바이트 상한 LRU (blob + QPixmap)
+        self.idx=0; self.step=1; self._threads=set()
+        self.cache=PixmapLRU(CACHE_MAX_BYTES)
+        self.prefetch=Prefetcher(lambda i:fetch_img(self.pool_img,i), size=(1200,900), workers=3, cache=self.cache, parent=self)
+        self.prefetch.loaded.connect(self.on_blob); self.prefetch.failed.connect(self.on_fail)
         self.show_current()
 
     # 로그
@@ -150,21 +118,29 @@ class Reviewer(QWidget):
         t=datetime.now().strftime('%H:%M:%S')
         self.logs=self.logs[-3:]+[f"[{t}] {msg}"]; self.log.setPlainText("\n".join(self.logs))
 
-    # DB fetch
-    def fetch_blob(self,i_img):
-        if i_img in self.cache: self.display(i_img,self.cache[i_img]); return
-        self.pic.setText("🔄 로딩…"); th=FetchOne(self.pool_img,i_img); self.thread=th
-        th.done.connect(lambda id,b:self.on_blob(id,b)); th.err.connect(self.err); th.start(); self._log(f"요청: {i_img}")
+    # DB fetch (캐시 → 없으면 선읽기 결과 도착 시 on_blob 에서 표시)
+    def cur_img(self): return f"p_if_pk_{self.id_list[self.idx]}"
 
-    def on_blob(self,i,b):
-        self.cache[i]=b; self.display(i,b); self.thread=None; self._log(f"로드: {i}")
+    def fetch_blob(self,i_img):
+        pix=self.cache.pixmap(i_img)
+        if pix is not None: self.display(i_img,pix)
+        else: self.pic.setText("🔄 로딩…"); self._log(f"요청: {i_img}")
+        ids=self.id_list
+        self.prefetch.request(f"p_if_pk_{ids[i]}" for i in neighbours(self.idx,len(ids),PREFETCH_AHEAD,self.step))
+
+    def on_blob(self,i,b,img):
+        pix=QPixmap.fromImage(img); self.cache.put(i,b,pix)
+        if i==self.cur_img(): self.display(i,pix); self._log(f"로드: {i}")
+    def on_fail(self,i,msg):
+        if i!=self.cur_img(): return                 # 선읽기 실패는 해당 장으로 이동할 때 다시 시도
+        if "\n" in msg.strip(): self.err(msg)
+        else: self.pic.setText(f"{msg}: {i}"); self._log(f"{msg}: {i}")
     def err(self,msg):
-        QMessageBox.critical(self,"오류",msg); self._log("오류"); self.thread=None
+        QMessageBox.critical(self,"오류",msg); self._log("오류")
 
     # 표시
-    def display(self,i_img,blob):
-        pix=QPixmap(); ok=pix.loadFromData(blob)
-        self.pic.setPixmap(pix.scaled(self.pic.size(),Qt.KeepAspectRatio,Qt.SmoothTransformation) if ok else QPixmap())
+    def display(self,i_img,pix):
+        self.pic.setPixmap(fit_pixmap(pix,self.pic.size()))
         row=self.rows[self.idx]
         meta=(f"<b>{row['company_name']}</b><br>"
               f"• 주소: {row['읍면동']} {row['번지']}<br>"
@@ -176,17 +152,16 @@ class Reviewer(QWidget):
 
     # 이동
     def move(self,st):
-        if self.thread and self.thread.isRunning(): return
-        self.idx=(self.idx+st)%len(self.id_list); self.show_current()
+        self.step=st; self.idx=(self.idx+st)%len(self.id_list); self.show_current()
 
     def show_current(self):
-        i_img=f"p_if_pk_{self.id_list[self.idx]}"; self.fetch_blob(i_img)
+        self.fetch_blob(self.cur_img())
 
     # 저장
     def save(self,res):
-        if self.thread and self.thread.isRunning(): return
-        i_img=f"p_if_pk_{self.id_list[self.idx]}"; txt=self.memo.toPlainText().strip()
-        sv=Save(self.pool_ver,i_img,res,txt,self.reviewer)
+        i_img=self.cur_img(); txt=self.memo.toPlainText().strip()
+        sv=Save(self.pool_ver,i_img,res,txt,self.reviewer); self._threads.add(sv)
+        sv.finished.connect(lambda sv=sv:self._threads.discard(sv))
         sv.done.connect(lambda r:self._log(f"저장: {i_img}→{r}")); sv.err.connect(self.err); sv.start()
 
     # 폴더 열기
@@ -204,7 +179,7 @@ class Reviewer(QWidget):
         )
 
         # ② 좌표 얻기
-        lng, lat = geocode_kakao(addr)
+        lng, lat = geocode_kakao(addr, key=KAKAO_KEY)
         print(lng, lat)
         if lng and lat:
             # ③ 좌표 기반 URL - 줌 18단계
@@ -223,7 +198,8 @@ class Reviewer(QWidget):
 
 
     def closeEvent(self,e):
-        if self.thread and self.thread.isRunning(): self.thread.quit(); self.thread.wait()
+        self.prefetch.shutdown()
+        for th in list(self._threads): th.wait()
         e.accept()
 
 # 실행
@@ -10,19 +10,21 @@
    └─ QImage (클립보드)
 • 드롭/붙여넣기 → data/{ad_idx}.jpg 저장
 • “◀/▶” 이동 시 드롭 존 리셋
-• 온디맨드 DB 로딩, 폴더·지도 버튼, 4줄 로그, QThread 안전 종료
+• 앞/뒤 이미지 선읽기(QThreadPool) + 바이트 상한 LRU 캐시 → ◀/▶ 즉시 표시
+• 폴더·지도 버튼, 4줄 로그, QThread 안전 종료
 ─────────────────────────────────────────────────────────────────
 필수 패키지
     pip install PyQt5 psycopg2-binary mysql-connector-python
     pip install pandas openpyxl requests beautifulsoup4
 """
 
-import sys, os, re, base64, traceback, urllib.parse, webbrowser, requests, configparser
+import sys, os, re, base64, traceback, urllib.parse, webbrowser
 from datetime import datetime
 from bs4 import BeautifulSoup
 import pandas as pd
-import psycopg2, psycopg2.pool
-import mysql.connector.pooling
+from utils.pool import make_pool as _make_pool
+from utils.http import HTTP     # 공용 HTTP 클라이언트 (keep-alive, 재시도, 크기 제한)
+from utils.qt_prefetch import PixmapLRU, Prefetcher, fit_pixmap, neighbours
 from PyQt5.QtCore    import Qt, QThread, pyqtSignal, QUrl, QBuffer, QIODevice
 from PyQt5.QtGui     import QPixmap, QGuiApplication, QKeySequence, QDesktopServices
 from PyQt5.QtWidgets import (
@@ -35,6 +37,38 @@ from PyQt5.QtWidgets import (
 # ──────────────────────────────────────────────────────────
 IMG_EXT = (".jpg", ".jpeg", ".png", ".gif", ".webp")
 _DATA_URL_RE = re.compile(r'data:image/[^;]+;base64,(.*)', re.I)
+PAGE_MAX_BYTES = 2 << 20        # og:image 찾을 HTML 페이지 상한
+IMG_MAX_BYTES  = 20 << 20       # 드롭 이미지 상한
+PREFETCH_AHEAD  = int(os.getenv("PREFETCH_AHEAD", "3"))              # 앞/뒤 몇 장 미리 읽을지
+CACHE_MAX_BYTES = int(os.getenv("REVIEW_CACHE_MAX_BYTES", str(256 << 20)))
+
+class FetchUrl(QThread):
+    """http(s) URL → 이미지 bytes (직접 이미지 또는 HTML 의 og:image), GUI 스레드 밖에서"""
+    done = pyqtSignal(bytes)
+    err  = pyqtSignal(str)
+    def __init__(self, url):
+        super().__init__(); self.url = url
+    def run(self):
+        try:
+            # 직접 이미지 확장자
+            if self.url.lower().split("?")[0].endswith(IMG_EXT):
+                self.done.emit(HTTP.get_bytes(self.url, max_bytes=IMG_MAX_BYTES)); return
+
+            # HTML → og:image 추출 (이미지 응답이면 그대로 사용)
+            r = HTTP.get(self.url, max_bytes=PAGE_MAX_BYTES)
+            r.raise_for_status()
+            ctype = r.headers.get("Content-Type", "")
+            if ctype.startswith("image/"):
+                self.done.emit(r.content); return
+            if "text/html" in ctype:
+                soup = BeautifulSoup(r.text, "html.parser")
+                og = soup.find("meta", property="og:image")
+                if og and og.get("content"):
+                    img_url = urllib.parse.urljoin(r.url, og["content"])
+                    self.done.emit(HTTP.get_bytes(img_url, max_bytes=IMG_MAX_BYTES)); return
+            self.err.emit("이미지를 찾지 못했습니다")
+        except Exception as e:
+            self.err.emit(str(e))
 
 class DropImageLabel(QLabel):
     """드롭 또는 Ctrl+V 붙여넣기 → on_receive(bytes) 호출"""
@@ -45,6 +79,8 @@ class DropImageLabel(QLabel):
         self.setAcceptDrops(True)
         self.setStyleSheet("border:2px dashed #888; color:#555;")
         self.on_receive = on_receive
+        self._fetch = None          # 가장 최근 FetchUrl (마지막 드롭만 반영)
+        self._fetches = set()       # 실행 중 스레드 참조 유지
 
     def reset(self):
         self.clear()
@@ -79,27 +115,9 @@ class DropImageLabel(QLabel):
                     try: return self._accept(base64.b64decode(m.group(1)))
                     except Exception: pass
 
-                # http(s) URL
+                # http(s) URL → 백그라운드 다운로드 (UI 멈춤 없음)
                 if s.startswith("http"):
-                    try:
-                        # 직접 이미지 확장자
-                        if s.lower().endswith(IMG_EXT):
-                            r = requests.get(s, timeout=5); r.raise_for_status()
-                            return self._accept(r.content)
-
-                        # HTML → og:image 추출
-                        r = requests.get(
-                            s, timeout=5,
-                            headers={"User-Agent": "Mozilla/5.0"})
-                        if "text/html" in r.headers.get("Content-Type", ""):
-                            soup = BeautifulSoup(r.text, "html.parser")
-                            og = soup.find("meta", property="og:image")
-                            if og and og.get("content"):
-                                img = requests.get(og["content"], timeout=5)
-                                img.raise_for_status()
-                                return self._accept(img.content)
-                    except Exception:
-                        pass
+                    return self._fetch_url(s)
 
         # 2) 바이너리 이미지(QImage)
         if md.hasImage():
@@ -110,6 +128,21 @@ class DropImageLabel(QLabel):
                 px.save(buf, "JPG")
                 return self._accept(bytes(buf.data()))
 
+    def _fetch_url(self, url):
+        th = FetchUrl(url)
+        self._fetch = th
+        th.done.connect(lambda b, th=th: self._accept(b) if th is self._fetch else None)
+        th.err .connect(lambda m, th=th: self.setText(f"가져오기 실패\n{m}") if th is self._fetch else None)
+        self._fetches.add(th)
+        th.finished.connect(lambda th=th: self._fetches.discard(th))
+        self.setText("이미지 가져오는 중…")
+        th.start()
+
+    def wait_fetch(self):
+        """종료 시 진행 중 다운로드 대기"""
+        for th in list(self._fetches):
+            th.wait(3000)
+
     def _accept(self, data: bytes):
         pix = QPixmap(); pix.loadFromData(data)
         self.setPixmap(pix.scaled(
@@ -119,33 +152,10 @@ class DropImageLabel(QLabel):
 # ──────────────────────────────────────────────────────────
 # 2. DB Connection Pool
 # ──────────────────────────────────────────────────────────
-class MySQLPoolAdapter:
-    def __init__(self, p): self._p = p
-    def getconn(self):     return self._p.get_connection()
-    def putconn(self, c):  c.close()
-
 def make_pool(section, ini="db_config.ini"):
-    cfg = configparser.ConfigParser(inline_comment_prefixes=(';', '#'))
-    cfg.read(ini, encoding="utf-8")
-    p = cfg[section]
-    drv = p.get("driver", "postgres").lower()
-
+    # 웹 앱과 같은 풀 구현 사용 (postgres / mariadb 모두 getconn/putconn, 스레드 안전)
     try:
-        if drv == "postgres":
-            pool = psycopg2.pool.SimpleConnectionPool(
-                1, int(p.get("pool_max", 10)),
-                host=p["host"], port=p["port"],
-                dbname=p["dbname"], user=p["user"], password=p["password"])
-        else:
-            mp = mysql.connector.pooling.MySQLConnectionPool(
-                pool_name=f"{section}_pool",
-                pool_size=int(p.get("pool_max", 10)),
-                host=p["host"], port=int(p["port"]),
-                database=p["dbname"],
-                user=p["user"], password=p["password"],
-                autocommit=True)
-            pool = MySQLPoolAdapter(mp)
-
+        pool = _make_pool(section, ini)
         pool.putconn(pool.getconn())  # 연결 테스트
         return pool
     except Exception as e:
@@ -153,23 +163,17 @@ def make_pool(section, ini="db_config.ini"):
         sys.exit(0)
 
 # ──────────────────────────────────────────────────────────
-# 3. 스레드 (이미지 Fetch / 결과 Save)
+# 3. 이미지 조회 (Prefetcher 워커) / 결과 Save 스레드
 # ──────────────────────────────────────────────────────────
-class FetchOne(QThread):
-    done = pyqtSignal(str, bytes)
-    err  = pyqtSignal(str)
-    def __init__(self, pool, i_img):
-        super().__init__(); self.pool=pool; self.i_img=i_img
-    def run(self):
-        try:
-            cn=self.pool.getconn(); cur=cn.cursor()
-            cur.execute("SELECT b_img FROM T_X_IMG WHERE i_img=%s",(self.i_img,))
-            row=cur.fetchone(); self.pool.putconn(cn)
-            if not row or row[0] is None:
-                self.err.emit("이미지 없음"); return
-            self.done.emit(self.i_img, bytes(row[0]))
-        except Exception:
-            self.err.emit(traceback.format_exc())
+def fetch_img(pool, i_img):
+    cn = pool.getconn()
+    try:
+        cur = cn.cursor()
+        cur.execute("SELECT b_img FROM T_X_IMG WHERE i_img=%s", (i_img,))
+        row = cur.fetchone(); cur.close()
+    finally:
+        pool.putconn(cn)
+    return row[0] if row and row[0] is not None else None
 
 class Save(QThread):
     done=pyqtSignal(str); err=pyqtSignal(str)
@@ -273,7 +277,14 @@ class Reviewer(QWidget):
 
         # 상태
         self.idx = 0
-        self.cache = {}
+        self.step = 1
+
+        # 이미지: 앞/뒤 PREFETCH_AHEAD 장 선읽기 + 바이트 상한 LRU (blob + 800×600 QPixmap)
+        self.cache = PixmapLRU(CACHE_MAX_BYTES)
+        self.prefetch = Prefetcher(lambda i: fetch_img(self.pool_img, i),
+                                   size=(800, 600), workers=3, cache=self.cache, parent=self)
+        self.prefetch.loaded.connect(self.on_blob)
+        self.prefetch.failed.connect(self.on_fail)
 
         self.show_current()
 
@@ -296,19 +307,34 @@ class Reviewer(QWidget):
         self._log(f"저장: {os.path.basename(path)}")
 
     # -------- DB 이미지 --------
+    def cur_img(self):
+        return f"p_if_pk_{self.ids[self.idx]}"
+
     def fetch_blob(self, i_img):
-        if i_img in self.cache:
-            self.display(i_img, self.cache[i_img]); return
-        th = FetchOne(self.pool_img, i_img); self._track(th)
-        th.done.connect(lambda I,b: self.display(I,b))
-        th.err .connect(self.error)
-        th.start(); self._log(f"요청: {i_img}")
-
-    def display(self, i_img, blob):
-        self.cache[i_img] = blob
-        pix = QPixmap(); pix.loadFromData(blob)
-        self.pic.setPixmap(pix.scaled(
-            self.pic.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        pix = self.cache.pixmap(i_img)
+        if pix is not None:
+            self.display(i_img, pix)
+        else:
+            self.pic.setText("🔄 로딩…"); self._log(f"요청: {i_img}")
+        order = neighbours(self.idx, len(self.ids), PREFETCH_AHEAD, self.step)
+        self.prefetch.request(f"p_if_pk_{self.ids[i]}" for i in order)
+
+    def on_blob(self, i_img, blob, img):
+        pix = QPixmap.fromImage(img)
+        self.cache.put(i_img, blob, pix)
+        if i_img == self.cur_img():
+            self.display(i_img, pix)
+
+    def on_fail(self, i_img, msg):
+        if i_img != self.cur_img():
+            return                  # 선읽기 실패는 해당 장으로 이동할 때 다시 시도
+        if "\n" in msg.strip():
+            self.error(msg)
+        else:
+            self.pic.setText(msg); self._log(f"{msg}: {i_img}")
+
+    def display(self, i_img, pix):
+        self.pic.setPixmap(fit_pixmap(pix, self.pic.size()))
         r = self.rows[self.idx]
         self.meta.setHtml(
             f"<b>{r['company_name']}</b><br>"
@@ -323,12 +349,13 @@ class Reviewer(QWidget):
 
     # -------- 네비게이션 --------
     def move(self, step):
+        self.step = step
         self.idx = (self.idx + step) % len(self.ids)
         self.dropper.reset()          # 드롭 존 초기화
         self.show_current()
 
     def show_current(self):
-        self.fetch_blob(f"p_if_pk_{self.ids[self.idx]}")
+        self.fetch_blob(self.cur_img())
 
     # -------- 저장 --------
     def save(self, res):
@@ -363,6 +390,8 @@ class Reviewer(QWidget):
         self._log("오류")
 
     def closeEvent(self, e):
+        self.dropper.wait_fetch()
+        self.prefetch.shutdown()
         for th in list(self._threads):
             if th.isRunning():
                 th.quit()
@@ -0,0 +1,10 @@
+-- migrations/001_review_log_keyset_indexes.sql
+-- T_X_REVIEW_LOG keyset 페이지네이션용 복합 인덱스 (verify_db / MariaDB)
+--   /api/review/by_company : WHERE i_cpn=?  ORDER BY created_at DESC, id DESC
+--   /api/review/by_sign    : WHERE i_info=? ORDER BY created_at DESC, id DESC
+--   /api/review/summary    : WHERE created_at >= ? ORDER BY created_at DESC, id DESC
+-- 적용: mysql -h <host> -u <user> -p signboard < migrations/001_review_log_keyset_indexes.sql
+
+CREATE INDEX IF NOT EXISTS ix_review_log_cpn_created  ON T_X_REVIEW_LOG (i_cpn, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_review_log_info_created ON T_X_REVIEW_LOG (i_info, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_review_log_created      ON T_X_REVIEW_LOG (created_at, id);
@@ -0,0 +1,6 @@
+-- migrations/002_img_verify_pending_index.sql
+-- admin_review.py 대기 목록 keyset 페이지용 인덱스 (verify_db / MariaDB)
+--   WHERE c_admin IS NULL AND (d_verify, i_img) > (?, ?) ORDER BY d_verify, i_img LIMIT n
+-- 적용: mysql -h <host> -u <user> -p signboard < migrations/002_img_verify_pending_index.sql
+
+CREATE INDEX IF NOT EXISTS ix_img_verify_pending ON T_X_IMG_VERIFY (c_admin, d_verify, i_img);
@@ -0,0 +1,43 @@
+-- migrations/003_img_history_content_addressed.sql
+-- 간판 이미지 이력을 내용 해시(sha256) 기준으로 저장 (image_db / PostgreSQL 11+)
+--   T_X_IMG.sha         : 현재 이미지 해시 (NULL 이면 교체 시 DB 에서 계산)
+--   T_X_IMG_BLOB        : sha → 바이트, 같은 내용은 1회만 저장
+--   T_X_IMG_HISTORY     : b_img 대신 sha 만 기록, (i_info, created_at, id) 인덱스로 목록 조회
+-- 기존 이력 행의 b_img 는 T_X_IMG_BLOB 로 옮긴 뒤 비움 (중복 이미지는 한 벌만 남음)
+-- 적용: psql -h <host> -U <user> -d <db> -f migrations/003_img_history_content_addressed.sql
+--       (적용 후 VACUUM FULL T_X_IMG_HISTORY; 로 공간 회수)
+
+BEGIN;
+
+ALTER TABLE T_X_IMG ADD COLUMN IF NOT EXISTS sha CHAR(64);
+
+CREATE TABLE IF NOT EXISTS T_X_IMG_BLOB (
+    sha        CHAR(64) PRIMARY KEY,
+    b_img      BYTEA    NOT NULL,
+    n_bytes    INTEGER  NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS T_X_IMG_HISTORY (
+    id         BIGSERIAL PRIMARY KEY,
+    i_info     TEXT      NOT NULL,
+    i_img      TEXT      NOT NULL,
+    sha        CHAR(64),
+    b_img      BYTEA,
+    created_at TIMESTAMP NOT NULL DEFAULT now()
+);
+ALTER TABLE T_X_IMG_HISTORY ADD COLUMN IF NOT EXISTS sha CHAR(64);
+ALTER TABLE T_X_IMG_HISTORY ALTER COLUMN b_img DROP NOT NULL;
+
+-- 기존 이력 → content-addressed
+UPDATE T_X_IMG_HISTORY SET sha = encode(sha256(b_img), 'hex')
+ WHERE sha IS NULL AND b_img IS NOT NULL;
+INSERT INTO T_X_IMG_BLOB (sha, b_img, n_bytes)
+SELECT DISTINCT ON (sha) sha, b_img, octet_length(b_img)
+  FROM T_X_IMG_HISTORY WHERE b_img IS NOT NULL
+ON CONFLICT (sha) DO NOTHING;
+UPDATE T_X_IMG_HISTORY SET b_img = NULL WHERE b_img IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS ix_img_history_info ON T_X_IMG_HISTORY (i_info, created_at DESC, id DESC) INCLUDE (sha);
+
+COMMIT;
@@ -0,0 +1,112 @@
+# tests/test_geocode.py
+"""
+utils.geocode — 영구 캐시 / 결과 없음 캐시 / single-flight 를 로컬 스텁 HTTP 서버로 확인
+
+    python -m pytest -q tests/test_geocode.py
+(KAKAO_API_BASE 를 스레드로 띄운 http.server 로 바꾸고, 캐시는 임시 sqlite 파일)
+"""
+import json
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+pytest.importorskip("requests")
+
+from utils import geocode
+from utils.http import HttpClient
+
+
+class StubKakao(BaseHTTPRequestHandler):
+    """query 로 동작 선택: 없는주소 → documents=[], 오류주소 → 503, 느린주소 → 응답 지연"""
+    hits = Counter()
+    delay = 0.0
+
+    def do_GET(self):
+        q = parse_qs(urlsplit(self.path).query).get("query", [""])[0]
+        type(self).hits[q] += 1
+        if q == "오류주소":
+            self.send_response(503)
+            self.end_headers()
+            return
+        if q == "느린주소":
+            time.sleep(1.0)
+        elif self.delay:
+            time.sleep(self.delay)
+        docs = [] if q == "없는주소" else [{"x": "127.1", "y": "37.5"}]
+        body = json.dumps({"documents": docs}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _ShortTimeout(HttpClient):
+    """_kakao 의 timeout=5 대신 짧게 (타임아웃 테스트용)"""
+
+    def request(self, method, url, max_bytes=None, **kw):
+        kw["timeout"] = 0.5
+        return super().request(method, url, max_bytes=max_bytes, **kw)
+
+
+@pytest.fixture
+def stub(tmp_path, monkeypatch):
+    StubKakao.hits = Counter()
+    StubKakao.delay = 0.0
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), StubKakao)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    monkeypatch.setattr(geocode, "KAKAO_API_BASE", f"http://127.0.0.1:{srv.server_port}")
+    monkeypatch.setattr(geocode, "KAKAO_KEY", "test-key")
+    monkeypatch.setattr(geocode, "GEOCODE_CACHE_PATH", str(tmp_path / "geocode_cache.sqlite3"))
+    monkeypatch.setattr(geocode, "_cache", None)
+    monkeypatch.setattr(geocode, "HTTP", _ShortTimeout(retries=0, per_host=16))
+    try:
+        yield StubKakao
+    finally:
+        srv.shutdown()
+        srv.server_close()
+
+
+def test_repeat_lookup_served_from_cache(stub):
+    assert geocode.geocode("역삼동  123") == {"lng": 127.1, "lat": 37.5}
+    assert geocode.geocode("역삼동 123") == {"lng": 127.1, "lat": 37.5}     # 공백 정규화 → 같은 키
+    assert stub.hits["역삼동 123"] == 1
+    assert geocode.geo_cache().info()["entries"] == 1
+
+
+def test_no_result_cached_until_negative_ttl(stub, monkeypatch):
+    monkeypatch.setattr(geocode, "GEOCODE_NEG_TTL", 0.5)
+    for _ in range(3):
+        with pytest.raises(geocode.GeocodeError, match="no result"):
+            geocode.geocode("없는주소")
+    assert stub.hits["없는주소"] == 1
+    time.sleep(0.6)
+    with pytest.raises(geocode.GeocodeError, match="no result"):
+        geocode.geocode("없는주소")
+    assert stub.hits["없는주소"] == 2
+
+
+def test_concurrent_lookups_hit_upstream_once(stub):
+    stub.delay = 0.1                              # 8개가 모두 대기하는 동안 첫 호출 진행 중
+    with ThreadPoolExecutor(8) as ex:
+        results = list(ex.map(lambda _: geocode.geocode("삼성동 1"), range(8)))
+    assert all(r == {"lng": 127.1, "lat": 37.5} for r in results)
+    assert stub.hits["삼성동 1"] == 1
+
+
+@pytest.mark.parametrize("addr", ["오류주소", "느린주소"])
+def test_errors_are_not_cached(stub, addr):
+    for n in (1, 2):
+        with pytest.raises(geocode.GeocodeError) as ei:
+            geocode.geocode(addr)
+        assert "no result" not in str(ei.value)
+        assert stub.hits[addr] == n                # 캐시 안 됨 → 매번 다시 호출
+    assert geocode.geo_cache().info()["entries"] == 0
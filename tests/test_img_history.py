@@ -0,0 +1,82 @@
+# tests/test_img_history.py
+"""
+utils.img_history.replace_image — 교체 후 이전 이미지가 이력/BLOB 에 남는지
+
+    TEST_PG_DSN="dbname=test user=postgres" python -m pytest -q tests
+(TEST_PG_DSN 이 없으면 DB 테스트는 건너뜀 — 임시 스키마를 만들고 끝나면 삭제)
+"""
+import os
+import uuid
+
+import pytest
+
+from utils.blobcache import content_hash
+from utils.img_history import _PG_LOCK, _PG_REPLACE, history_blob, history_index, img_key, replace_image
+
+DSN = os.getenv("TEST_PG_DSN")
+
+
+def test_pg_lock_is_separate_statement():
+    # 잠금이 CTE 안에 있으면 형제 CTE(up)가 먼저 실행될 때 old 가 비어 이력이 사라짐
+    assert "FOR UPDATE" in _PG_LOCK
+    assert "FOR UPDATE" not in _PG_REPLACE
+    assert "%(old_sha)s" in _PG_REPLACE
+
+
+class _Pool:
+    dialect = "postgresql"
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def getconn(self):
+        return self.conn
+
+    def putconn(self, conn, close=False):
+        pass
+
+
+@pytest.fixture
+def pg_pool():
+    if not DSN:
+        pytest.skip("TEST_PG_DSN 미설정")
+    psycopg2 = pytest.importorskip("psycopg2")
+    conn = psycopg2.connect(DSN)
+    schema = f"t_img_hist_{uuid.uuid4().hex[:8]}"
+    cur = conn.cursor()
+    cur.execute(f"CREATE SCHEMA {schema}; SET search_path TO {schema}")
+    cur.execute("""
+        CREATE TABLE T_X_IMG (i_img TEXT PRIMARY KEY, b_img BYTEA, sha CHAR(64));
+        CREATE TABLE T_X_IMG_BLOB (sha CHAR(64) PRIMARY KEY, b_img BYTEA NOT NULL,
+                                   n_bytes INTEGER, created_at TIMESTAMPTZ);
+        CREATE TABLE T_X_IMG_HISTORY (id BIGSERIAL PRIMARY KEY, i_info TEXT, i_img TEXT,
+                                      sha CHAR(64), created_at TIMESTAMPTZ);
+        CREATE TABLE sb (i_info TEXT PRIMARY KEY, i_cpn TEXT, q_img_w INTEGER, q_img_h INTEGER);
+        INSERT INTO sb VALUES ('1', 'c1', NULL, NULL);
+    """)
+    conn.commit()
+    try:
+        yield _Pool(conn)
+    finally:
+        conn.rollback()
+        cur = conn.cursor()
+        cur.execute(f"DROP SCHEMA {schema} CASCADE")
+        conn.commit()
+        conn.close()
+
+
+def test_replace_keeps_history(pg_pool):
+    first, second = b"\xff\xd8first", b"\xff\xd8second"
+    sha1, owners = replace_image(pg_pool, "1", first, 10, 20, "sb", "i_info", "i_cpn")
+    assert owners == ["c1"]
+    assert history_index(pg_pool, "1") == []               # 이전 이미지 없음 → 이력 없음
+
+    sha2, _ = replace_image(pg_pool, "1", second, 30, 40, "sb", "i_info", "i_cpn")
+    hist = history_index(pg_pool, "1")
+    assert [h["sha"] for h in hist] == [sha1]
+    assert hist[0]["i_img"] == img_key("1")
+    assert history_blob(pg_pool, sha1) == first
+    assert sha2 == content_hash(second)
+
+    replace_image(pg_pool, "1", second, 30, 40, "sb", "i_info", "i_cpn")   # 같은 내용 → 이력 안 늘어남
+    assert len(history_index(pg_pool, "1")) == 1
@@ -0,0 +1,148 @@
+# tests/test_journal.py
+"""
+utils.journal.WriteBehindQueue — verify DB 가 잠깐 끊겨도 검수 로그가 사라지지 않는지
+
+    python -m pytest -q tests/test_journal.py
+(DB 없이 임시 디렉터리 + 가짜 flush 로 확인)
+"""
+import json
+import os
+import time
+
+import pytest
+
+from utils import journal
+from utils.journal import WriteBehindQueue, _read_ack
+
+
+class OperationalError(Exception):
+    pass
+
+
+class DataError(Exception):
+    pass
+
+
+class FakeDB:
+    """처음 fail_times 번은 연결 오류, bad 표시된 행이 섞이면 DataError"""
+
+    def __init__(self, fail_times=0):
+        self.fail_times = fail_times
+        self.rows = []
+        self.calls = 0
+
+    def flush(self, records):
+        self.calls += 1
+        if self.fail_times > 0:
+            self.fail_times -= 1
+            raise OperationalError("server has gone away")
+        if any(r.get("bad") for r in records):
+            raise DataError("Data too long for column 'comment'")
+        self.rows += [r["n"] for r in records]
+
+
+def wait_until(cond, timeout=5.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if cond():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def make_queue(tmp_path, db, **kw):
+    kw.setdefault("interval", 0.01)
+    kw.setdefault("max_backoff", 0.05)
+    return WriteBehindQueue(tmp_path, flush=db.flush, name="t", **kw)
+
+
+def test_retry_after_failure_keeps_order_and_acks(tmp_path):
+    db = FakeDB(fail_times=2)
+    q = make_queue(tmp_path, db)
+    for n in range(5):
+        q.put({"n": n})
+    q.start()
+    assert wait_until(lambda: q.status()["depth"] == 0)
+    q.stop()
+    assert db.rows == [0, 1, 2, 3, 4]
+    st = q.status()
+    assert st["failures"] == 2 and st["flushed"] == 5 and st["last_error"] is None
+    assert _read_ack(q.ack_path) == q.log_path.stat().st_size     # 저널 끝까지 반영 표시
+
+
+def test_pending_survives_restart(tmp_path):
+    db = FakeDB(fail_times=10 ** 6)                # DB 계속 끊김
+    q = make_queue(tmp_path, db).start()
+    q.put({"n": 1})
+    q.put({"n": 2})
+    q.stop(timeout=1)
+    q._f.close()
+
+    db2 = FakeDB()
+    q2 = make_queue(tmp_path, db2)                 # 같은 pid → 같은 저널에서 이어받음
+    assert q2.status()["recovered"] == 2
+    q2.start()
+    assert wait_until(lambda: q2.status()["depth"] == 0)
+    q2.stop()
+    assert db2.rows == [1, 2]
+
+
+def test_rejected_row_does_not_block_queue(tmp_path):
+    db = FakeDB()
+    q = make_queue(tmp_path, db)
+    q.put({"n": 1})
+    q.put({"n": 2, "bad": True})
+    q.put({"n": 3})
+    q.start()
+    assert wait_until(lambda: q.status()["depth"] == 0)
+    q.stop()
+    assert db.rows == [1, 3]
+    st = q.status()
+    assert st["rejected"] == 1 and st["rejected_file"] == q.rejected_path.name
+    rej = [json.loads(l) for l in q.rejected_path.read_text(encoding="utf-8").splitlines()]
+    assert rej[0]["record"]["n"] == 2 and "DataError" in rej[0]["error"]
+
+
+def test_transient_error_is_not_rejected():
+    assert journal.is_data_error(DataError())
+    assert not journal.is_data_error(OperationalError())
+    assert not journal.is_data_error(TimeoutError())
+
+
+@pytest.mark.skipif(journal.fcntl is None, reason="잠금 없는 플랫폼은 고아 저널을 가져가지 않음")
+def test_drain_orphan_journal_of_dead_pid(tmp_path):
+    dead = tmp_path / "t-999999.log"
+    lines = [json.dumps({"n": n}).encode() + b"\n" for n in range(4)]
+    dead.write_bytes(b"".join(lines) + b'{"n": 99')           # 마지막 줄은 쓰다 만 상태
+    journal._write_ack(dead.with_suffix(".ack"), len(lines[0]) + len(lines[1]))
+
+    db = FakeDB(fail_times=1)
+    q = make_queue(tmp_path, db)
+    q._drain_orphans()                               # 첫 시도는 DB 오류 → 파일 그대로
+    assert dead.exists() and db.rows == []
+    q._drain_orphans()
+    assert db.rows == [2, 3]                         # ack 이후만, 쓰다 만 줄 제외
+    assert not dead.exists() and not dead.with_suffix(".ack").exists()
+
+
+def test_rotation_keeps_records_written_after(tmp_path):
+    db = FakeDB()
+    q = make_queue(tmp_path, db, rotate_bytes=32).start()
+    for n in range(5):
+        q.put({"n": n})
+    assert wait_until(lambda: q.status()["flushed"] == 5)
+    assert wait_until(lambda: q.status()["journal_bytes"] == 0)     # 다 반영 → 비움
+
+    db.fail_times = 10 ** 6                          # 회전 직후 DB 끊김
+    q.put({"n": 5})
+    q.put({"n": 6})
+    q.stop(timeout=1)
+    q._f.close()
+    assert _read_ack(q.ack_path) == 0
+
+    db2 = FakeDB()
+    q2 = make_queue(tmp_path, db2).start()
+    assert wait_until(lambda: q2.status()["depth"] == 0)
+    q2.stop()
+    assert db.rows + db2.rows == [0, 1, 2, 3, 4, 5, 6]
+    assert os.path.getsize(q2.log_path) == _read_ack(q2.ack_path)
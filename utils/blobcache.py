@@ -0,0 +1,177 @@
+# utils/blobcache.py
+"""
+이미지 BLOB 캐시 (메모리 LRU + 디스크 spill)
+
+• 키(i_img) → 내용 해시(sha256) 인덱스  +  해시 → 바이트 저장소 (content-addressed)
+• 1차: 프로세스 내 LRU (총 바이트 기준 상한)
+• 2차: DATA_DIR/blob_cache 디스크 (objects/ab/abcdef..., keys/<i_img>)
+• 해시값을 그대로 강한 ETag 로 사용 → If-None-Match 일치 시 DB 조회 없이 304
+• keys/ 파일의 mtime 을 매번 확인하므로 다른 gunicorn 워커의 invalidate 도 반영됨
+"""
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+
+class CacheEntry(NamedTuple):
+    data: bytes
+    etag: str           # sha256 hex (강한 ETag)
+    mtime: float        # 캐시에 들어온 시각 → Last-Modified
+
+
+class _KeyInfo(NamedTuple):
+    etag: str
+    mtime: float
+    stamp: float        # keys/ 파일 mtime (워커 간 무효화 감지용)
+
+
+_SAFE_KEY_RE = re.compile(r"[^0-9A-Za-z_.\-]")
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class BlobCache:
+    def __init__(self, spill_dir, max_bytes: int = 64 << 20, disk_max_bytes: int = 1 << 30):
+        self.max_bytes = int(max_bytes)
+        self.disk_max_bytes = int(disk_max_bytes)
+        self.root = Path(spill_dir)
+        self.obj_dir = self.root / "objects"
+        self.key_dir = self.root / "keys"
+        self.obj_dir.mkdir(parents=True, exist_ok=True)
+        self.key_dir.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._keys = {}                    # key -> _KeyInfo
+        self._lru = OrderedDict()          # etag -> bytes
+        self._mem_bytes = 0
+        self._disk_bytes = sum(p.stat().st_size for p in self.obj_dir.glob("*/*"))
+        self.stats = {"hit_mem": 0, "hit_disk": 0, "miss": 0, "put": 0, "invalidate": 0}
+
+    # ---------- 경로 ----------
+    def _key_path(self, key: str) -> Path:
+        return self.key_dir / _SAFE_KEY_RE.sub("_", key)
+
+    def _obj_path(self, etag: str) -> Path:
+        return self.obj_dir / etag[:2] / etag
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    # ---------- 키 인덱스 ----------
+    def lookup(self, key: str) -> Optional[_KeyInfo]:
+        """key → (etag, mtime). BLOB 을 읽지 않으므로 304 판정에 사용"""
+        kp = self._key_path(key)
+        try:
+            stamp = kp.stat().st_mtime
+        except FileNotFoundError:
+            with self._lock:
+                self._keys.pop(key, None)
+            return None
+
+        with self._lock:
+            info = self._keys.get(key)
+            if info and info.stamp == stamp:
+                return info
+        try:
+            etag, mtime = kp.read_text(encoding="ascii").split()
+            info = _KeyInfo(etag, float(mtime), stamp)
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            self._keys[key] = info
+        return info
+
+    # ---------- 조회/저장 ----------
+    def get(self, key: str) -> Optional[CacheEntry]:
+        info = self.lookup(key)
+        if info is None:
+            self.stats["miss"] += 1
+            return None
+
+        with self._lock:
+            data = self._lru.get(info.etag)
+            if data is not None:
+                self._lru.move_to_end(info.etag)
+                self.stats["hit_mem"] += 1
+                return CacheEntry(data, info.etag, info.mtime)
+
+        try:
+            data = self._obj_path(info.etag).read_bytes()
+        except FileNotFoundError:
+            self.stats["miss"] += 1
+            return None
+        self.stats["hit_disk"] += 1
+        self._remember(info.etag, data)
+        return CacheEntry(data, info.etag, info.mtime)
+
+    def put(self, key: str, data: bytes) -> CacheEntry:
+        etag = content_hash(data)
+        mtime = time.time()
+        op = self._obj_path(etag)
+        if not op.exists():
+            self._write_atomic(op, data)
+            self._disk_bytes += len(data)
+        self._write_atomic(self._key_path(key), f"{etag} {mtime:.3f}".encode("ascii"))
+        self._remember(etag, data)
+        with self._lock:
+            self._keys.pop(key, None)     # 다음 lookup 때 파일 stamp 로 다시 적재
+        self.stats["put"] += 1
+        if self._disk_bytes > self.disk_max_bytes:
+            self._prune_disk()
+        return CacheEntry(data, etag, mtime)
+
+    def invalidate(self, key: str):
+        with self._lock:
+            self._keys.pop(key, None)
+        try:
+            self._key_path(key).unlink()
+        except FileNotFoundError:
+            pass
+        self.stats["invalidate"] += 1
+
+    # ---------- 내부 ----------
+    def _remember(self, etag: str, data: bytes):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            if etag in self._lru:
+                self._lru.move_to_end(etag)
+                return
+            self._lru[etag] = data
+            self._mem_bytes += len(data)
+            while self._mem_bytes > self.max_bytes and self._lru:
+                _, old = self._lru.popitem(last=False)
+                self._mem_bytes -= len(old)
+
+    def _prune_disk(self):
+        """오래된 객체부터 삭제해 디스크 상한의 90% 까지 줄임 (keys/ 는 lookup 시 자연 정리)"""
+        files = sorted(self.obj_dir.glob("*/*"), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in files)
+        target = int(self.disk_max_bytes * 0.9)
+        for p in files:
+            if total <= target:
+                break
+            try:
+                size = p.stat().st_size
+                p.unlink()
+                total -= size
+            except FileNotFoundError:
+                pass
+        self._disk_bytes = total
+
+    def info(self) -> dict:
+        with self._lock:
+            return {**self.stats, "mem_bytes": self._mem_bytes, "mem_items": len(self._lru),
+                    "disk_bytes": self._disk_bytes}
@@ -1,6 +1,12 @@
-def db_select_all(sql, params=(), use=None):
+# utils/db.py
+# use= 에는 utils.pool.ManagedPool (META_POOL / IMG_POOL / VER_POOL) 을 넘김.
+# postgres / mariadb 구분 없이 동일하게 동작.
+
+def db_select_all(sql, params=(), use=None, prepared=False):
     c = use.getconn()
     try:
+        if prepared:
+            return use.execute_prepared(c, sql, params).fetchall()
         cur = c.cursor()
         cur.execute(sql, params)
         rows = cur.fetchall()
@@ -11,19 +17,51 @@ def db_select_all(sql, params=(), use=None):
 def db_select_all_dict(sql, params=(), use=None):
     c = use.getconn()
     try:
-        cur = c.cursor()
+        cur = use.cursor(c, dict_cursor=True)
         cur.execute(sql, params)
-        desc = [d[0] for d in cur.description]
-        rows = cur.fetchall()
+        rows = [dict(r) for r in cur.fetchall()]
         cur.close()
-        return [dict(zip(desc, r)) for r in rows]
+        return rows
     finally: use.putconn(c)
 
-def db_execute(sql, params=(), use=None):
+def db_execute(sql, params=(), use=None, prepared=False):
     c = use.getconn()
     try:
-        cur = c.cursor()
-        cur.execute(sql, params)
+        if prepared:
+            use.execute_prepared(c, sql, params)
+        else:
+            cur = c.cursor()
+            cur.execute(sql, params)
+            cur.close()
         if hasattr(c, "commit"): c.commit()
-        cur.close()
     finally: use.putconn(c)
+
+def db_iter(sql, params=(), use=None, chunk=2000):
+    """
+    server-side 커서로 chunk 행씩 yield (전체 결과를 메모리에 올리지 않음).
+    제너레이터를 끝까지 돌리거나 close() 하면 연결 반납.
+    """
+    c = use.getconn()
+    broken = False
+    cur = None
+    try:
+        cur = use.server_cursor(c, itersize=chunk)
+        cur.execute(sql, params)
+        while True:
+            rows = cur.fetchmany(chunk)
+            if not rows:
+                break
+            yield rows
+    except GeneratorExit:
+        broken = True          # 중간 종료(클라이언트 끊김 등) → 남은 결과가 걸린 연결은 폐기
+        raise
+    except Exception:
+        broken = True
+        raise
+    finally:
+        try:
+            if cur is not None:
+                cur.close()
+        except Exception:
+            broken = True
+        use.putconn(c, close=broken)
@@ -0,0 +1,586 @@
+# utils/dedup.py
+"""
+회사 중복 후보 일괄 탐지 (META_TABLE 전체 → 순위 매긴 후보 묶음)
+
+    store = DupStore(DATA_DIR / "dup_candidates.sqlite3")
+    run_id = store.begin_run(params)
+    res = scan(rows, normalize, workers=8, resolved=store.resolved_groups())
+    store.finish_run(run_id, res)               # rows: (id, 회사명, 동, 번지, 도로명주소)
+
+• 회사명은 normalize(_normalize_company_name) 결과로 비교, 2글자 미만은 제외
+• 블로킹은 동(dong) 단위 샤드 안에서만:
+    - 같은 번지  → 점수 addr_threshold 이상이면 후보
+    - 같은 도로명주소(건물번호까지) → 〃
+    - 이름만 비슷 → 2-gram MinHash LSH(bands × rows) 버킷이 겹치는 것끼리, name_threshold 이상
+  block_max 보다 큰 주소 블록은 LSH 버킷으로만 비교 (대형 상가 전체 n² 방지)
+• 점수 = max(ratio, token_set_ratio) — rapidfuzz.process.cdist 로 블록 단위 행렬 계산
+  (rapidfuzz/numpy 없으면 difflib 폴백 — 느림)
+• 샤드는 ProcessPoolExecutor(workers, spawn) 로 분산, 간선은 union-find 로 묶음
+• resolved(병합 완료/중복 아님 처리)된 같은 그룹끼리의 간선은 버림
+"""
+import json
+import math
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:          # numpy 미설치 → 순수 파이썬 MinHash
+    np = None
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:          # rapidfuzz 미설치 → difflib 폴백
+    fuzz = process = None
+
+ADDR_THRESHOLD = int(os.getenv("DUP_ADDR_THRESHOLD", "85"))
+NAME_THRESHOLD = int(os.getenv("DUP_NAME_THRESHOLD", "95"))
+LSH_BANDS = int(os.getenv("DUP_LSH_BANDS", "12"))
+LSH_ROWS = int(os.getenv("DUP_LSH_ROWS", "3"))
+BLOCK_MAX = int(os.getenv("DUP_BLOCK_MAX", "2000"))
+SHARD_ROWS = int(os.getenv("DUP_SHARD_ROWS", "20000"))
+
+REASON_RANK = {"bunji": 0, "road": 1, "name": 2}
+_PRIME = 4294967311                  # 2^32 보다 큰 첫 소수
+
+
+# === 주소 키 ===
+def bunji_key(s) -> str:
+    """'123-4 번지' / '산 12번지' → '123-4' / '산12'"""
+    s = "".join(str(s or "").split()).replace("번지", "")
+    return s.strip("-")
+
+
+def road_key(s) -> str:
+    """'테헤란로 123, 2층 (역삼동)' → '테헤란로123' (건물번호까지만)"""
+    s = str(s or "").split(",")[0].split("(")[0]
+    return "".join(s.split()).lower()
+
+
+def _grams(s: str, n: int = 2) -> List[int]:
+    if len(s) <= n:
+        return [zlib.crc32(s.encode())]
+    return list({zlib.crc32(s[i:i + n].encode()) for i in range(len(s) - n + 1)})
+
+
+# === MinHash LSH ===
+def _perms(k: int):
+    import random
+    rnd = random.Random(20240611)            # 고정 시드 → 워커 간/실행 간 같은 서명
+    return [(rnd.randrange(1, 1 << 31), rnd.randrange(0, 1 << 32)) for _ in range(k)]
+
+
+def minhash_bands(names: List[str], bands: int = LSH_BANDS, rows: int = LSH_ROWS) -> List[List[int]]:
+    """
+    이름별 band 해시 목록 (band 하나라도 같으면 후보). 서명 = min((a·h + b) mod P), h = 2-gram crc32
+    a < 2^31, h < 2^32 → uint64 안에서 계산 가능
+    """
+    perms = _perms(bands * rows)
+    out = []
+    if np is not None:
+        a = np.array([p[0] for p in perms], dtype=np.uint64)[:, None]
+        b = np.array([p[1] for p in perms], dtype=np.uint64)[:, None]
+        for s in names:
+            h = np.array(_grams(s), dtype=np.uint64)[None, :]
+            sig = ((a * h + b) % _PRIME).min(axis=1).reshape(bands, rows)
+            out.append([hash((bi, *row.tolist())) for bi, row in enumerate(sig)])
+        return out
+    for s in names:
+        hs = _grams(s)
+        sig = [min((pa * x + pb) % _PRIME for x in hs) for pa, pb in perms]
+        out.append([hash((bi, *sig[bi * rows:(bi + 1) * rows])) for bi in range(bands)])
+    return out
+
+
+# === 점수 ===
+def _score_matrix(names: List[str], cutoff: int):
+    """블록 안 모든 쌍 점수 → [(i, j, score)] (i < j, score ≥ cutoff)"""
+    n = len(names)
+    if process is not None and np is not None:
+        r = process.cdist(names, names, scorer=fuzz.ratio, score_cutoff=cutoff, dtype=np.uint8, workers=1)
+        t = process.cdist(names, names, scorer=fuzz.token_set_ratio, score_cutoff=cutoff,
+                          dtype=np.uint8, workers=1)
+        m = np.triu(np.maximum(r, t), k=1)
+        ii, jj = np.nonzero(m >= cutoff)
+        return [(int(i), int(j), int(m[i, j])) for i, j in zip(ii, jj)]
+    from difflib import SequenceMatcher
+    out = []
+    for i in range(n):
+        sm = SequenceMatcher(None, "", names[i])     # b 쪽을 고정해야 내부 색인 재사용
+        for j in range(i + 1, n):
+            sm.set_seq1(names[j])
+            if sm.real_quick_ratio() * 100 < cutoff or sm.quick_ratio() * 100 < cutoff:
+                continue
+            sc = int(round(100 * sm.ratio()))
+            if sc >= cutoff:
+                out.append((i, j, sc))
+    return out
+
+
+def _score_pairs(names: List[str], pairs: Iterable[Tuple[int, int]], cutoff: int):
+    """LSH 후보 쌍만 점수 계산 → [(i, j, score)]"""
+    pairs = list(pairs)
+    if not pairs:
+        return []
+    if process is not None:
+        out = []
+        for i, j in pairs:
+            sc = max(fuzz.ratio(names[i], names[j]), fuzz.token_set_ratio(names[i], names[j]))
+            if sc >= cutoff:
+                out.append((i, j, int(sc)))
+        return out
+    from difflib import SequenceMatcher
+    out = []
+    for i, j in pairs:
+        sc = int(round(100 * SequenceMatcher(None, names[i], names[j]).ratio()))
+        if sc >= cutoff:
+            out.append((i, j, sc))
+    return out
+
+
+# === 샤드 처리 (워커 프로세스, 모듈 최상위 → pickle 가능) ===
+def scan_shard(shard: List[Tuple[int, str, str, str, str]], opts: dict) -> dict:
+    """
+    shard: [(전역 idx, 동, 정규화 이름, 번지키, 도로명키)] — 같은 동끼리 모여 있음
+    → {"edges": [(gi, gj, score, reason)], "blocks": n, "pairs": n, "oversized": n}
+    """
+    edges: Dict[Tuple[int, int], Tuple[int, str]] = {}
+    stats = {"blocks": 0, "pairs": 0, "oversized": 0}
+
+    def keep(gi, gj, sc, reason):
+        k = (gi, gj) if gi < gj else (gj, gi)
+        old = edges.get(k)
+        if old is None or (sc, -REASON_RANK[reason]) > (old[0], -REASON_RANK[old[1]]):
+            edges[k] = (sc, reason)
+
+    by_dong = defaultdict(list)
+    for rec in shard:
+        by_dong[rec[1]].append(rec)
+
+    for recs in by_dong.values():
+        if len(recs) < 2:
+            continue
+        names = [r[2] for r in recs]
+
+        # 1) 주소 블록 (번지 / 도로명)
+        for reason, col in (("bunji", 3), ("road", 4)):
+            blocks = defaultdict(list)
+            for li, r in enumerate(recs):
+                if r[col]:
+                    blocks[r[col]].append(li)
+            for members in blocks.values():
+                if len(members) < 2:
+                    continue
+                if len(members) > opts["block_max"]:
+                    stats["oversized"] += 1
+                    continue
+                stats["blocks"] += 1
+                stats["pairs"] += len(members) * (len(members) - 1) // 2
+                for i, j, sc in _score_matrix([names[m] for m in members], opts["addr_threshold"]):
+                    keep(recs[members[i]][0], recs[members[j]][0], sc, reason)
+
+        # 2) 이름 LSH (같은 동, 주소 무관)
+        buckets = defaultdict(list)
+        for li, bands in enumerate(minhash_bands(names, opts["bands"], opts["rows"])):
+            for h in bands:
+                buckets[h].append(li)
+        cand = set()
+        for members in buckets.values():
+            if 2 <= len(members) <= opts["block_max"]:
+                cand.update((members[a], members[b])
+                            for a in range(len(members)) for b in range(a + 1, len(members)))
+        cand = {(i, j) for i, j in cand
+                if (recs[i][0], recs[j][0]) not in edges and (recs[j][0], recs[i][0]) not in edges}
+        stats["pairs"] += len(cand)
+        for i, j, sc in _score_pairs(names, cand, opts["name_threshold"]):
+            keep(recs[i][0], recs[j][0], sc, "name")
+
+    stats["edges"] = [(i, j, sc, reason) for (i, j), (sc, reason) in edges.items()]
+    return stats
+
+
+# === union-find ===
+class _DSU:
+    def __init__(self):
+        self.p = {}
+
+    def find(self, x):
+        p = self.p
+        p.setdefault(x, x)
+        root = x
+        while p[root] != root:
+            root = p[root]
+        while p[x] != root:
+            p[x], x = root, p[x]
+        return root
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.p[max(ra, rb)] = min(ra, rb)
+
+
+def _shards(records: List[Tuple], shard_rows: int):
+    """동 단위로 묶어 shard_rows 근처 크기의 작업으로 (큰 동은 단독)"""
+    by_dong = defaultdict(list)
+    for rec in records:
+        by_dong[rec[1]].append(rec)
+    cur, n = [], 0
+    for dong in sorted(by_dong, key=lambda d: -len(by_dong[d])):
+        recs = by_dong[dong]
+        if cur and n + len(recs) > shard_rows:
+            yield cur
+            cur, n = [], 0
+        cur.extend(recs)
+        n += len(recs)
+    if cur:
+        yield cur
+
+
+def scan(rows: Iterable[Tuple], normalize: Callable[[str], str], workers: int = 0,
+         resolved: Optional[Dict[str, str]] = None, addr_threshold: int = ADDR_THRESHOLD,
+         name_threshold: int = NAME_THRESHOLD, bands: int = LSH_BANDS, rows_per_band: int = LSH_ROWS,
+         block_max: int = BLOCK_MAX, shard_rows: int = SHARD_ROWS, progress: Callable = None) -> dict:
+    """
+    rows: (id, 회사명, 동, 번지, 도로명주소)
+    resolved: str(id) → 그룹 (같은 그룹끼리는 후보에서 제외)
+    → {"clusters": [...], "stats": {...}}
+    """
+    t0 = time.perf_counter()
+    ids, raw_names, dongs, bunjis, records = [], [], [], [], []
+    skipped = 0
+    for cid, name, dong, bunji, road in rows:
+        norm = normalize(name or "")
+        if len(norm) < 2:
+            skipped += 1
+            continue
+        gi = len(ids)
+        ids.append(cid)
+        raw_names.append(name)
+        dongs.append((dong or "").strip())
+        bunjis.append(bunji)
+        records.append((gi, dongs[-1], norm, bunji_key(bunji), road_key(road)))
+    t_load = time.perf_counter() - t0
+
+    opts = {"addr_threshold": addr_threshold, "name_threshold": name_threshold,
+            "bands": bands, "rows": rows_per_band, "block_max": block_max}
+    shards = list(_shards(records, shard_rows))
+    workers = workers or max(1, min(len(shards), os.cpu_count() or 1))
+    stats = {"companies": len(ids), "skipped": skipped, "shards": len(shards), "workers": workers,
+             "blocks": 0, "pairs": 0, "oversized": 0, "edges": 0}
+    edges = []
+
+    def take(res):
+        for k in ("blocks", "pairs", "oversized"):
+            stats[k] += res[k]
+        edges.extend(res["edges"])
+        if progress:
+            progress(stats)
+
+    if workers <= 1 or len(shards) <= 1:
+        for sh in shards:
+            take(scan_shard(sh, opts))
+    else:
+        # spawn 을 쓰는 이유는 utils.imgproc.ImageService._executor 참고 (웹 워커에서도 실행됨)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as ex:
+            for res in ex.map(scan_shard, shards, [opts] * len(shards)):
+                take(res)
+    t_score = time.perf_counter() - t0 - t_load
+
+    resolved = resolved or {}
+    dsu = _DSU()
+    kept = []
+    for gi, gj, sc, reason in edges:
+        ga, gb = resolved.get(str(ids[gi])), resolved.get(str(ids[gj]))
+        if ga is not None and ga == gb:
+            continue
+        dsu.union(gi, gj)
+        kept.append((gi, gj, sc, reason))
+    stats["edges"] = len(kept)
+
+    groups = defaultdict(lambda: {"members": set(), "scores": [], "reasons": set()})
+    for gi, gj, sc, reason in kept:
+        g = groups[dsu.find(gi)]
+        g["members"].update((gi, gj))
+        g["scores"].append(sc)
+        g["reasons"].add(reason)
+
+    clusters = []
+    for g in groups.values():
+        members = sorted(g["members"], key=lambda i: str(ids[i]))
+        scores = g["scores"]
+        clusters.append({
+            "size": len(members),
+            "score": round(sum(scores) / len(scores), 1),
+            "score_max": max(scores),
+            "reasons": sorted(g["reasons"], key=REASON_RANK.get),
+            "dong": dongs[members[0]],
+            "members": [{"id": ids[i], "name": raw_names[i], "dong": dongs[i], "bunji": bunjis[i]}
+                        for i in members],
+        })
+    # 주소 근거 있는 것 → 점수 → 크기 순
+    clusters.sort(key=lambda c: (REASON_RANK[c["reasons"][0]], -c["score"], -c["size"]))
+    stats.update(clusters=len(clusters), load_s=round(t_load, 2), score_s=round(t_score, 2),
+                 total_s=round(time.perf_counter() - t0, 2))
+    return {"clusters": clusters, "stats": stats}
+
+
+# === 결과 저장소 (SQLite) ===
+class DupStore:
+    """
+    runs      : 실행 이력 (status running/done/error, 통계, 파라미터)
+    clusters  : run 별 후보 묶음 (rank 순, dismissed 플래그)
+    members   : (run_id, cid) → rank  — 병합/무시 처리 시 해당 묶음 찾기
+    resolved  : cid → 그룹  — 같은 그룹끼리는 다음 실행부터 후보 제외
+    """
+    KEEP_RUNS = 2
+    STALE_RUN = 6 * 3600            # running 인데 이보다 오래된 실행은 죽은 것으로 봄
+
+    def __init__(self, path):
+        self.path = str(path)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        with self._conn() as db:
+            db.executescript("""
+                PRAGMA journal_mode=WAL;
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id INTEGER PRIMARY KEY AUTOINCREMENT, status TEXT NOT NULL,
+                    started_at REAL NOT NULL, finished_at REAL, params TEXT, stats TEXT, error TEXT);
+                CREATE TABLE IF NOT EXISTS clusters (
+                    run_id INTEGER NOT NULL, rank INTEGER NOT NULL, size INTEGER NOT NULL,
+                    score REAL NOT NULL, score_max INTEGER NOT NULL, reasons TEXT NOT NULL,
+                    dong TEXT, members TEXT NOT NULL, dismissed INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (run_id, rank));
+                CREATE INDEX IF NOT EXISTS ix_clusters_dong ON clusters (run_id, dong, rank);
+                CREATE TABLE IF NOT EXISTS members (
+                    run_id INTEGER NOT NULL, cid TEXT NOT NULL, rank INTEGER NOT NULL);
+                CREATE INDEX IF NOT EXISTS ix_members_cid ON members (run_id, cid);
+                CREATE TABLE IF NOT EXISTS resolved (
+                    cid TEXT PRIMARY KEY, grp TEXT NOT NULL, how TEXT, created_at REAL NOT NULL);
+                CREATE INDEX IF NOT EXISTS ix_resolved_grp ON resolved (grp);
+            """)
+
+    def _conn(self):
+        db = sqlite3.connect(self.path, timeout=30)
+        db.row_factory = sqlite3.Row
+        return db
+
+    # ---------- 실행 ----------
+    def begin_run(self, params: dict) -> Optional[int]:
+        """진행 중인 실행이 있으면 None (여러 워커/CLI 동시 실행 방지)"""
+        with self._lock, self._conn() as db:
+            db.execute("BEGIN IMMEDIATE")
+            row = db.execute("SELECT run_id FROM runs WHERE status='running' AND started_at > ?",
+                             (time.time() - self.STALE_RUN,)).fetchone()
+            if row:
+                return None
+            db.execute("UPDATE runs SET status='error', error='stale' WHERE status='running'")
+            cur = db.execute("INSERT INTO runs (status, started_at, params) VALUES ('running', ?, ?)",
+                             (time.time(), json.dumps(params, ensure_ascii=False)))
+            return cur.lastrowid
+
+    def finish_run(self, run_id: int, result: dict):
+        """묶음 저장 + done 전환을 한 트랜잭션으로 → 조회는 항상 완성된 실행만 봄"""
+        with self._lock, self._conn() as db:
+            db.executemany(
+                "INSERT INTO clusters (run_id, rank, size, score, score_max, reasons, dong, members) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                ((run_id, rank, c["size"], c["score"], c["score_max"], ",".join(c["reasons"]), c["dong"],
+                  json.dumps(c["members"], ensure_ascii=False, default=str))
+                 for rank, c in enumerate(result["clusters"], 1)))
+            db.executemany(
+                "INSERT INTO members (run_id, cid, rank) VALUES (?, ?, ?)",
+                ((run_id, str(m["id"]), rank)
+                 for rank, c in enumerate(result["clusters"], 1) for m in c["members"]))
+            db.execute("UPDATE runs SET status='done', finished_at=?, stats=? WHERE run_id=?",
+                       (time.time(), json.dumps(result["stats"]), run_id))
+            old = [r[0] for r in db.execute(
+                "SELECT run_id FROM runs WHERE status='done' ORDER BY run_id DESC LIMIT -1 OFFSET ?",
+                (self.KEEP_RUNS,))]
+            for rid in old:
+                db.execute("DELETE FROM clusters WHERE run_id=?", (rid,))
+                db.execute("DELETE FROM members WHERE run_id=?", (rid,))
+
+    def progress(self, run_id: int, stats: dict):
+        with self._lock, self._conn() as db:
+            db.execute("UPDATE runs SET stats=? WHERE run_id=? AND status='running'",
+                       (json.dumps(stats), run_id))
+
+    def fail_run(self, run_id: int, error: str):
+        with self._lock, self._conn() as db:
+            db.execute("UPDATE runs SET status='error', finished_at=?, error=? WHERE run_id=?",
+                       (time.time(), error[:2000], run_id))
+
+    def runs(self, limit: int = 10) -> List[dict]:
+        with self._conn() as db:
+            rows = db.execute("SELECT * FROM runs ORDER BY run_id DESC LIMIT ?", (limit,)).fetchall()
+        out = []
+        for r in rows:
+            d = dict(r)
+            d["params"] = json.loads(d["params"] or "{}")
+            d["stats"] = json.loads(d["stats"] or "{}")
+            out.append(d)
+        return out
+
+    def current_run(self) -> Optional[int]:
+        with self._conn() as db:
+            row = db.execute("SELECT MAX(run_id) FROM runs WHERE status='done'").fetchone()
+        return row[0] if row else None
+
+    # ---------- 조회 ----------
+    def page(self, run_id: int, after: int = 0, limit: int = 50, dong: str = None,
+             min_score: float = None, include_dismissed: bool = False) -> List[dict]:
+        """rank keyset 페이지 (after = 이전 페이지 마지막 rank)"""
+        where, params = ["run_id = ?", "rank > ?"], [run_id, after]
+        if dong:
+            where.append("dong = ?")
+            params.append(dong)
+        if min_score is not None:
+            where.append("score >= ?")
+            params.append(min_score)
+        if not include_dismissed:
+            where.append("dismissed = 0")
+        with self._conn() as db:
+            rows = db.execute(f"SELECT * FROM clusters WHERE {' AND '.join(where)} ORDER BY rank LIMIT ?",
+                              params + [limit]).fetchall()
+        out = []
+        for r in rows:
+            d = dict(r)
+            d["members"] = json.loads(d["members"])
+            d["reasons"] = d["reasons"].split(",")
+            d["dismissed"] = bool(d["dismissed"])
+            out.append(d)
+        return out
+
+    def count(self, run_id: int, dong: str = None, include_dismissed: bool = False) -> int:
+        where, params = ["run_id = ?"], [run_id]
+        if dong:
+            where.append("dong = ?")
+            params.append(dong)
+        if not include_dismissed:
+            where.append("dismissed = 0")
+        with self._conn() as db:
+            return db.execute(f"SELECT COUNT(*) FROM clusters WHERE {' AND '.join(where)}", params).fetchone()[0]
+
+    # ---------- 병합/무시 처리 ----------
+    def resolved_groups(self) -> Dict[str, str]:
+        with self._conn() as db:
+            return {r[0]: r[1] for r in db.execute("SELECT cid, grp FROM resolved")}
+
+    def resolve(self, ids: Iterable, how: str = "merge") -> int:
+        """
+        ids 를 한 그룹으로 기록 (기존 그룹과 겹치면 합침) →
+        현재 실행에서 멤버 전원이 한 그룹이 된 묶음은 dismissed. 반환: dismissed 된 묶음 수
+        """
+        ids = sorted({str(x) for x in ids})
+        if len(ids) < 2:
+            return 0
+        ph = ",".join("?" * len(ids))
+        with self._lock, self._conn() as db:
+            olds = {r[0] for r in db.execute(f"SELECT grp FROM resolved WHERE cid IN ({ph})", ids)}
+            grp = min(olds) if olds else uuid.uuid4().hex
+            if olds - {grp}:
+                ph2 = ",".join("?" * len(olds - {grp}))
+                db.execute(f"UPDATE resolved SET grp=? WHERE grp IN ({ph2})", [grp, *(olds - {grp})])
+            db.executemany("INSERT INTO resolved (cid, grp, how, created_at) VALUES (?, ?, ?, ?) "
+                           "ON CONFLICT(cid) DO UPDATE SET grp=excluded.grp, how=excluded.how",
+                           [(cid, grp, how, time.time()) for cid in ids])
+
+            run_id = db.execute("SELECT MAX(run_id) FROM runs WHERE status='done'").fetchone()[0]
+            if run_id is None:
+                return 0
+            ranks = [r[0] for r in db.execute(
+                f"SELECT DISTINCT rank FROM members WHERE run_id=? AND cid IN ({ph})", [run_id, *ids])]
+            n = 0
+            for rank in ranks:
+                cids = [r[0] for r in db.execute("SELECT cid FROM members WHERE run_id=? AND rank=?",
+                                                 (run_id, rank))]
+                ph3 = ",".join("?" * len(cids))
+                grps = db.execute(f"SELECT COUNT(*), COUNT(DISTINCT grp) FROM resolved WHERE cid IN ({ph3})",
+                                  cids).fetchone()
+                if grps[0] == len(cids) and grps[1] == 1:
+                    db.execute("UPDATE clusters SET dismissed=1 WHERE run_id=? AND rank=?", (run_id, rank))
+                    n += 1
+            return n
+
+    def dismiss(self, run_id: int, rank: int) -> Optional[int]:
+        """묶음을 '중복 아님'으로 → 멤버를 한 그룹으로 resolve. 없으면 None"""
+        with self._conn() as db:
+            row = db.execute("SELECT members FROM clusters WHERE run_id=? AND rank=?", (run_id, rank)).fetchone()
+        if row is None:
+            return None
+        self.resolve([m["id"] for m in json.loads(row[0])], how="dismiss")
+        with self._lock, self._conn() as db:
+            db.execute("UPDATE clusters SET dismissed=1 WHERE run_id=? AND rank=?", (run_id, rank))
+        return rank
+
+
+# === DB 적재 (META_TABLE 스트리밍) ===
+def company_rows(pool, table: str, col_id: str, col_name: str, col_dong: str, col_bunji: str,
+                 col_road: Optional[str], itersize: int = 5000):
+    """(id, 회사명, 동, 번지, 도로명) 를 서버 커서로 흘려 읽음 (전체를 한 번에 받지 않음)"""
+    road = col_road or "NULL"
+    conn = pool.getconn()
+    try:
+        cur = pool.server_cursor(conn, itersize=itersize)
+        cur.execute(f"SELECT {col_id}, {col_name}, {col_dong}, {col_bunji}, {road} FROM {table}")
+        while True:
+            chunk = cur.fetchmany(itersize)
+            if not chunk:
+                break
+            yield from chunk
+        cur.close()
+        conn.commit()
+    finally:
+        pool.putconn(conn)
+
+
+def run_scan(store: DupStore, pool, normalize: Callable[[str], str], table: str, cols: dict,
+             workers: int = 0, log: Callable[[str], None] = None,
+             on_start: Callable[[int], None] = None, **opts) -> Optional[int]:
+    """
+    META_TABLE 전체 스캔 → store 에 새 실행으로 저장 (웹 API / dedup_scan.py 공용)
+    cols: id, name, dong, bunji, road(없으면 None). 다른 실행이 진행 중이면 None
+    on_start(run_id): 실행 번호가 정해지면 바로 호출 (웹 API 가 202 응답용으로 사용)
+    """
+    from utils.schema import pool_columns
+    present = {c.lower() for c in pool_columns(pool, table)}
+    road = cols.get("road") if (cols.get("road") or "").lower() in present else None
+    params = {"table": table, **cols, "road": road, "workers": workers, **opts}
+    run_id = store.begin_run(params)
+    if run_id is None:
+        return None
+    if on_start:
+        on_start(run_id)
+    last = [0.0]
+
+    def progress(st):
+        if time.monotonic() - last[0] >= 2.0:
+            last[0] = time.monotonic()
+            store.progress(run_id, st)
+            if log:
+                log(f"[dedup] run {run_id}: {st}")
+    try:
+        rows = company_rows(pool, table, cols["id"], cols["name"], cols["dong"], cols["bunji"], road)
+        res = scan(rows, normalize, workers=workers, resolved=store.resolved_groups(),
+                   progress=progress, **opts)
+        store.finish_run(run_id, res)
+        if log:
+            log(f"[dedup] run {run_id} done: {res['stats']}")
+    except Exception as e:
+        store.fail_run(run_id, f"{type(e).__name__}: {e}")
+        raise
+    return run_id
+
+
+def lsh_threshold(bands: int = LSH_BANDS, rows: int = LSH_ROWS) -> float:
+    """후보가 될 확률이 1/2 쯤 되는 2-gram Jaccard"""
+    return round(math.pow(1.0 / bands, 1.0 / rows), 3)
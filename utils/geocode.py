@@ -1,38 +1,255 @@
 # utils/geocode.py
-import requests, os
+"""
+카카오 로컬 API 지오코딩 + 영구 캐시
+
+• 캐시: DATA_DIR/geocode_cache.sqlite3 (워커·데스크톱 도구 공용)
+    - 주소 → 좌표 : 정규화 주소(공백 정리, NFC) 키
+    - 좌표 → 동/도로명 : 소수 5자리(약 1m) 반올림 좌표 키
+• 결과 없음(documents 비어있음)도 GEOCODE_NEG_TTL 동안 캐시 → 같은 실패 주소로 쿼터 소모 안 함
+  (네트워크 오류 / 401·429·5xx 는 캐시하지 않고 GeocodeError)
+• 같은 키 동시 조회는 한 번만 호출 (single-flight), 나머지는 결과 공유
+• KAKAO_API_BASE 로 API 주소 교체 가능 (로컬 스텁 서버 테스트용)
+• 호출은 utils.http.HTTP 경유 (keep-alive 연결 재사용, 429·5xx 재시도)
+"""
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Optional, Tuple
+
+import requests
+
+from config import Config
+from utils.http import HTTP
+from utils.schema import pool_columns
 
 KAKAO_KEY = os.getenv("KAKAO_KEY")
+KAKAO_API_BASE = os.getenv("KAKAO_API_BASE", "https://dapi.kakao.com").rstrip("/")
+
+GEOCODE_TTL = float(os.getenv("GEOCODE_TTL", str(90 * 86400)))
+GEOCODE_NEG_TTL = float(os.getenv("GEOCODE_NEG_TTL", str(86400)))
+GEOCODE_CACHE_PATH = os.getenv("GEOCODE_CACHE_PATH", str(Config.DATA_DIR / "geocode_cache.sqlite3"))
+
+
+class GeocodeError(Exception):
+    """좌표를 얻지 못함 (결과 없음 / API 오류)"""
+
+
+# === 키 정규화 ===
+def normalize_address(addr: str) -> str:
+    s = unicodedata.normalize("NFC", str(addr or ""))
+    return re.sub(r"\s+", " ", s).strip()
+
+
+def compose_address(road, dong, bunji, bunji2) -> str:
+    """지오코딩용 주소: 도로명 주소 > 동/번지 조합"""
+    if road and str(road).strip():
+        return normalize_address(road)
+    return normalize_address(" ".join(str(x) for x in (dong, bunji, bunji2) if x))
+
+
+def stored_coord_columns(conf) -> Optional[Tuple[str, str]]:
+    """META_TABLE 에 COL_LAT / COL_LON 컬럼이 모두 있으면 (lat, lon), 아니면 None"""
+    cols = {c.lower() for c in pool_columns(conf["META_POOL"], conf["META_TABLE"])}
+    lat, lon = conf.get("COL_LAT"), conf.get("COL_LON")
+    if lat and lon and lat.lower() in cols and lon.lower() in cols:
+        return lat, lon
+    return None
+
+
+def coord_key(lng, lat) -> str:
+    return f"{float(lng):.5f},{float(lat):.5f}"
+
+
+# === 영구 캐시 (SQLite) ===
+_MISS = object()
+
+
+class GeoCache:
+    """k -> (v JSON | NULL=결과 없음, expires). 스레드마다 연결 1개"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self.hits = self.misses = 0
+        with self._conn() as c:
+            c.execute("CREATE TABLE IF NOT EXISTS geocode ("
+                      " k TEXT PRIMARY KEY, v TEXT, expires REAL NOT NULL)")
+
+    def _conn(self) -> sqlite3.Connection:
+        c = getattr(self._local, "conn", None)
+        if c is None:
+            c = sqlite3.connect(self.path, timeout=5)
+            c.execute("PRAGMA journal_mode=WAL")
+            c.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = c
+        return c
+
+    def get(self, k):
+        """값 / None(결과 없음 캐시) / _MISS"""
+        row = self._conn().execute("SELECT v, expires FROM geocode WHERE k=?", (k,)).fetchone()
+        if row is None or row[1] < time.time():
+            self.misses += 1
+            return _MISS
+        self.hits += 1
+        return None if row[0] is None else json.loads(row[0])
+
+    def put(self, k, value, ttl: float):
+        v = None if value is None else json.dumps(value, ensure_ascii=False)
+        with self._conn() as c:
+            c.execute("INSERT OR REPLACE INTO geocode (k, v, expires) VALUES (?, ?, ?)",
+                      (k, v, time.time() + ttl))
+
+    def delete(self, k):
+        with self._conn() as c:
+            c.execute("DELETE FROM geocode WHERE k=?", (k,))
+
+    def purge_expired(self) -> int:
+        with self._conn() as c:
+            return c.execute("DELETE FROM geocode WHERE expires < ?", (time.time(),)).rowcount
+
+    def info(self) -> dict:
+        n = self._conn().execute("SELECT COUNT(*) FROM geocode").fetchone()[0]
+        return {"path": self.path, "entries": n, "hits": self.hits, "misses": self.misses}
+
 
-def geocode_kakao(addr: str):
-    """주소 문자열을 받아 카카오 API로 (lng, lat) 좌표 반환"""
-    url = "https://dapi.kakao.com/v2/local/search/address.json"
-    headers = {"Authorization": f"KakaoAK {KAKAO_KEY}"}
-    r = requests.get(url, params={"query": addr}, headers=headers, timeout=5)
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def geo_cache() -> GeoCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = GeoCache(GEOCODE_CACHE_PATH)
+    return _cache
+
+
+# === single-flight ===
+class _Call:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+_flight_lock = threading.Lock()
+_flights = {}
+
+
+def _single_flight(k, fn):
+    with _flight_lock:
+        call = _flights.get(k)
+        leader = call is None
+        if leader:
+            call = _flights[k] = _Call()
+    if not leader:
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.value
+    try:
+        call.value = fn()
+        return call.value
+    except Exception as e:
+        call.error = e
+        raise
+    finally:
+        with _flight_lock:
+            _flights.pop(k, None)
+        call.done.set()
+
+
+def _lookup(k, fetch):
+    """캐시 → (없으면) 같은 키 호출 1회로 합쳐서 fetch → 캐시 저장"""
+    cache = geo_cache()
+    hit = cache.get(k)
+    if hit is not _MISS:
+        return hit
+
+    def run():
+        again = cache.get(k)           # 앞선 leader 가 방금 채웠을 수 있음
+        if again is not _MISS:
+            return again
+        value = fetch()
+        cache.put(k, value, GEOCODE_TTL if value is not None else GEOCODE_NEG_TTL)
+        return value
+
+    return _single_flight(k, run)
+
+
+# === 카카오 API ===
+def _kakao(path: str, params: dict, key=None, limiter=None) -> list:
+    """documents 반환. 결과 없음 = [] (캐시 대상), 그 외 실패는 GeocodeError"""
+    key = key or KAKAO_KEY
+    if not key:
+        raise GeocodeError("KAKAO_KEY not set")
+    if limiter is not None:
+        limiter.acquire()          # 실제 API 호출에만 적용 (캐시 hit 은 제외)
+    try:
+        r = HTTP.get(f"{KAKAO_API_BASE}{path}", params=params,
+                     headers={"Authorization": f"KakaoAK {key}"}, timeout=5, max_bytes=1 << 20)
+    except requests.RequestException as e:
+        raise GeocodeError(f"kakao request failed: {e}") from e
+    if r.status_code == 400:
+        return []
     if r.status_code != 200:
+        raise GeocodeError(f"kakao HTTP {r.status_code}")
+    return r.json().get("documents", [])
+
+
+def geocode(addr: str, key=None, limiter=None) -> dict:
+    """주소 → {"lng", "lat"}. 좌표 없으면 GeocodeError (limiter: acquire() 를 가진 호출 제한기)"""
+    q = normalize_address(addr)
+    if not q:
+        raise GeocodeError("empty address")
+
+    def fetch():
+        docs = _kakao("/v2/local/search/address.json", {"query": q}, key, limiter)
+        return {"lng": float(docs[0]["x"]), "lat": float(docs[0]["y"])} if docs else None
+
+    result = _lookup(f"addr:{q}", fetch)
+    if result is None:
+        raise GeocodeError(f"no result: {q}")
+    return result
+
+
+def geocode_kakao(addr: str, key=None):
+    """주소 문자열을 받아 카카오 API로 (lng, lat) 좌표 반환 (실패 시 (None, None))"""
+    try:
+        r = geocode(addr, key)
+        return r["lng"], r["lat"]
+    except GeocodeError:
         return None, None
-    docs = r.json().get("documents", [])
-    if not docs:
-        return None, None
-    return float(docs[0]["x"]), float(docs[0]["y"])
 
-def kakao_get_dong(lng, lat):
+
+def kakao_get_dong(lng, lat, key=None):
     """좌표를 받아 행정동 이름 반환"""
-    url = "https://dapi.kakao.com/v2/local/geo/coord2regioncode.json"
-    headers = {"Authorization": f"KakaoAK {KAKAO_KEY}"}
-    r = requests.get(url, params={"x": lng, "y": lat}, headers=headers, timeout=5)
-    if r.status_code != 200:
+    def fetch():
+        docs = _kakao("/v2/local/geo/coord2regioncode.json", {"x": lng, "y": lat}, key)
+        return (docs[0].get("region_3depth_name") or "") if docs else None
+    try:
+        return _lookup(f"dong:{coord_key(lng, lat)}", fetch) or ""
+    except GeocodeError:
         return ""
-    docs = r.json().get("documents", [])
-    return docs[0].get("region_3depth_name") if docs else ""
 
-def kakao_get_road(lng, lat):
+
+def kakao_get_road(lng, lat, key=None):
     """좌표를 받아 도로명 주소 반환"""
-    url = "https://dapi.kakao.com/v2/local/geo/coord2address.json"
-    headers = {"Authorization": f"KakaoAK {KAKAO_KEY}"}
-    r = requests.get(url, params={"x": lng, "y": lat}, headers=headers, timeout=5)
-    if r.status_code != 200:
+    def fetch():
+        docs = _kakao("/v2/local/geo/coord2address.json", {"x": lng, "y": lat}, key)
+        if docs and docs[0].get("road_address"):
+            return docs[0]["road_address"].get("road_name") or ""
+        return None
+    try:
+        return _lookup(f"road:{coord_key(lng, lat)}", fetch) or ""
+    except GeocodeError:
         return ""
-    docs = r.json().get("documents", [])
-    if docs and "road_address" in docs[0]:
-        return docs[0]["road_address"].get("road_name")
-    return ""
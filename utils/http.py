@@ -0,0 +1,132 @@
+# utils/http.py
+"""
+외부 HTTP 호출 공용 클라이언트 (Kakao API, og:image 페이지/이미지 등)
+
+• 연결 재사용: HTTPAdapter 1개(urllib3 풀)를 스레드별 Session 이 공유 → 호스트당 keep-alive
+• 재시도: 연결 실패 / 429·5xx 는 지수 백오프로 재시도 (GET/HEAD 만, Retry-After 존중)
+• 호스트별 동시 요청 수 제한 (세마포어)
+• 스트리밍 다운로드 + max_bytes 초과 시 중단 (ResponseTooLarge)
+• 호스트별 호출 수 / 오류 / 소요시간 / 바이트 집계 → metrics()
+
+    from utils.http import HTTP
+    r = HTTP.get(url, params=..., headers=..., timeout=5)      # requests.Response
+    data = HTTP.get_bytes(img_url, max_bytes=10 << 20)
+"""
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class ResponseTooLarge(requests.RequestException):
+    """응답 본문이 max_bytes 를 넘음"""
+
+
+class HostBusy(requests.ConnectionError):
+    """호스트별 동시 요청 한도 대기 시간 초과"""
+
+
+class HttpClient:
+    def __init__(self, pool_maxsize: int = 16, per_host: int = 4, retries: int = 3,
+                 backoff: float = 0.3, timeout: float = 10.0, max_bytes: int = 20 << 20,
+                 wait_timeout: float = 30.0, user_agent: str = "Mozilla/5.0"):
+        self.per_host = per_host
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.wait_timeout = wait_timeout
+        self.user_agent = user_agent
+        retry = Retry(total=retries, connect=retries, read=retries, status=retries,
+                      backoff_factor=backoff, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=frozenset({"GET", "HEAD"}),
+                      respect_retry_after_header=True, raise_on_status=False)
+        self._adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize,
+                                    max_retries=retry)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sems = {}
+        self._stats = {}
+
+    # ---------- 내부 ----------
+    def _session(self) -> requests.Session:
+        s = getattr(self._local, "session", None)
+        if s is None:
+            s = requests.Session()
+            s.mount("http://", self._adapter)
+            s.mount("https://", self._adapter)
+            s.headers["User-Agent"] = self.user_agent
+            self._local.session = s
+        return s
+
+    def _host_slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            sem = self._sems.get(host)
+            if sem is None:
+                sem = self._sems[host] = threading.BoundedSemaphore(self.per_host)
+            return sem
+
+    def _record(self, host: str, ms: float, nbytes: int, error: bool):
+        with self._lock:
+            s = self._stats.setdefault(host, {"calls": 0, "errors": 0, "bytes": 0,
+                                              "total_ms": 0.0, "max_ms": 0.0})
+            s["calls"] += 1
+            s["errors"] += int(error)
+            s["bytes"] += nbytes
+            s["total_ms"] += ms
+            s["max_ms"] = max(s["max_ms"], ms)
+
+    @staticmethod
+    def _read_limited(r: requests.Response, limit: int) -> bytes:
+        size = r.headers.get("Content-Length")
+        if size and size.isdigit() and int(size) > limit:
+            raise ResponseTooLarge(f"{r.url}: {size} bytes > {limit}")
+        buf = bytearray()
+        for chunk in r.iter_content(64 * 1024):
+            buf += chunk
+            if len(buf) > limit:
+                raise ResponseTooLarge(f"{r.url}: > {limit} bytes")
+        return bytes(buf)
+
+    # ---------- 공개 ----------
+    def request(self, method: str, url: str, max_bytes: int = None, **kw) -> requests.Response:
+        """본문까지 다 읽은 Response 반환 (r.content / r.json() 그대로 사용 가능)"""
+        host = urlsplit(url).netloc
+        kw.setdefault("timeout", self.timeout)
+        sem = self._host_slot(host)
+        if not sem.acquire(timeout=self.wait_timeout):
+            raise HostBusy(f"{host}: too many concurrent requests")
+        t0 = time.perf_counter()
+        nbytes, error = 0, True
+        try:
+            with self._session().request(method, url, stream=True, **kw) as r:
+                r._content = self._read_limited(r, max_bytes or self.max_bytes)
+                r._content_consumed = True
+            nbytes, error = len(r._content), r.status_code >= 400
+            return r
+        finally:
+            sem.release()
+            self._record(host, (time.perf_counter() - t0) * 1000, nbytes, error)
+
+    def get(self, url: str, **kw) -> requests.Response:
+        return self.request("GET", url, **kw)
+
+    def get_bytes(self, url: str, **kw) -> bytes:
+        r = self.get(url, **kw)
+        r.raise_for_status()
+        return r.content
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {h: dict(s, avg_ms=round(s["total_ms"] / s["calls"], 1) if s["calls"] else 0.0)
+                    for h, s in self._stats.items()}
+
+
+HTTP = HttpClient(
+    pool_maxsize=int(os.getenv("HTTP_POOL_MAXSIZE", "16")),
+    per_host=int(os.getenv("HTTP_PER_HOST", "4")),
+    retries=int(os.getenv("HTTP_RETRIES", "3")),
+    max_bytes=int(os.getenv("HTTP_MAX_BYTES", str(20 << 20))),
+)
@@ -0,0 +1,136 @@
+# utils/img_history.py
+"""
+간판 이미지 교체 + 이력 (content-addressed)
+
+• T_X_IMG.sha        : 현재 이미지의 sha256 (없으면 DB 에서 계산)
+• T_X_IMG_BLOB       : sha → 이미지 바이트. 같은 내용은 한 번만 저장 (ON CONFLICT DO NOTHING)
+• T_X_IMG_HISTORY    : (i_info, i_img, sha, created_at) 만 기록 → 목록 조회는 작은 인덱스만 읽음
+• replace_image() : 이전 이미지 보관 + 새 이미지 업서트 + q_img_w/h 갱신을 한 연결·한 트랜잭션에서
+    - postgresql : SELECT … FOR UPDATE 로 잠그고 이전 sha 확인 → data-modifying CTE 한 문장
+                   (이전 BLOB 은 DB 밖으로 나오지 않음)
+    - mysql      : 같은 트랜잭션 안에서 순서대로 실행
+  잠금을 CTE 안(FOR UPDATE)에서 잡으면 형제 CTE(up)가 먼저 실행될 때 old 가 비어
+  이력 없이 덮어써질 수 있음 → 잠금은 반드시 별도 문장으로
+• 새 이미지가 현재 것과 같으면(sha 동일) 이력도 업서트도 생기지 않음
+(스키마: migrations/003_img_history_content_addressed.sql)
+"""
+from typing import List, Tuple
+
+from utils.blobcache import content_hash
+
+_PG_LOCK = """
+SELECT COALESCE(sha, encode(sha256(b_img), 'hex'))
+  FROM T_X_IMG
+ WHERE i_img = %(key)s AND b_img IS NOT NULL
+   FOR UPDATE
+"""
+
+# 모든 하위 문장은 같은 스냅샷을 보므로 old 는 실행 순서와 무관하게 교체 전 행을 읽음
+_PG_REPLACE = """
+WITH old AS (
+    SELECT b_img, %(old_sha)s::text AS sha
+      FROM T_X_IMG
+     WHERE i_img = %(key)s AND b_img IS NOT NULL
+), keep AS (
+    INSERT INTO T_X_IMG_BLOB (sha, b_img, n_bytes, created_at)
+    SELECT sha, b_img, octet_length(b_img), now() FROM old WHERE sha <> %(sha)s
+    ON CONFLICT (sha) DO NOTHING
+), hist AS (
+    INSERT INTO T_X_IMG_HISTORY (i_info, i_img, sha, created_at)
+    SELECT %(i_info)s, %(key)s, sha, now() FROM old WHERE sha <> %(sha)s
+), up AS (
+    INSERT INTO T_X_IMG (i_img, b_img, sha) VALUES (%(key)s, %(data)s, %(sha)s)
+    ON CONFLICT (i_img) DO UPDATE SET b_img = EXCLUDED.b_img, sha = EXCLUDED.sha
+     WHERE T_X_IMG.sha IS DISTINCT FROM EXCLUDED.sha
+)
+UPDATE {sign_table} SET q_img_w = %(w)s, q_img_h = %(h)s
+ WHERE {col_adidx} = %(i_info)s
+RETURNING {col_cp_idx}
+"""
+
+_MY_OLD = "COALESCE(sha, SHA2(b_img, 256))"
+_MY_REPLACE = [
+    (f"INSERT IGNORE INTO T_X_IMG_BLOB (sha, b_img, n_bytes, created_at) "
+     f"SELECT {_MY_OLD}, b_img, LENGTH(b_img), NOW() FROM T_X_IMG "
+     f"WHERE i_img = %(key)s AND b_img IS NOT NULL AND {_MY_OLD} <> %(sha)s"),
+    (f"INSERT INTO T_X_IMG_HISTORY (i_info, i_img, sha, created_at) "
+     f"SELECT %(i_info)s, %(key)s, {_MY_OLD}, NOW() FROM T_X_IMG "
+     f"WHERE i_img = %(key)s AND b_img IS NOT NULL AND {_MY_OLD} <> %(sha)s"),
+    ("INSERT INTO T_X_IMG (i_img, b_img, sha) VALUES (%(key)s, %(data)s, %(sha)s) "
+     "ON DUPLICATE KEY UPDATE b_img = VALUES(b_img), sha = VALUES(sha)"),
+    "UPDATE {sign_table} SET q_img_w = %(w)s, q_img_h = %(h)s WHERE {col_adidx} = %(i_info)s",
+    "SELECT {col_cp_idx} FROM {sign_table} WHERE {col_adidx} = %(i_info)s",
+]
+
+
+def img_key(i_info) -> str:
+    return f"p_if_pk_{i_info}"
+
+
+def replace_image(pool, i_info: str, data: bytes, orig_w: int, orig_h: int,
+                  sign_table: str, col_adidx: str, col_cp_idx: str) -> Tuple[str, List]:
+    """→ (새 sha, 간판 소유 회사 id 목록). 실패 시 롤백 후 예외 전달"""
+    sha = content_hash(data)
+    params = {"key": img_key(i_info), "i_info": i_info, "data": data, "sha": sha,
+              "w": orig_w, "h": orig_h}
+    names = {"sign_table": sign_table, "col_adidx": col_adidx, "col_cp_idx": col_cp_idx}
+    conn = pool.getconn()
+    ok = False
+    try:
+        cur = conn.cursor()
+        if pool.dialect == "postgresql":
+            cur.execute(_PG_LOCK, params)
+            row = cur.fetchone()
+            params["old_sha"] = (row[0] or "").strip() if row else None
+            cur.execute(_PG_REPLACE.format(**names), params)
+        else:
+            # mysql: FOR UPDATE 로 같은 간판 동시 교체 직렬화 후 순서대로
+            cur.execute("SELECT 1 FROM T_X_IMG WHERE i_img = %(key)s FOR UPDATE", params)
+            cur.fetchall()
+            for sql in _MY_REPLACE:
+                cur.execute(sql.format(**names), params)
+        owners = [r[0] for r in cur.fetchall()]
+        conn.commit()
+        cur.close()
+        ok = True
+        return sha, owners
+    finally:
+        if not ok:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+        pool.putconn(conn, close=not ok)
+
+
+def history_index(pool, i_info: str) -> List[dict]:
+    """교체 이력 (최신 순) — BLOB 없이 인덱스 컬럼만"""
+    conn = pool.getconn()
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT h.id, h.i_img, h.sha, h.created_at, b.n_bytes "
+            "FROM T_X_IMG_HISTORY h LEFT JOIN T_X_IMG_BLOB b ON b.sha = h.sha "
+            "WHERE h.i_info = %s ORDER BY h.created_at DESC, h.id DESC",
+            (i_info,))
+        rows = cur.fetchall()
+        cur.close()
+    finally:
+        pool.putconn(conn)
+    return [{"id": r[0], "i_img": r[1], "sha": (r[2] or "").strip(), "created_at": r[3],
+             "n_bytes": r[4]} for r in rows]
+
+
+def history_blob(pool, sha: str):
+    """sha → 보관된 이미지 바이트 (없으면 None)"""
+    conn = pool.getconn()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT b_img FROM T_X_IMG_BLOB WHERE sha = %s", (sha,))
+        row = cur.fetchone()
+        cur.close()
+    finally:
+        pool.putconn(conn)
+    if not row or row[0] is None:
+        return None
+    return bytes(row[0]) if isinstance(row[0], memoryview) else row[0]
@@ -0,0 +1,244 @@
+# utils/imgproc.py
+"""
+이미지 디코딩/리사이즈/인코딩을 요청 스레드 밖(프로세스 풀)에서 처리
+
+    svc = current_app.config["IMAGE_SERVICE"]
+    out = svc.run(prepare_upload, data, 800, 600)          # 동기 (워커 프로세스에서 실행)
+    job = svc.start_job(lambda: {...})                     # 비동기 → job id, svc.job(id) 로 조회
+
+• ProcessPoolExecutor(IMAGE_WORKERS) → Pillow 작업이 GIL 을 잡지 않아 다른 API 스레드가 안 밀림
+• 대기 작업이 IMAGE_MAX_PENDING 이상이면 ImageBusy (라우트에서 503 + Retry-After)
+  (시간 초과로 호출자가 포기했어도 프로세스에서 아직 도는 작업은 끝날 때까지 자리 차지)
+• 이미 상한 이내 JPEG(RGB/회색조)은 디코딩·재인코딩 없이 그대로 통과
+• 큰 JPEG 은 draft() 로 DCT 단계 축소 디코딩 후 LANCZOS 마무리
+• 비동기 작업 상태는 jobs_dir(DATA_DIR/image_jobs) 에 JSON 으로도 기록 → 다른 워커에서 조회 가능,
+  IMAGE_JOB_TTL 초 뒤 삭제
+"""
+import io
+import itertools
+import json
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable, Optional
+
+
+class ImageBusy(Exception):
+    """이미지 처리 대기열이 가득 참"""
+
+
+# === 워커 프로세스에서 실행되는 함수 (모듈 최상위 → pickle 가능) ===
+def prepare_upload(data: bytes, max_w: int, max_h: int, quality: int = 92) -> dict:
+    """
+    업로드 이미지 → 저장용 JPEG.
+    → {"data", "orig_w", "orig_h", "passthrough"}  (orig_* 는 리사이즈 전 원본 크기)
+    """
+    from PIL import Image
+    img = Image.open(io.BytesIO(data))
+    orig_w, orig_h = img.size
+    fits = orig_w <= max_w and orig_h <= max_h
+    if fits and img.format == "JPEG" and img.mode in ("RGB", "L"):
+        return {"data": data, "orig_w": orig_w, "orig_h": orig_h, "passthrough": True}
+    if img.format == "JPEG" and not fits:
+        img.draft("RGB", (max_w, max_h))      # 1/2·1/4·1/8 축소 디코딩
+    img = img.convert("RGB")
+    if not fits:
+        img.thumbnail((max_w, max_h), Image.LANCZOS)
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=quality)
+    return {"data": buf.getvalue(), "orig_w": orig_w, "orig_h": orig_h, "passthrough": False}
+
+
+def encode_jpeg(data: bytes, quality: int = 90) -> bytes:
+    """임의 형식 → JPEG (이미 RGB/회색조 JPEG 이면 그대로)"""
+    from PIL import Image
+    img = Image.open(io.BytesIO(data))
+    if img.format == "JPEG" and img.mode in ("RGB", "L"):
+        return data
+    buf = io.BytesIO()
+    img.convert("RGB").save(buf, format="JPEG", quality=quality)
+    return buf.getvalue()
+
+
+# === 서비스 ===
+class ImageService:
+    def __init__(self, workers: int = 2, max_pending: int = 8, job_ttl: float = 600.0, jobs_dir=None):
+        self.workers = max(1, workers)
+        self.jobs_dir = Path(jobs_dir) if jobs_dir else None
+        if self.jobs_dir:
+            self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        self.max_pending = max(1, max_pending)
+        self.job_ttl = job_ttl
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._runner = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="imgjob")
+        self._pending = 0            # 처리 중 + 대기 중 (동기 + 비동기)
+        self._jobs = {}              # job_id -> dict
+        self._seq = itertools.count(1)
+        self._stats = {"done": 0, "failed": 0, "rejected": 0, "busy_ms": 0.0}
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn: 웹 워커(스레드 다수, DB 소켓 보유)를 fork 하면 잠긴 락/소켓 사본이 자식으로 넘어감
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def _reserve(self):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._stats["rejected"] += 1
+                raise ImageBusy(f"image queue full ({self._pending}/{self.max_pending})")
+            self._pending += 1
+
+    def _release(self, ok: Optional[bool]):
+        """ok=None → 자리만 반납 (집계는 호출측이 이미 함)"""
+        with self._lock:
+            self._pending -= 1
+            if ok is not None:
+                self._stats["done" if ok else "failed"] += 1
+
+    def _submit(self, fn: Callable, args) -> Future:
+        try:
+            return self._executor().submit(fn, *args)
+        except BrokenProcessPool:
+            with self._lock:                 # 워커가 죽음(메모리 부족 등) → 다음 호출 때 새 풀
+                self._pool = None
+            raise
+
+    def _wait(self, fut: Future, timeout: float):
+        """결과 대기. 시간 초과면 아직 시작 안 한 작업은 취소 (이미 도는 작업은 끝까지 실행됨)"""
+        t0 = time.perf_counter()
+        try:
+            return fut.result(timeout=timeout)
+        except FutureTimeout:
+            fut.cancel()
+            raise
+        except BrokenProcessPool:
+            with self._lock:
+                self._pool = None
+            raise
+        finally:
+            with self._lock:
+                self._stats["busy_ms"] += (time.perf_counter() - t0) * 1000
+
+    def _release_when_done(self, fut: Future, count: bool = True):
+        # 자리는 호출자가 기다리기를 그만둘 때가 아니라 프로세스 작업이 실제로 끝날 때 반납
+        # → 시간 초과 후에도 계속 도는 작업까지 max_pending 에 포함
+        fut.add_done_callback(
+            lambda f: self._release((not f.cancelled() and f.exception() is None) if count else None))
+
+    # ---------- 동기 ----------
+    def run(self, fn: Callable, *args, timeout: float = 60.0):
+        """fn(*args) 를 워커 프로세스에서 실행하고 결과 반환. 대기열 가득 차면 ImageBusy"""
+        self._reserve()
+        try:
+            fut = self._submit(fn, args)
+        except Exception:
+            self._release(False)
+            raise
+        self._release_when_done(fut)
+        return self._wait(fut, timeout)
+
+    # ---------- 비동기 ----------
+    def start_job(self, task: Callable[[], dict]) -> str:
+        """
+        task() 를 백그라운드 스레드에서 실행 (task 안에서 run_reserved 로 프로세스 작업)
+        → job id. 대기열 자리는 여기서 잡아 두므로 가득 차면 즉시 ImageBusy
+        """
+        self._reserve()
+        job_id = f"{next(self._seq)}-{uuid.uuid4().hex[:12]}"
+        with self._lock:
+            self._expire()
+        self._set(job_id, status="queued", created_at=time.time())
+
+        def drive():
+            self._set(job_id, status="running")
+            ok = False
+            try:
+                result = task()
+                ok = True
+                self._set(job_id, status="done", result=result)
+            except Exception as e:
+                self._set(job_id, status="error", error=f"{type(e).__name__}: {e}")
+            finally:
+                self._release(ok)
+        self._runner.submit(drive)
+        return job_id
+
+    def run_reserved(self, fn: Callable, *args, timeout: float = 60.0):
+        """start_job 의 task 안에서 사용 — 자리는 이미 잡혀 있으므로 대기열 검사 없음"""
+        fut = self._submit(fn, args)
+        try:
+            return self._wait(fut, timeout)
+        except FutureTimeout:
+            if not fut.done():
+                # 작업 자리는 start_job 이 곧 반납 → 아직 도는 프로세스 작업 몫으로 한 자리 더 잡아 둠
+                with self._lock:
+                    self._pending += 1
+                self._release_when_done(fut, count=False)
+            raise
+
+    def _job_path(self, job_id: str) -> Optional[Path]:
+        if not self.jobs_dir or not all(c.isalnum() or c == "-" for c in job_id):
+            return None
+        return self.jobs_dir / f"{job_id}.json"
+
+    def _set(self, job_id: str, **kv):
+        with self._lock:
+            j = self._jobs.setdefault(job_id, {})
+            j.update(kv, updated_at=time.time())
+            snap = dict(j)
+        path = self._job_path(job_id)
+        if path:
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(snap, ensure_ascii=False, default=str), encoding="utf-8")
+            os.replace(tmp, path)
+
+    def _expire(self):
+        cutoff = time.time() - self.job_ttl
+        for k in [k for k, j in self._jobs.items()
+                  if j["status"] in ("done", "error") and j.get("updated_at", 0) < cutoff]:
+            del self._jobs[k]
+        if self.jobs_dir:
+            for p in self.jobs_dir.glob("*.json"):
+                try:
+                    if p.stat().st_mtime < cutoff:
+                        p.unlink()
+                except OSError:
+                    pass
+
+    def job(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            j = self._jobs.get(job_id)
+            if j:
+                return dict(j)
+        path = self._job_path(job_id)          # 다른 워커가 받은 작업
+        try:
+            return json.loads(path.read_text(encoding="utf-8")) if path else None
+        except (OSError, ValueError):
+            return None
+
+    # ---------- 상태 / 종료 ----------
+    def stats(self) -> dict:
+        with self._lock:
+            return {"workers": self.workers, "pending": self._pending, "max_pending": self.max_pending,
+                    "jobs": len(self._jobs), **self._stats}
+
+    def shutdown(self):
+        self._runner.shutdown(wait=False)
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+
+def default_workers() -> int:
+    return max(1, min(4, (os.cpu_count() or 2) // 2))
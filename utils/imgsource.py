@@ -0,0 +1,118 @@
+# utils/imgsource.py
+"""
+T_X_IMG 에 없는 간판 이미지의 실제 위치 인덱스 (i_info → 로컬 파일 / URL / 없음)
+
+• SIGN_TABLE 후보 컬럼(bns, img_path, ...) 중 실제 있는 것만 SCHEMA 캐시로 골라
+  SELECT 한 번에 모두 조회 → 컬럼 없음 예외 / 후보별 왕복 없음
+• 결과는 i_info 별로 보관 (있음: SOURCE_TTL, 없음: SOURCE_NEG_TTL)
+  → 이미지가 없는 id 는 TTL 동안 DB 를 다시 보지 않고 바로 404
+• 스키마가 바뀌면(SCHEMA.generation 증가) 인덱스 전체를 비움
+• 이미지 교체/간판 삭제 시 invalidate(i_info)
+"""
+import os
+import threading
+import time
+from typing import NamedTuple, Optional
+
+from utils.schema import SCHEMA, pool_columns
+
+CANDIDATE_COLS = ("bns", "img_path", "image_path", "img_file", "img_url")
+
+SOURCE_TTL = float(os.getenv("SOURCE_TTL", "3600"))
+SOURCE_NEG_TTL = float(os.getenv("SOURCE_NEG_TTL", "600"))
+SOURCE_MAX_ENTRIES = int(os.getenv("SOURCE_MAX_ENTRIES", "200000"))
+
+
+class Source(NamedTuple):
+    kind: str                 # "db" | "file" | "url" | "none"
+    value: Optional[str]      # 파일 절대경로 / URL
+
+
+DB = Source("db", None)
+NONE = Source("none", None)
+
+
+def classify(raw) -> Source:
+    path = str(raw or "").strip()
+    if not path:
+        return NONE
+    if path.lower().startswith(("http://", "https://")):
+        return Source("url", path)
+    if os.path.isfile(path):
+        return Source("file", os.path.abspath(path))
+    return NONE
+
+
+class SourceIndex:
+    def __init__(self, ttl: float = SOURCE_TTL, neg_ttl: float = SOURCE_NEG_TTL,
+                 max_entries: int = SOURCE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.neg_ttl = neg_ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._d = {}              # i_info -> (Source, expires)
+        self._generation = SCHEMA.generation
+        self.stats = {"hit": 0, "miss": 0, "neg_hit": 0}
+
+    def _check_generation(self):
+        if self._generation != SCHEMA.generation:
+            self._d.clear()
+            self._generation = SCHEMA.generation
+
+    def get(self, i_info) -> Optional[Source]:
+        with self._lock:
+            self._check_generation()
+            e = self._d.get(str(i_info))
+            if e is None or e[1] < time.monotonic():
+                self.stats["miss"] += 1
+                return None
+            self.stats["neg_hit" if e[0].kind == "none" else "hit"] += 1
+            return e[0]
+
+    def put(self, i_info, src: Source) -> Source:
+        ttl = self.neg_ttl if src.kind == "none" else self.ttl
+        with self._lock:
+            if len(self._d) >= self.max_entries:
+                now = time.monotonic()
+                for k in [k for k, e in self._d.items() if e[1] < now] or list(self._d)[:len(self._d) // 10]:
+                    del self._d[k]
+            self._d[str(i_info)] = (src, time.monotonic() + ttl)
+        return src
+
+    def invalidate(self, i_info=None):
+        with self._lock:
+            if i_info is None:
+                self._d.clear()
+            else:
+                self._d.pop(str(i_info), None)
+
+    def lookup_columns(self, pool, table: str, col_adidx: str, i_info) -> Source:
+        """후보 컬럼 SELECT 1회 → 앞 순서부터 첫 유효 값 (인덱스에 기록)"""
+        present = {c.lower() for c in pool_columns(pool, table)}
+        cols = [c for c in CANDIDATE_COLS if c in present]
+        src = NONE
+        if cols:
+            conn = pool.getconn()
+            try:
+                cur = conn.cursor()
+                cur.execute(f"SELECT {', '.join(cols)} FROM {table} WHERE {col_adidx}=%s LIMIT 1",
+                            (i_info,))
+                row = cur.fetchone()
+                cur.close()
+            finally:
+                pool.putconn(conn)
+            for v in row or ():
+                src = classify(v)
+                if src is not NONE:
+                    break
+        return self.put(i_info, src)
+
+    def info(self) -> dict:
+        with self._lock:
+            kinds = {}
+            for s, _ in self._d.values():
+                kinds[s.kind] = kinds.get(s.kind, 0) + 1
+            return {"entries": len(self._d), "kinds": kinds, **self.stats}
+
+
+SOURCES = SourceIndex()
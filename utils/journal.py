@@ -0,0 +1,260 @@
+# utils/journal.py
+"""
+write-behind 큐: 로컬 append-only 저널(fsync) + 백그라운드 일괄 flush
+
+    q = WriteBehindQueue(dir, flush=lambda records: ..., name="review_log")
+    q.start()
+    q.put({...})          # 저널에 기록(fsync) 후 바로 반환
+    q.status()            # 대기 건수 / 마지막 오류 등
+
+• 프로세스(gunicorn 워커)마다 저널 파일 1개: <name>-<pid>.log  (flock 으로 소유 표시)
+• 오프셋 파일 <name>-<pid>.ack 에 "DB 반영 끝난 위치" 기록 → 재시작 시 그 뒤부터 재전송
+• 죽은 워커가 남긴 저널(잠금 없음)은 살아있는 flusher 가 가져가 마저 반영 후 삭제
+• flush 실패 시 지수 백오프로 재시도 (순서 유지, 유실 없음)
+• 단, DB 가 특정 행을 거부(DataError/IntegrityError)하면 배치를 한 건씩 나눠 넣고
+  거부된 행은 <name>-<pid>.rejected 로 빼냄 → 한 건 때문에 큐 전체가 막히지 않음
+• 보장 수준: at-least-once (flush 성공 직후 ack 기록 전에 죽으면 그 배치는 다시 들어감)
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, List
+
+try:
+    import fcntl
+except ImportError:          # Windows: 잠금 없이 자기 저널만 처리
+    fcntl = None
+
+
+def _lock(f) -> bool:
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+# DB-API 예외 중 "그 행 자체가 잘못됨" → 재시도해도 소용없음 (연결/운영 오류만 백오프)
+_DATA_ERRORS = ("DataError", "IntegrityError")
+
+
+def is_data_error(e: BaseException) -> bool:
+    return any(c.__name__ in _DATA_ERRORS for c in type(e).__mro__)
+
+
+def _read_ack(path: Path) -> int:
+    try:
+        return int(path.read_text().strip() or 0)
+    except (FileNotFoundError, ValueError):
+        return 0
+
+
+def _write_ack(path: Path, offset: int):
+    tmp = path.with_suffix(".ack.tmp")
+    with open(tmp, "w") as f:
+        f.write(str(offset))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _read_records(f, start: int):
+    """start 이후 완전한 줄만 → [(record, 줄 끝 오프셋)]"""
+    f.seek(start)
+    out, pos = [], start
+    for line in f:
+        if not line.endswith(b"\n"):
+            break                        # 쓰다 만 마지막 줄(크래시)은 무시
+        pos += len(line)
+        try:
+            out.append((json.loads(line), pos))
+        except ValueError:
+            out.append((None, pos))      # 깨진 줄은 건너뜀
+    return out
+
+
+class WriteBehindQueue:
+    def __init__(self, directory, flush: Callable[[List[dict]], None], name: str = "journal",
+                 batch_max: int = 500, interval: float = 0.5, max_backoff: float = 30.0,
+                 rotate_bytes: int = 8 << 20,
+                 is_permanent: Callable[[BaseException], bool] = is_data_error):
+        self.dir = Path(directory)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.flush_fn = flush
+        self.name = name
+        self.batch_max = batch_max
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self.rotate_bytes = rotate_bytes
+        self.is_permanent = is_permanent
+
+        self.log_path = self.dir / f"{name}-{os.getpid()}.log"
+        self.ack_path = self.log_path.with_suffix(".ack")
+        self.rejected_path = self.log_path.with_suffix(".rejected")
+        self._f = open(self.log_path, "ab+")
+        _lock(self._f)
+        self._ack = _read_ack(self.ack_path)
+
+        self._cond = threading.Condition()
+        self._pending = deque((r, end) for r, end in _read_records(self._f, self._ack))
+        self._f.seek(0, os.SEEK_END)
+        self._thread = None
+        self._stop = False
+        self._stats = {"received": 0, "flushed": 0, "rejected": 0, "batches": 0, "failures": 0,
+                       "last_error": None, "last_flush_at": None, "recovered": len(self._pending)}
+
+    # ---------- 생산자 ----------
+    def put(self, record: dict):
+        """저널에 한 줄 기록 + fsync → 반환 시점에 디스크에 있음"""
+        line = (json.dumps(record, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+        with self._cond:
+            self._f.write(line)
+            self._f.flush()
+            os.fsync(self._f.fileno())
+            self._pending.append((record, self._f.tell()))
+            self._stats["received"] += 1
+            if len(self._pending) >= self.batch_max:
+                self._cond.notify()
+
+    # ---------- flusher ----------
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=f"{self.name}-flusher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        backoff = 0.0
+        last_orphan_scan = 0.0
+        while True:
+            with self._cond:
+                if not self._stop:
+                    self._cond.wait(backoff or self.interval)
+                stopping = self._stop
+                batch = [self._pending[i] for i in range(min(len(self._pending), self.batch_max))]
+            if time.monotonic() - last_orphan_scan > 60:
+                last_orphan_scan = time.monotonic()
+                self._drain_orphans()
+            if batch:
+                done, flushed, rejected, err = self._flush_rows(batch)
+                if done:
+                    self._commit(done, batch[done - 1][1], flushed, rejected)
+                if err is not None:
+                    self._stats["failures"] += 1
+                    self._stats["last_error"] = f"{type(err).__name__}: {err}"
+                    backoff = min(self.max_backoff, (backoff * 2) or 0.5)
+                    if stopping:
+                        return
+                    continue
+                backoff = 0.0
+                if len(self._pending) >= self.batch_max:
+                    backoff = 0.001          # 밀린 게 많으면 바로 다음 배치
+            if stopping and not self._pending:
+                return
+
+    def _flush_rows(self, rows):
+        """
+        rows=[(record, 끝 오프셋)] 반영 → (처리 끝난 앞쪽 항목 수, 반영 건수, 거부 건수, 일시 오류|None)
+        배치가 데이터 오류로 실패하면 한 건씩 다시 넣고, 거부된 행은 .rejected 로 기록.
+        연결/운영 오류는 거기서 멈추고 돌려줌 (그 앞까지만 ack → 재시도 때 중복 최소화)
+        """
+        records = [r for r, _ in rows if r is not None]
+        try:
+            if records:
+                self.flush_fn(records)
+            return len(rows), len(records), 0, None
+        except Exception as e:
+            if not self.is_permanent(e):
+                return 0, 0, 0, e
+        flushed = rejected = 0
+        for i, (r, _) in enumerate(rows):
+            if r is None:
+                continue
+            try:
+                self.flush_fn([r])
+                flushed += 1
+            except Exception as e:
+                if not self.is_permanent(e):
+                    return i, flushed, rejected, e
+                self._reject(r, e)
+                rejected += 1
+        return len(rows), flushed, rejected, None
+
+    def _reject(self, record: dict, err: BaseException):
+        line = json.dumps({"record": record, "error": f"{type(err).__name__}: {err}",
+                           "rejected_at": time.time()}, ensure_ascii=False, default=str)
+        with open(self.rejected_path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _commit(self, n: int, end: int, flushed: int, rejected: int = 0):
+        _write_ack(self.ack_path, end)
+        with self._cond:
+            for _ in range(n):
+                self._pending.popleft()
+            self._ack = end
+            self._stats["flushed"] += flushed
+            self._stats["rejected"] += rejected
+            self._stats["batches"] += 1
+            self._stats["last_flush_at"] = time.time()
+            self._stats["last_error"] = None
+            # 다 반영됐고 파일이 커졌으면 비움 (put 과 같은 락 안이라 경합 없음)
+            if not self._pending and self._f.tell() >= self.rotate_bytes:
+                self._f.truncate(0)
+                self._f.seek(0)
+                self._ack = 0
+                _write_ack(self.ack_path, 0)
+
+    def _drain_orphans(self):
+        """잠금이 풀린(주인이 죽은) 다른 프로세스의 저널을 반영 후 삭제"""
+        for log in self.dir.glob(f"{self.name}-*.log"):
+            if log == self.log_path:
+                continue
+            try:
+                with open(log, "rb+") as f:
+                    if fcntl is None or not _lock(f):
+                        continue
+                    ack_path = log.with_suffix(".ack")
+                    ack = _read_ack(ack_path)
+                    rows = _read_records(f, ack)
+                    for i in range(0, len(rows), self.batch_max):
+                        chunk = rows[i:i + self.batch_max]
+                        done, flushed, rejected, err = self._flush_rows(chunk)
+                        if done:
+                            _write_ack(ack_path, chunk[done - 1][1])
+                        with self._cond:
+                            self._stats["flushed"] += flushed
+                            self._stats["rejected"] += rejected
+                        if err is not None:
+                            raise err
+                    log.unlink()
+                    ack_path.unlink(missing_ok=True)
+            except Exception as e:
+                self._stats["last_error"] = f"orphan {log.name}: {type(e).__name__}: {e}"
+
+    # ---------- 상태 ----------
+    def status(self) -> dict:
+        with self._cond:
+            oldest = self._pending[0][0] if self._pending else None
+            return {
+                "depth": len(self._pending),
+                "oldest_at": (oldest or {}).get("queued_at") if isinstance(oldest, dict) else None,
+                "journal": self.log_path.name,
+                "journal_bytes": self._f.tell(),
+                "rejected_file": self.rejected_path.name if self.rejected_path.exists() else None,
+                "flusher_alive": bool(self._thread and self._thread.is_alive()),
+                **self._stats,
+            }
@@ -0,0 +1,194 @@
+# utils/name_index.py
+"""
+회사명 n-gram 역색인 (pg_trgm 이 없을 때 fuzzy 검색용)
+
+• 읍면동(t_add_3)별 파티션:  dong -> {id: 정규화 회사명},  gram -> {id, ...}
+• 후보 생성 = 질의 n-gram 의 posting 합집합 (공유 gram 수 하한 적용)
+• 점수 = max(ratio, partial_ratio) — rapidfuzz.process.cdist 로 일괄 계산
+• 갱신: 최초 1회 전체 적재 → 이후 id 증가분만 추가 로딩(refresh_ttl),
+        full_ttl 마다 전체 재적재, 병합/삭제 API 는 upsert/remove 로 즉시 반영한 뒤
+        공유 태그("names", utils.respcache 버전) 증가 → 다른 gunicorn 워커의 색인은
+        다음 검색 때 버전이 달라진 것을 보고 전체 재적재 (증분은 id 증가분만 보므로)
+"""
+import math
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:          # rapidfuzz 미설치 → difflib 폴백
+    fuzz = process = None
+
+NAMES_TAG = "names"
+
+
+def ngrams(s: str, n: int = 2) -> Set[str]:
+    if len(s) <= n:
+        return {s} if s else set()
+    return {s[i:i + n] for i in range(len(s) - n + 1)}
+
+
+def score_batch(query: str, names: List[str]) -> List[int]:
+    """query 대비 각 name 의 유사도 (0~100) = max(ratio, partial_ratio)"""
+    if not names:
+        return []
+    if process is not None:
+        r = process.cdist([query], names, scorer=fuzz.ratio, workers=-1)[0]
+        p = process.cdist([query], names, scorer=fuzz.partial_ratio, workers=-1)[0]
+        return [int(max(a, b)) for a, b in zip(r, p)]
+    from difflib import SequenceMatcher
+    return [int(round(100 * SequenceMatcher(None, query, n).ratio())) for n in names]
+
+
+class _Partition:
+    __slots__ = ("names", "grams")
+
+    def __init__(self):
+        self.names: Dict[str, str] = {}
+        self.grams: Dict[str, Set[str]] = {}
+
+
+class CompanyNameIndex:
+    def __init__(self, normalize: Callable[[str], str], n: int = 2,
+                 refresh_ttl: float = 60.0, full_ttl: float = 3600.0):
+        self.normalize = normalize
+        self.n = n
+        self.refresh_ttl = refresh_ttl
+        self.full_ttl = full_ttl
+        self._lock = threading.RLock()
+        self._parts: Dict[str, _Partition] = {}
+        self._where: Dict[str, str] = {}       # str(id) -> dong
+        self._raw: Dict[str, object] = {}      # str(id) -> 원래 타입 id (DB 조회용)
+        self.max_id = None
+        self.loaded_at = 0.0
+        self.refreshed_at = 0.0
+        self.version = None                 # 적재 당시 공유 태그 버전
+        self._refreshing = False
+
+    # ---------- 적재 ----------
+    def _add(self, parts, where, raw, cid, name: str, dong: str):
+        cid = str(cid)
+        raw.setdefault(cid, cid)
+        p = parts.get(dong)
+        if p is None:
+            p = parts[dong] = _Partition()
+        norm = self.normalize(name)
+        p.names[cid] = norm
+        for g in ngrams(norm, self.n):
+            p.grams.setdefault(g, set()).add(cid)
+        where[cid] = dong
+
+    def _drop(self, cid: str, keep_raw: bool = False):
+        if not keep_raw:
+            self._raw.pop(cid, None)
+        dong = self._where.pop(cid, None)
+        p = self._parts.get(dong) if dong is not None else None
+        if p is None:
+            return
+        norm = p.names.pop(cid, "")
+        for g in ngrams(norm, self.n):
+            ids = p.grams.get(g)
+            if ids:
+                ids.discard(cid)
+                if not ids:
+                    del p.grams[g]
+
+    def build(self, rows: Iterable[Tuple]):
+        """rows: (id, name, dong) 전체 → 새 구조를 만든 뒤 교체"""
+        parts, where, raw, max_id = {}, {}, {}, None
+        for cid, name, dong in rows:
+            raw[str(cid)] = cid
+            self._add(parts, where, raw, cid, name or "", (dong or "").strip())
+            max_id = cid if max_id is None or cid > max_id else max_id
+        with self._lock:
+            self._parts, self._where, self._raw, self.max_id = parts, where, raw, max_id
+            self.loaded_at = self.refreshed_at = time.monotonic()
+
+    def upsert(self, cid, name: str, dong: Optional[str] = None):
+        cid = str(cid)
+        with self._lock:
+            if dong is None:
+                dong = self._where.get(cid, "")
+            self._drop(cid, keep_raw=True)
+            self._add(self._parts, self._where, self._raw, cid, name or "", (dong or "").strip())
+
+    def remove(self, cid):
+        with self._lock:
+            self._drop(str(cid))
+
+    def adopt(self, prev: Optional[int], new: Optional[int]):
+        """자기 변경으로 버전이 prev → new(=prev+1) 가 됐으면 재적재 없이 새 버전으로 인정"""
+        with self._lock:
+            if prev is not None and self.version == prev and new == prev + 1:
+                self.version = new
+
+    def ensure_fresh(self, load_all: Callable[[], Iterable[Tuple]],
+                     load_since: Callable[[object], Iterable[Tuple]],
+                     version: Optional[int] = None):
+        """
+        비었거나 full_ttl 경과 또는 공유 태그 버전이 바뀜 → 전체 적재,
+        refresh_ttl 경과 → max_id 이후 증분 (한 스레드만). version=None 이면 TTL 만 확인
+        """
+        now = time.monotonic()
+        with self._lock:
+            empty = not self.loaded_at
+            full = (empty or now - self.loaded_at > self.full_ttl
+                    or (version is not None and version != self.version))
+            incr = now - self.refreshed_at > self.refresh_ttl
+            if not (full or incr) or (self._refreshing and not empty):
+                return
+            self._refreshing = True
+        try:
+            if full:
+                self.build(load_all())
+                with self._lock:
+                    self.version = version      # 적재 전에 읽은 버전 → 적재 중 변경은 다음에 다시 반영
+                return
+            rows = list(load_since(self.max_id))
+            with self._lock:
+                for cid, name, dong in rows:
+                    self._drop(str(cid))
+                    self._raw[str(cid)] = cid
+                    self._add(self._parts, self._where, self._raw, cid, name or "", (dong or "").strip())
+                    if self.max_id is None or cid > self.max_id:
+                        self.max_id = cid
+                self.refreshed_at = now
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    # ---------- 검색 ----------
+    def search(self, emd: str, query: str, threshold: float, limit: int) -> Optional[List[Tuple[str, int]]]:
+        """
+        emd 를 포함하는 파티션에서 검색 → [(id, score)] (점수 내림차순, id 는 DB 원래 타입).
+        일치하는 파티션이 없으면 None (호출측이 DB 폴백).
+        """
+        emd = (emd or "").strip()
+        qn = self.normalize(query)
+        qg = ngrams(qn, self.n)
+        with self._lock:
+            parts = [p for d, p in self._parts.items() if emd and (d == emd or emd in d)]
+            if not parts:
+                return None
+            need = 1 if len(qg) <= 3 else math.ceil(len(qg) * 0.3)
+            cand_ids, cand_names = [], []
+            for p in parts:
+                hits = Counter()
+                for g in qg:
+                    hits.update(p.grams.get(g, ()))
+                for cid, k in hits.items():
+                    if k >= need:
+                        cand_ids.append(self._raw.get(cid, cid))
+                        cand_names.append(p.names[cid])
+
+        scores = score_batch(qn, cand_names)
+        ranked = sorted(((cid, s) for cid, s in zip(cand_ids, scores) if s >= threshold),
+                        key=lambda x: (-x[1], str(x[0])))
+        return ranked[:limit]
+
+    def info(self) -> dict:
+        with self._lock:
+            return {"partitions": len(self._parts), "companies": len(self._where),
+                    "max_id": self.max_id, "age_seconds": round(time.monotonic() - self.loaded_at, 1)}
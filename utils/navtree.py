@@ -0,0 +1,203 @@
+# utils/navtree.py
+"""
+동 → 번지 → 회사(간판 수) 탐색 트리 (메모리 상주)
+
+• /api/company/dongs, dongs_with_stats, bunjis/<dong>, companies/<dong>/<bunji> 를
+  매 요청 DISTINCT/GROUP BY 대신 이 트리에서 바로 응답
+• 전체 적재: 회사 1쿼리 + 간판 수 GROUP BY 1쿼리 (ttl 마다 재적재)
+• 병합/삭제 API 는 rename / move_signs / add_signs / remove_company 로 즉시 반영한 뒤
+  changed() 로 공유 태그("nav", utils.respcache 버전) 증가 → 다른 gunicorn 워커의 트리는
+  다음 조회 때 버전이 달라진 것을 보고 전체 재적재 (TTL 을 기다리지 않음)
+• 재적재는 한 스레드만 (_build_lock): 비어 있을 때 동시 첫 요청은 그 적재를 기다림,
+  이미 트리가 있으면 다른 스레드는 기존 트리로 바로 응답
+"""
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.respcache import purge, tag_version
+
+NAV_TAG = "nav"
+
+
+class NavTree:
+    def __init__(self, ttl: float = 600.0):
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._comp: Dict[str, dict] = {}                       # cid -> 회사 정보
+        self._tree: Dict[str, Dict[str, Set[str]]] = {}        # dong -> bunji -> {cid}
+        self._stats: Dict[str, List[int]] = {}                 # dong -> [total, reviewed]
+        self.loaded_at = 0.0
+        self.version = None                 # 적재 당시 공유 태그 버전
+        self._build_lock = threading.Lock()
+
+    # ---------- 적재 ----------
+    def build(self, companies: Iterable[Tuple], sign_counts: Iterable[Tuple]):
+        """companies: (id, name, dong, bunji, addr2) / sign_counts: (company_id, count)"""
+        counts = {str(k): int(v) for k, v in sign_counts}
+        comp, tree, stats = {}, {}, {}
+        for cid, name, dong, bunji, addr2 in companies:
+            cid = str(cid)
+            comp[cid] = {"id": cid, "name": name, "dong": dong, "bunji": bunji,
+                         "addr2": addr2 or "", "ad_count": counts.get(cid, 0)}
+            self._link(tree, stats, comp[cid])
+        with self._lock:
+            self._comp, self._tree, self._stats = comp, tree, stats
+            self.loaded_at = time.monotonic()
+
+    def _stale(self, version) -> bool:
+        return (not self.loaded_at or time.monotonic() - self.loaded_at >= self.ttl
+                or (version is not None and version != self.version))
+
+    def ensure_fresh(self, load: Callable[[], Tuple[Iterable, Iterable]], version: Optional[int] = None):
+        """version: 현재 공유 태그 버전 (None 이면 TTL 만 확인)"""
+        with self._lock:
+            if not self._stale(version):
+                return
+            empty = not self.loaded_at
+        if not self._build_lock.acquire(blocking=empty):
+            return                              # 다른 스레드가 재적재 중 → 기존 트리로 응답
+        try:
+            with self._lock:
+                if not self._stale(version):    # 기다리는 동안 다른 스레드가 적재함
+                    return
+            self.build(*load())
+            with self._lock:
+                self.version = version          # 적재 전에 읽은 버전 → 적재 중 변경은 다음에 다시 반영
+        finally:
+            self._build_lock.release()
+
+    def adopt(self, prev: Optional[int], new: Optional[int]):
+        """자기 변경으로 버전이 prev → new(=prev+1) 가 됐으면 재적재 없이 새 버전으로 인정"""
+        with self._lock:
+            if prev is not None and self.version == prev and new == prev + 1:
+                self.version = new
+
+    def invalidate(self):
+        """다음 조회 때 전체 재적재"""
+        with self._lock:
+            self.loaded_at = 0.0
+
+    @property
+    def loaded(self) -> bool:
+        return bool(self.loaded_at)
+
+    # ---------- 내부 ----------
+    @staticmethod
+    def _valid_dong(dong) -> bool:
+        return dong is not None and str(dong).strip() != ""
+
+    @staticmethod
+    def _link(tree, stats, c):
+        dong, bunji = c["dong"], c["bunji"]
+        if not NavTree._valid_dong(dong):
+            return
+        s = stats.setdefault(dong, [0, 0])
+        s[0] += 1
+        s[1] += 1 if c["ad_count"] > 0 else 0
+        if bunji is not None and str(bunji).strip() != "":
+            tree.setdefault(dong, {}).setdefault(bunji, set()).add(c["id"])
+
+    def _unlink(self, c):
+        dong, bunji = c["dong"], c["bunji"]
+        if not self._valid_dong(dong):
+            return
+        s = self._stats.get(dong)
+        if s:
+            s[0] -= 1
+            s[1] -= 1 if c["ad_count"] > 0 else 0
+            if s[0] <= 0:
+                del self._stats[dong]
+        ids = self._tree.get(dong, {}).get(bunji)
+        if ids is not None:
+            ids.discard(c["id"])
+            if not ids:
+                del self._tree[dong][bunji]
+                if not self._tree[dong]:
+                    del self._tree[dong]
+
+    def _set_count(self, cid: str, count: int):
+        c = self._comp.get(cid)
+        if c is None:
+            return
+        s = self._stats.get(c["dong"])
+        if s is not None:
+            s[1] += (count > 0) - (c["ad_count"] > 0)
+        c["ad_count"] = max(count, 0)
+
+    # ---------- 증분 갱신 ----------
+    def rename(self, cid, name: str):
+        with self._lock:
+            c = self._comp.get(str(cid))
+            if c is not None:
+                c["name"] = name
+
+    def add_signs(self, cid, delta: int):
+        with self._lock:
+            c = self._comp.get(str(cid))
+            if c is not None:
+                self._set_count(c["id"], c["ad_count"] + delta)
+
+    def move_signs(self, from_ids: Iterable, to_id):
+        with self._lock:
+            moved = 0
+            for cid in from_ids:
+                c = self._comp.get(str(cid))
+                if c is not None:
+                    moved += c["ad_count"]
+                    self._set_count(c["id"], 0)
+            if moved:
+                self.add_signs(to_id, moved)
+
+    def remove_company(self, cid):
+        with self._lock:
+            c = self._comp.pop(str(cid), None)
+            if c is not None:
+                self._unlink(c)
+
+    # ---------- 조회 ----------
+    def _match_dongs(self, dong: str) -> List[str]:
+        """SQL 의 COL_DONG LIKE %dong% 과 같은 부분 일치"""
+        return [d for d in self._tree if dong in str(d)]
+
+    def dongs(self) -> List[str]:
+        with self._lock:
+            return sorted(self._stats)
+
+    def dongs_with_stats(self) -> List[dict]:
+        with self._lock:
+            return [{"dong": d, "total": s[0], "reviewed": s[1]} for d, s in sorted(self._stats.items())]
+
+    def bunjis(self, dong: str) -> List[str]:
+        with self._lock:
+            out = set()
+            for d in self._match_dongs(dong):
+                out.update(self._tree[d])
+            return sorted(out)
+
+    def companies(self, dong: str, bunji: str) -> List[dict]:
+        with self._lock:
+            rows = []
+            for d in self._match_dongs(dong):
+                for cid in self._tree[d].get(bunji, ()):
+                    c = self._comp[cid]
+                    rows.append({"id": c["id"], "name": c["name"], "addr2": c["addr2"],
+                                 "ad_count": c["ad_count"]})
+        rows.sort(key=lambda r: (r["name"] or "", r["id"]))
+        return rows
+
+    def company(self, cid) -> Optional[dict]:
+        with self._lock:
+            c = self._comp.get(str(cid))
+            return dict(c) if c else None
+
+
+NAV = NavTree(ttl=float(os.getenv("NAV_TREE_TTL", "600")))
+
+
+def changed():
+    """증분 갱신 후 호출 → 다른 워커의 NAV 와 "nav" 태그가 달린 응답 캐시 무효화"""
+    prev = tag_version(NAV_TAG)
+    purge(NAV_TAG)
+    NAV.adopt(prev, tag_version(NAV_TAG))
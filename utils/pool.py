@@ -0,0 +1,289 @@
+# utils/pool.py
+"""
+DB 커넥션 풀 (ManagedPool) + db_config.ini 섹션으로 풀 생성 (make_pool)
+
+웹 앱(extensions.py)과 PyQt 검수 도구·배치 스크립트가 함께 쓰므로
+Flask / 웹 전용 모듈을 import 하지 않음 (DB 드라이버는 make_pool 안에서 필요할 때만)
+"""
+import configparser
+import hashlib
+import threading
+import time
+
+
+class PoolTimeout(Exception):
+    """timeout 안에 커넥션을 얻지 못함"""
+
+
+class ManagedPool:
+    """
+    psycopg2 SimpleConnectionPool / MySQLConnectionPool 대체.
+    블루프린트는 기존처럼 pool.getconn() / pool.putconn(conn) 으로 사용.
+
+    • 여러 스레드가 동시에 getconn 해도 안전 (Condition)
+    • 풀이 가득 차면 PoolError 대신 timeout 초까지 대기 → PoolTimeout
+    • 새 연결 생성/ping 은 락 밖에서 수행 → 느린 WAN 연결이 다른 요청을 막지 않음
+    • ping_after 초 이상 놀던 연결은 SELECT 1 로 확인, 죽었으면 교체
+    • max_lifetime 초가 지난 연결은 반납/대여 시점에 폐기 후 재생성
+
+    드라이버 중립 헬퍼 (postgres / mariadb 공통):
+      pool.dialect        "postgresql" | "mysql"  (company.py 의 dialect 표기와 동일)
+      pool.placeholder    파라미터 자리표시자 ("%s")
+      pool.ident(name)    식별자 인용 ("name" / `name`)
+      pool.cursor(conn, dict_cursor=True)         dict 행 커서
+      pool.execute_prepared(conn, sql, params)    서버측 prepared statement 재사용
+    """
+
+    def __init__(self, name, connect, driver="postgres", minconn=1, maxconn=10,
+                 timeout=30.0, max_lifetime=1800.0, ping_after=30.0):
+        self.name = name
+        self.driver = driver
+        self._connect = connect
+        self.minconn, self.maxconn = int(minconn), int(maxconn)
+        self.timeout = float(timeout)
+        self.max_lifetime = float(max_lifetime)
+        self.ping_after = float(ping_after)
+
+        self._cond = threading.Condition()
+        self._idle = []        # [(conn, created_at, last_used)]  LIFO
+        self._born = {}        # id(conn) -> created_at  (대여 중 포함)
+        self._prepared = {}    # id(conn) -> {sql: (cursor, name)}
+        self._size = 0
+        self._stats = {
+            "created": 0, "closed": 0, "acquired": 0, "released": 0,
+            "waits": 0, "timeouts": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0,
+            "pinged": 0, "ping_failed": 0, "expired": 0, "broken": 0,
+        }
+        for _ in range(self.minconn):
+            conn = self._new_conn()
+            self._size += 1
+            self._idle.append((conn, self._born[id(conn)], time.monotonic()))
+
+    # ---------- 드라이버별 처리 ----------
+    def _new_conn(self):
+        conn = self._connect()
+        with self._cond:
+            self._born[id(conn)] = time.monotonic()
+            self._stats["created"] += 1
+        return conn
+
+    def _is_closed(self, conn) -> bool:
+        if self.driver == "postgres":
+            return bool(conn.closed)
+        try:
+            return not conn.is_connected()
+        except Exception:
+            return True
+
+    def _reset(self, conn):
+        """반납 시 열린 트랜잭션 정리 (불필요한 ROLLBACK 왕복은 피함)"""
+        if self.driver == "postgres":
+            import psycopg2.extensions as ext
+            st = conn.info.transaction_status
+            if st == ext.TRANSACTION_STATUS_UNKNOWN:
+                raise RuntimeError("connection in unknown state")
+            if st != ext.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+        elif getattr(conn, "in_transaction", False):
+            conn.rollback()
+
+    def _ping(self, conn) -> bool:
+        self._stats["pinged"] += 1
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            cur.fetchall()
+            cur.close()
+            if self.driver == "postgres":
+                conn.rollback()
+            return True
+        except Exception:
+            self._stats["ping_failed"] += 1
+            return False
+
+    def _discard(self, conn):
+        with self._cond:
+            self._prepared.pop(id(conn), None)
+            if self._born.pop(id(conn), None) is not None:
+                self._size -= 1
+                self._stats["closed"] += 1
+            self._cond.notify()
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    # ---------- 공개 API ----------
+    def getconn(self, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        t0 = time.monotonic()
+        deadline = t0 + timeout
+        while True:
+            conn = None
+            with self._cond:
+                while not self._idle and self._size >= self.maxconn:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise PoolTimeout(f"{self.name}: {timeout:g}s 내에 커넥션을 얻지 못했습니다 "
+                                          f"(사용 중 {self._size}/{self.maxconn})")
+                    self._stats["waits"] += 1
+                    self._cond.wait(remaining)
+                if self._idle:
+                    conn, created, last_used = self._idle.pop()
+                else:
+                    self._size += 1        # 자리 예약 후 락 밖에서 연결
+
+            if conn is None:
+                try:
+                    conn = self._new_conn()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            else:
+                now = time.monotonic()
+                if now - created > self.max_lifetime:
+                    self._stats["expired"] += 1
+                    self._discard(conn)
+                    continue
+                if self._is_closed(conn) or (now - last_used > self.ping_after and not self._ping(conn)):
+                    self._stats["broken"] += 1
+                    self._discard(conn)
+                    continue
+
+            waited = time.monotonic() - t0
+            with self._cond:
+                self._stats["acquired"] += 1
+                self._stats["wait_seconds"] += waited
+                self._stats["max_wait_seconds"] = max(self._stats["max_wait_seconds"], waited)
+            return conn
+
+    def putconn(self, conn, close=False):
+        created = self._born.get(id(conn))
+        if created is None:          # 이 풀 소속이 아님 / 이미 폐기됨
+            return
+        if not close:
+            try:
+                if self._is_closed(conn):
+                    close = True
+                else:
+                    self._reset(conn)
+            except Exception:
+                close = True
+        if close or time.monotonic() - created > self.max_lifetime:
+            self._discard(conn)
+            return
+        with self._cond:
+            self._idle.append((conn, created, time.monotonic()))
+            self._stats["released"] += 1
+            self._cond.notify()
+
+    def closeall(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for conn, _, _ in idle:
+            self._discard(conn)
+
+    # ---------- 드라이버 중립 헬퍼 ----------
+    @property
+    def dialect(self) -> str:
+        return "postgresql" if self.driver == "postgres" else "mysql"
+
+    placeholder = "%s"     # psycopg2 / mysql.connector 모두 format 스타일
+
+    def ident(self, name: str) -> str:
+        return f'"{name}"' if self.driver == "postgres" else f"`{name}`"
+
+    def cursor(self, conn, dict_cursor: bool = False):
+        if not dict_cursor:
+            return conn.cursor()
+        if self.driver == "postgres":
+            from psycopg2.extras import RealDictCursor
+            return conn.cursor(cursor_factory=RealDictCursor)
+        return conn.cursor(dictionary=True)
+
+    def server_cursor(self, conn, itersize: int = 2000):
+        """
+        결과를 서버 쪽에 두고 조금씩 가져오는 커서 (대량 조회 스트리밍용).
+          - postgres : named cursor (DECLARE CURSOR → itersize 행씩 FETCH)
+          - mariadb  : unbuffered cursor (받는 대로 소비, 다 읽기 전엔 같은 연결 재사용 불가)
+        """
+        if self.driver == "postgres":
+            cur = conn.cursor(name=f"srv_{id(conn):x}_{time.monotonic_ns():x}")
+            cur.itersize = itersize
+            return cur
+        return conn.cursor(buffered=False)
+
+    def execute_prepared(self, conn, sql, params=()):
+        """
+        같은 연결에서 같은 SQL 은 한 번만 PREPARE 하고 이후엔 EXECUTE 만 보냄.
+        반환 커서는 풀이 관리하므로 close 하지 말 것 (fetch 는 가능).
+          - mariadb : cursor(prepared=True) 를 연결별로 보관 (COM_STMT_EXECUTE 재사용)
+          - postgres: PREPARE ps_xxx AS ...($1..$n) / EXECUTE ps_xxx(%s, ...)
+        """
+        stmts = self._prepared.setdefault(id(conn), {})
+        hit = stmts.get(sql)
+        if self.driver == "postgres":
+            if hit is None:
+                name = "ps_" + hashlib.sha1(sql.encode("utf-8")).hexdigest()[:16]
+                cur = conn.cursor()
+                cur.execute(f"PREPARE {name} AS {_to_dollar_params(sql)}")
+                hit = stmts[sql] = (cur, name)
+            cur, name = hit
+            if params:
+                cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", tuple(params))
+            else:
+                cur.execute(f"EXECUTE {name}")
+            return cur
+        if hit is None:
+            hit = stmts[sql] = (conn.cursor(prepared=True), None)
+        cur = hit[0]
+        cur.execute(sql, tuple(params))
+        return cur
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {**self._stats, "name": self.name, "driver": self.driver,
+                    "size": self._size, "idle": len(self._idle),
+                    "in_use": self._size - len(self._idle), "max": self.maxconn}
+
+
+def _to_dollar_params(sql: str) -> str:
+    """%s 자리표시자 → $1, $2 ... (postgres PREPARE 용, %% 는 % 로)"""
+    out, n, i = [], 0, 0
+    while i < len(sql):
+        if sql.startswith("%s", i):
+            n += 1; out.append(f"${n}"); i += 2
+        elif sql.startswith("%%", i):
+            out.append("%"); i += 2
+        else:
+            out.append(sql[i]); i += 1
+    return "".join(out)
+
+
+# DB 풀 생성 함수
+def make_pool(section, ini_file):
+    cfg = configparser.ConfigParser(inline_comment_prefixes=(';', '#'))
+    cfg.read(ini_file, encoding="utf-8")
+    p = cfg[section]; drv = p.get("driver","postgres").lower()
+    if drv == "postgres":
+        import psycopg2
+        connect = lambda: psycopg2.connect(
+            host=p["host"], port=p["port"], dbname=p["dbname"],
+            user=p["user"], password=p["password"],
+            connect_timeout=int(p.get("connect_timeout", 10)))
+    else:
+        import mysql.connector
+        drv = "mariadb"
+        connect = lambda: mysql.connector.connect(
+            host=p["host"], port=int(p["port"]), database=p["dbname"],
+            user=p["user"], password=p["password"], autocommit=True,
+            connection_timeout=int(p.get("connect_timeout", 10)))
+    return ManagedPool(
+        section, connect, driver=drv,
+        minconn=int(p.get("pool_min", 1)), maxconn=int(p.get("pool_max", 10)),
+        timeout=float(p.get("pool_timeout", 30)),
+        max_lifetime=float(p.get("pool_max_lifetime", 1800)),
+        ping_after=float(p.get("pool_ping_after", 30)))
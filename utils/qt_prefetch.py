@@ -0,0 +1,205 @@
+# utils/qt_prefetch.py
+"""
+PyQt 검수 도구(image_review*.py / admin_review.py) 공용: 이미지 선읽기 + 바이트 상한 LRU
+
+    cache = PixmapLRU(max_bytes=256 << 20)
+    pf = Prefetcher(fetch=lambda key: bytes|None, size=(800, 600), workers=3)
+    pf = Prefetcher(fetch_many=lambda keys: {key: bytes}, batch=8)   # IN (...) 한 번에 여러 장
+    pf.loaded.connect(on_loaded)     # (key, blob, QImage)  — GUI 스레드에서 호출됨
+    pf.failed.connect(on_failed)     # (key, msg)
+    pf.request([cur, next1, prev1, next2, ...])   # 앞쪽일수록 먼저
+
+• DB 조회 + 디코딩 + 축소(QImage)는 QThreadPool 워커에서 → GUI 스레드는 QPixmap 변환만
+• fetch_many 를 주면 첫 키(현재 장)는 단독으로, 나머지는 batch 개씩 묶어 한 번에 조회
+• request() 마다 세대(generation) 증가: 아직 시작 안 한 작업은 버리고,
+  시작 전 확인에서 새 목록에 없는 키는 건너뜀 → 멀리 점프해도 옛 요청이 DB 를 막지 않음
+• 캐시는 원본 blob + 표시용 QPixmap 을 함께 보관, 합계 바이트가 max_bytes 를 넘으면 오래된 것부터 제거
+• PyQt5 필요 — 웹 앱(blueprints)에서는 import 하지 않음
+"""
+import threading
+import traceback
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, Qt, pyqtSignal
+from PyQt5.QtGui import QImage, QPixmap
+
+
+# === 바이트 상한 LRU (blob + QPixmap) ===
+class PixmapLRU:
+    def __init__(self, max_bytes: int = 256 << 20):
+        self.max_bytes = max_bytes
+        self._d = OrderedDict()      # key -> (blob, QPixmap|None, nbytes)
+        self._bytes = 0
+        self.hits = self.misses = 0
+
+    @staticmethod
+    def _cost(blob: Optional[bytes], pix: Optional[QPixmap]) -> int:
+        n = len(blob) if blob else 0
+        if pix is not None and not pix.isNull():
+            n += pix.width() * pix.height() * max(pix.depth(), 8) // 8
+        return n
+
+    def __contains__(self, key) -> bool:
+        return key in self._d
+
+    def __len__(self) -> int:
+        return len(self._d)
+
+    def put(self, key, blob: Optional[bytes], pix: Optional[QPixmap] = None):
+        old = self._d.pop(key, None)
+        if old:
+            self._bytes -= old[2]
+        n = self._cost(blob, pix)
+        self._d[key] = (blob, pix, n)
+        self._bytes += n
+        while self._bytes > self.max_bytes and len(self._d) > 1:
+            _, (_, _, m) = self._d.popitem(last=False)
+            self._bytes -= m
+
+    def _get(self, key):
+        e = self._d.get(key)
+        if e is None:
+            self.misses += 1
+            return None
+        self._d.move_to_end(key)
+        self.hits += 1
+        return e
+
+    def blob(self, key) -> Optional[bytes]:
+        e = self._get(key)
+        return e[0] if e else None
+
+    def pixmap(self, key) -> Optional[QPixmap]:
+        e = self._get(key)
+        return e[1] if e else None
+
+    def stats(self) -> dict:
+        return {"items": len(self._d), "bytes": self._bytes, "max_bytes": self.max_bytes,
+                "hits": self.hits, "misses": self.misses}
+
+
+def _fits(w: int, h: int, bw: int, bh: int) -> bool:
+    """KeepAspectRatio 로 (bw, bh) 에 맞춘 결과와 같은 크기인가"""
+    return (w == bw and h <= bh) or (h == bh and w <= bw)
+
+
+def decode_scaled(blob: bytes, size: Tuple[int, int]) -> QImage:
+    """blob → size 에 맞춘 QImage (워커 스레드에서 호출 가능, QPixmap 과 달리 스레드 안전)"""
+    img = QImage()
+    if not img.loadFromData(blob):
+        return QImage()
+    w, h = size
+    if not _fits(img.width(), img.height(), w, h):
+        img = img.scaled(w, h, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    return img
+
+
+def fit_pixmap(pix: QPixmap, size) -> QPixmap:
+    """라벨 크기(QSize)에 이미 맞으면 그대로, 아니면 축소/확대 (창 크기 변경 대비)"""
+    if pix.isNull() or _fits(pix.width(), pix.height(), size.width(), size.height()):
+        return pix
+    return pix.scaled(size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+
+# === 선읽기 스케줄러 ===
+class _Job(QRunnable):
+    def __init__(self, owner: "Prefetcher", keys: list, gen: int):
+        super().__init__()
+        self.owner, self.keys, self.gen = owner, keys, gen
+
+    def _emit(self, key, blob):
+        o = self.owner
+        if blob is None:
+            o.failed.emit(key, "이미지 없음")
+        else:
+            blob = bytes(blob)
+            o.loaded.emit(key, blob, decode_scaled(blob, o.size))
+
+    def run(self):
+        o = self.owner
+        keys = o._begin(self.keys, self.gen)
+        if not keys:
+            return
+        try:
+            if o.fetch_many is not None:
+                found = o.fetch_many(keys)
+                for k in keys:
+                    self._emit(k, found.get(k))
+            else:
+                for k in keys:
+                    self._emit(k, o.fetch(k))
+        except Exception:
+            for k in keys:
+                o.failed.emit(k, traceback.format_exc())
+        finally:
+            o._end(keys)
+
+
+class Prefetcher(QObject):
+    loaded = pyqtSignal(object, bytes, QImage)
+    failed = pyqtSignal(object, str)
+
+    def __init__(self, fetch: Callable[[object], Optional[bytes]] = None, size: Tuple[int, int] = (800, 600),
+                 workers: int = 3, cache: PixmapLRU = None, parent=None,
+                 fetch_many: Callable[[list], Dict[object, bytes]] = None, batch: int = 8):
+        super().__init__(parent)
+        self.fetch = fetch
+        self.fetch_many = fetch_many
+        self.batch = max(1, batch) if fetch_many is not None else 1
+        self.size = size
+        self.cache = cache
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(workers)
+        self._lock = threading.Lock()
+        self._gen = 0
+        self._wanted = set()
+        self._queued = set()         # 대기 중 + 실행 중 키
+        self._running = set()
+
+    def _begin(self, keys: list, gen: int) -> list:
+        """시작 직전 확인: 옛 세대 작업이면 새 목록에 남아 있는 키만 진행"""
+        with self._lock:
+            if gen != self._gen:
+                drop = [k for k in keys if k not in self._wanted]
+                self._queued.difference_update(drop)
+                keys = [k for k in keys if k in self._wanted]
+            self._running.update(keys)
+            return keys
+
+    def _end(self, keys: list):
+        with self._lock:
+            self._running.difference_update(keys)
+            self._queued.difference_update(keys)
+
+    def request(self, keys: Iterable):
+        """keys 순서대로 선읽기 (캐시에 있거나 이미 진행 중인 키는 제외)"""
+        keys = list(dict.fromkeys(keys))
+        self.pool.clear()                      # 아직 시작 안 한 옛 작업 버림
+        with self._lock:
+            self._gen += 1
+            gen = self._gen
+            self._wanted = set(keys)
+            self._queued = set(self._running)
+            todo = [k for k in keys
+                    if k not in self._queued and (self.cache is None or k not in self.cache)]
+            self._queued.update(todo)
+        jobs = [todo[:1]] + [todo[i:i + self.batch] for i in range(1, len(todo), self.batch)]
+        for prio, keys in enumerate(j for j in jobs if j):
+            self.pool.start(_Job(self, keys, gen), len(jobs) - prio)
+
+    def shutdown(self, msecs: int = 3000):
+        with self._lock:
+            self._gen += 1
+            self._wanted = set()
+        self.pool.clear()
+        self.pool.waitForDone(msecs)
+
+
+def neighbours(idx: int, n: int, ahead: int, step: int = 1):
+    """idx 기준 선읽기 순서: 현재 → 진행 방향 1칸 → 반대 1칸 → 2칸 … (원형 목록)"""
+    d = -1 if step < 0 else 1
+    out = [idx]
+    for i in range(1, ahead + 1):
+        out += [(idx + d * i) % n, (idx - d * i) % n]
+    return list(dict.fromkeys(out))
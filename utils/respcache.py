@@ -0,0 +1,203 @@
+# utils/respcache.py
+"""
+읽기 위주 API 응답 캐시 (TTL + 태그 무효화)
+
+    @sign_bp.route("/detail/<ad_id>")
+    @cached(ttl=300, tags=lambda ad_id: [f"sign:{ad_id}"])
+    def api_sign_detail(ad_id): ...
+
+    purge("sign:123", "cpn:45")      # 쓰기 API 에서 호출
+
+• 캐시 키 = 엔드포인트 + path + 정렬된 query string
+• 태그마다 버전 번호를 두고 항목에 저장 당시 버전을 기록 → purge 는 버전 증가만 (O(1))
+• 백엔드
+    - MemoryBackend : 프로세스 내 dict
+    - FileBackend   : DATA_DIR/resp_cache 파일 (gunicorn 워커 간 공유)
+  RESP_CACHE_BACKEND=memory|file 로 선택 (기본 file)
+• 200 JSON 응답만 저장, ?nocache=1 로 우회
+"""
+import functools
+import hashlib
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from flask import current_app, request
+
+
+class MemoryBackend:
+    def __init__(self, max_items: int = 5000):
+        self.max_items = max_items
+        self._lock = threading.Lock()
+        self._items = {}
+        self._tags = {}
+
+    def get(self, key):
+        with self._lock:
+            return self._items.get(key)
+
+    def set(self, key, value):
+        with self._lock:
+            if len(self._items) >= self.max_items:
+                # 만료 시각이 가장 이른 10% 제거
+                drop = sorted(self._items, key=lambda k: self._items[k][0])[: max(1, self.max_items // 10)]
+                for k in drop:
+                    del self._items[k]
+            self._items[key] = value
+
+    def tag_version(self, tag) -> int:
+        with self._lock:
+            return self._tags.get(tag, 0)
+
+    def bump(self, tag):
+        with self._lock:
+            self._tags[tag] = self._tags.get(tag, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._tags.clear()
+
+
+class FileBackend:
+    """
+    항목: items/<sha1>.pkl  (pickle: (expires, tag_versions, status, headers, body)), 파일 mtime = expires
+    태그: tags/<sha1>  파일 크기 = 버전 (bump 는 1바이트 append → 원자적, 락 불필요)
+    정리: sweep_every 번 쓸 때마다 만료 항목 삭제 (stat 만), 그래도 max_items 초과면 만료가 이른 것부터 삭제
+    """
+
+    def __init__(self, root, max_items: int = 20000, sweep_every: int = 500):
+        self.root = Path(root)
+        self.items = self.root / "items"
+        self.tags = self.root / "tags"
+        self.items.mkdir(parents=True, exist_ok=True)
+        self.tags.mkdir(parents=True, exist_ok=True)
+        self.max_items = max_items
+        self.sweep_every = sweep_every
+        self._writes = 0
+        self._sweep_lock = threading.Lock()
+
+    @staticmethod
+    def _h(s: str) -> str:
+        return hashlib.sha1(s.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        p = self.items / f"{self._h(key)}.pkl"
+        try:
+            with open(p, "rb") as f:
+                return pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def set(self, key, value):
+        p = self.items / f"{self._h(key)}.pkl"
+        tmp = p.with_name(f".{p.name}.{os.getpid()}.{threading.get_ident()}")
+        with open(tmp, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.utime(tmp, (value[0], value[0]))      # sweep 이 stat 만으로 만료 판단
+        os.replace(tmp, p)
+        self._writes += 1
+        if self._writes % self.sweep_every == 0 and self._sweep_lock.acquire(blocking=False):
+            # 다른 스레드가 정리 중이면 건너뜀 (요청 지연 최소화)
+            try:
+                self.sweep()
+            finally:
+                self._sweep_lock.release()
+
+    def tag_version(self, tag) -> int:
+        try:
+            return (self.tags / self._h(tag)).stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def bump(self, tag):
+        with open(self.tags / self._h(tag), "ab") as f:
+            f.write(b".")
+
+    def clear(self):
+        for p in self.items.glob("*.pkl"):
+            p.unlink(missing_ok=True)
+
+    def sweep(self):
+        """만료(mtime < 지금) 항목 삭제 → 남은 수가 max_items 를 넘으면 만료가 이른 것부터 90% 까지 줄임"""
+        now = time.time()
+        alive = []
+        for p in self.items.glob("*.pkl"):
+            try:
+                expires = p.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if expires < now:
+                p.unlink(missing_ok=True)
+            else:
+                alive.append((expires, p))
+        if len(alive) <= self.max_items:
+            return
+        alive.sort()
+        for _, p in alive[: len(alive) - int(self.max_items * 0.9)]:
+            p.unlink(missing_ok=True)
+
+
+def make_backend(kind: str, root) -> object:
+    return MemoryBackend() if kind == "memory" else FileBackend(root)
+
+
+def _backend():
+    return current_app.config.get("RESP_CACHE")
+
+
+def _cache_key() -> str:
+    args = "&".join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True)) if k != "nocache")
+    return f"{request.endpoint}|{request.path}|{args}"
+
+
+def cached(ttl: float = 60, tags: Optional[Callable[..., Iterable[str]]] = None):
+    """
+    tags: view 인자(kwargs)를 받아 태그 목록을 돌려주는 함수.
+          ("*" 태그는 모든 항목에 자동 포함 → purge("*") 로 전체 무효화)
+    """
+    def deco(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            be = _backend()
+            if be is None or request.args.get("nocache") == "1":
+                return view(*args, **kwargs)
+
+            key = _cache_key()
+            tag_list = ["*"] + list(tags(**kwargs) if tags else [])
+            hit = be.get(key)
+            if hit is not None:
+                expires, versions, status, headers, body = hit
+                if expires > time.time() and all(be.tag_version(t) == v for t, v in versions):
+                    resp = current_app.response_class(body, status=status, headers=headers)
+                    resp.headers["X-Cache"] = "HIT"
+                    return resp
+
+            versions = [(t, be.tag_version(t)) for t in tag_list]   # 계산 전 버전 → 경합 시 안전측
+            rv = current_app.make_response(view(*args, **kwargs))
+            if rv.status_code == 200 and rv.mimetype == "application/json" and not rv.is_streamed:
+                headers = [(k, v) for k, v in rv.headers.items() if k.lower() in ("content-type",)]
+                be.set(key, (time.time() + ttl, versions, rv.status_code, headers, rv.get_data()))
+                rv.headers["X-Cache"] = "MISS"
+            return rv
+        return wrapper
+    return deco
+
+
+def tag_version(tag: str) -> Optional[int]:
+    """태그 현재 버전 (캐시 백엔드가 없으면 None)"""
+    be = _backend()
+    return be.tag_version(tag) if be is not None else None
+
+
+def purge(*tags: str):
+    """쓰기 API 에서 호출 → 해당 태그가 달린 캐시 항목 무효화"""
+    be = _backend()
+    if be is None:
+        return
+    for t in tags:
+        if t:
+            be.bump(t)
@@ -0,0 +1,93 @@
+# utils/schema.py
+"""
+테이블 컬럼 목록 캐시 (information_schema 조회를 프로세스당 1회로)
+
+• (dialect, table) 별로 컬럼 튜플 보관, TTL 지나면 다음 사용 시 재조회
+• invalidate() 로 명시적 무효화 → generation 증가 (파생 스냅샷 재계산 신호)
+"""
+import os
+import threading
+import time
+from typing import Callable, Dict, Tuple
+
+
+def query_columns(conn, dialect: str, table: str) -> Tuple[str, ...]:
+    cur = conn.cursor()
+    try:
+        if dialect == "postgresql":
+            cur.execute("""
+                SELECT column_name
+                  FROM information_schema.columns
+                 WHERE table_schema = 'public' AND table_name = %s
+                 ORDER BY ordinal_position
+            """, (table,))
+            cols = [r[0] for r in cur.fetchall()]
+        elif dialect == "mysql":
+            cur.execute("""
+                SELECT column_name
+                  FROM information_schema.columns
+                 WHERE table_schema = DATABASE() AND table_name = %s
+                 ORDER BY ordinal_position
+            """, (table,))
+            cols = [r[0] for r in cur.fetchall()]
+        else:  # sqlite
+            cur.execute(f"PRAGMA table_info({table})")
+            cols = [r[1] for r in cur.fetchall()]
+        return tuple(cols)
+    finally:
+        cur.close()
+
+
+class SchemaCache:
+    def __init__(self, ttl: float = 600.0, loader: Callable = query_columns):
+        self.ttl = float(ttl)
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._cols: Dict[Tuple[str, str], Tuple[float, Tuple[str, ...]]] = {}
+        self.generation = 0
+
+    def columns(self, conn, dialect: str, table: str) -> Tuple[str, ...]:
+        key = (dialect, table.split(".")[-1])
+        now = time.monotonic()
+        with self._lock:
+            hit = self._cols.get(key)
+            if hit and now - hit[0] < self.ttl:
+                return hit[1]
+        cols = self._loader(conn, dialect, key[1])
+        with self._lock:
+            old = self._cols.get(key)
+            if old is not None and old[1] != cols:
+                self.generation += 1
+            self._cols[key] = (now, cols)
+        return cols
+
+    def peek(self, dialect: str, table: str):
+        """캐시에 살아있는 컬럼 튜플 (없거나 만료면 None) — 연결 없이 확인용"""
+        with self._lock:
+            hit = self._cols.get((dialect, table.split(".")[-1]))
+        return hit[1] if hit and time.monotonic() - hit[0] < self.ttl else None
+
+    def invalidate(self, table: str = None):
+        with self._lock:
+            if table is None:
+                self._cols.clear()
+            else:
+                t = table.split(".")[-1]
+                for k in [k for k in self._cols if k[1] == t]:
+                    del self._cols[k]
+            self.generation += 1
+
+
+SCHEMA = SchemaCache(ttl=float(os.getenv("SCHEMA_CACHE_TTL", "600")))
+
+
+def pool_columns(pool, table: str) -> Tuple[str, ...]:
+    """ManagedPool 기준 컬럼 목록 (캐시 hit 이면 연결을 빌리지 않음)"""
+    cols = SCHEMA.peek(pool.dialect, table)
+    if cols is not None:
+        return cols
+    conn = pool.getconn()
+    try:
+        return SCHEMA.columns(conn, pool.dialect, table)
+    finally:
+        pool.putconn(conn)
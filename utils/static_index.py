@@ -0,0 +1,155 @@
+# utils/static_index.py
+"""
+static/images 파일명 인덱스: (동, 번지) → 사진 목록
+
+• 파일명 규칙 {dong}_{bunji}_*.jpg|png → 키 (NFC 정규화, 앞뒤 공백 제거)
+• 시작 시 1회 scandir 로 적재 (백그라운드), 이후 조회 때 디렉토리 mtime 을
+  poll 초마다 확인 → 바뀌었을 때만 추가/삭제/변경 파일 반영 (새 파일만 헤더 읽기)
+  덮어쓰기처럼 디렉토리 mtime 이 안 바뀌는 변경은 full_every 초마다 전체 비교로 반영
+• 항목: name, w, h (PIL 헤더만 읽음 — 픽셀 디코딩 없음), bytes, mtime
+• 조회는 dict 1회 → 폴더 크기와 무관
+"""
+import os
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+IMAGE_EXTS = (".jpg", ".png")
+
+
+def _norm(s) -> str:
+    return unicodedata.normalize("NFC", str(s or "")).strip()
+
+
+def parse_key(name: str) -> Optional[Tuple[str, str]]:
+    stem, ext = os.path.splitext(name)
+    if ext.lower() not in IMAGE_EXTS:
+        return None
+    parts = _norm(stem).split("_")
+    if len(parts) < 3 or not parts[0] or not parts[1]:
+        return None
+    return parts[0], parts[1]
+
+
+def read_size(path) -> Tuple[Optional[int], Optional[int]]:
+    try:
+        from PIL import Image
+        with Image.open(path) as im:          # 헤더만 파싱
+            return im.size
+    except Exception:
+        return None, None
+
+
+class StaticImageIndex:
+    def __init__(self, base_dir, poll: float = 2.0, full_every: float = 300.0):
+        self.base = Path(base_dir)
+        self.poll = poll
+        self.full_every = full_every
+        self._lock = threading.Lock()
+        self._scan_lock = threading.Lock()
+        self._files: Dict[str, dict] = {}                      # name -> entry
+        self._by_key: Dict[Tuple[str, str], Dict[str, dict]] = {}
+        self._dir_mtime = None
+        self._checked = 0.0
+        self._full_at = 0.0
+        self.ready = threading.Event()
+        self._started = False
+        self.stats = {"scans": 0, "added": 0, "removed": 0, "changed": 0}
+
+    # ---------- 적재 / 갱신 ----------
+    def start(self):
+        """백그라운드 초기 적재 (적재 전 조회는 끝날 때까지 대기)"""
+        self._started = True
+
+        def run():
+            try:
+                self.refresh(force=True)
+            finally:
+                self.ready.set()
+        threading.Thread(target=run, daemon=True).start()
+        return self
+
+    def _dir_stamp(self):
+        try:
+            return self.base.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def refresh(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self._checked < self.poll:
+            return
+        with self._scan_lock:
+            if not force and time.monotonic() - self._checked < self.poll:
+                return
+            self._checked = time.monotonic()
+            stamp = self._dir_stamp()
+            full_due = time.monotonic() - self._full_at >= self.full_every
+            if not force and stamp == self._dir_mtime and not full_due:
+                return
+            self._scan(stamp)
+            self.ready.set()
+
+    def _scan(self, stamp):
+        seen = {}
+        if stamp is not None:
+            with os.scandir(self.base) as it:
+                for de in it:
+                    if parse_key(de.name) and de.is_file():
+                        st = de.stat()
+                        seen[de.name] = (st.st_mtime_ns, st.st_size)
+
+        with self._lock:
+            old = self._files
+        added = [n for n in seen if n not in old]
+        changed = [n for n in seen if n in old and (old[n]["mtime_ns"], old[n]["bytes"]) != seen[n]]
+        removed = [n for n in old if n not in seen]
+
+        fresh = {}
+        for n in added + changed:                   # 새/바뀐 파일만 헤더 읽기 (락 밖)
+            w, h = read_size(self.base / n)
+            mtime_ns, size = seen[n]
+            fresh[n] = {"name": n, "key": parse_key(n), "w": w, "h": h, "bytes": size,
+                        "mtime_ns": mtime_ns, "mtime": mtime_ns / 1e9}
+
+        with self._lock:
+            for n in removed:
+                e = self._files.pop(n)
+                bucket = self._by_key.get(e["key"])
+                if bucket is not None:
+                    bucket.pop(n, None)
+                    if not bucket:
+                        del self._by_key[e["key"]]
+            for n, e in fresh.items():
+                self._files[n] = e
+                self._by_key.setdefault(e["key"], {})[n] = e
+            self._dir_mtime = stamp
+            self._full_at = time.monotonic()
+            self.stats["scans"] += 1
+            self.stats["added"] += len(added)
+            self.stats["changed"] += len(changed)
+            self.stats["removed"] += len(removed)
+
+    # ---------- 조회 ----------
+    def find(self, dong, bunji) -> List[dict]:
+        if not self.ready.is_set():
+            if self._started:
+                self.ready.wait(30)
+            else:
+                self.refresh(force=True)
+        self.refresh()
+        with self._lock:
+            bucket = self._by_key.get((_norm(dong), _norm(bunji))) or {}
+            return [dict(e) for _, e in sorted(bucket.items())]
+
+    def get(self, name: str) -> Optional[dict]:
+        self.refresh()
+        with self._lock:
+            e = self._files.get(name)
+            return dict(e) if e else None
+
+    def info(self) -> dict:
+        with self._lock:
+            return {"files": len(self._files), "keys": len(self._by_key), **self.stats}
@@ -0,0 +1,46 @@
+# utils/thumbs.py
+"""
+간판 이미지 썸네일(파생 이미지) 생성
+
+• ?w= / ?h= 요청 크기는 몇 단계 버킷으로 올림 → 파생본 종류 수 제한
+• JPEG 은 Image.draft() 로 DCT 단계에서 1/2·1/4·1/8 축소 디코딩 (전체 디코딩 안 함)
+• 파생본 키는 원본 내용 해시 기반 → 원본이 바뀌면 키도 바뀌므로 별도 무효화 불필요
+"""
+import io
+from typing import Optional, Tuple
+
+from PIL import Image
+
+SIZE_STEPS = (50, 100, 150, 200, 300, 400, 600, 800, 1200)
+
+
+def _bucket(v: Optional[int], limit: int) -> int:
+    if not v or v <= 0:
+        return limit
+    for step in SIZE_STEPS:
+        if v <= step:
+            return min(step, limit)
+    return limit
+
+
+def thumb_box(w: Optional[int], h: Optional[int], max_w: int, max_h: int) -> Tuple[int, int]:
+    """요청 크기 → (버킷 폭, 버킷 높이). 지정 안 된 축은 최대값"""
+    return _bucket(w, max_w), _bucket(h, max_h)
+
+
+def derivative_key(src_etag: str, box: Tuple[int, int]) -> str:
+    return f"drv_{src_etag}_{box[0]}x{box[1]}"
+
+
+def make_thumbnail(data: bytes, box: Tuple[int, int], quality: int = 85) -> bytes:
+    """box 안에 들어오도록 비율 유지 축소한 JPEG 반환 (이미 작으면 원본 그대로)"""
+    img = Image.open(io.BytesIO(data))
+    if img.width <= box[0] and img.height <= box[1] and img.format == "JPEG":
+        return data
+    if img.format == "JPEG":
+        img.draft("RGB", box)       # DCT 도메인 축소 (box 이상 크기 중 가장 작은 배율)
+    img = img.convert("RGB")
+    img.thumbnail(box, Image.LANCZOS)
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=quality, optimize=True)
+    return buf.getvalue()
@@ -0,0 +1,245 @@
+# utils/upload_store.py
+"""
+업로드(엑셀) 1건 = SQLite 파일 1개 : DATA_DIR/uploads/<upload_id>.sqlite3
+
+• rows   : idx(0부터 연속) → ad_idx, 행 데이터(JSON), 전체 주소, 현재 검수 상태
+           idx 가 PRIMARY KEY 라 n번째 행 조회는 인덱스 1회 탐색 (전체 로딩 없음)
+• events : 검수 결과/이동 기록 (append-only) — rows.status 는 마지막 결과의 요약본
+• meta   : reviewer / columns / cursor / 적재 진행 상황(status, done, total, skipped, error)
+• 적재는 청크 단위 append_rows() → 메모리는 청크 크기만큼만 사용
+• 정리: 예전 {upload_id}.json 은 첫 접근 시 SQLite 로 옮기고 삭제,
+        보관 기간 지난 업로드는 expire_uploads() 로 삭제
+"""
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS rows (
+        idx        INTEGER PRIMARY KEY,
+        ad_idx     TEXT NOT NULL,
+        data       TEXT NOT NULL,
+        addr_full  TEXT NOT NULL DEFAULT '',
+        status     TEXT,
+        comment    TEXT,
+        updated_at REAL
+    );
+    CREATE INDEX IF NOT EXISTS ix_rows_ad_idx ON rows(ad_idx);
+    CREATE TABLE IF NOT EXISTS events (
+        seq      INTEGER PRIMARY KEY AUTOINCREMENT,
+        idx      INTEGER NOT NULL,
+        kind     TEXT NOT NULL,
+        value    TEXT,
+        reviewer TEXT,
+        at       REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v TEXT);
+"""
+
+
+def store_path(data_dir, upload_id: str) -> Path:
+    return Path(data_dir) / "uploads" / f"{upload_id}.sqlite3"
+
+
+def legacy_json_path(data_dir, upload_id: str) -> Path:
+    return Path(data_dir) / f"{upload_id}.json"
+
+
+class UploadStore:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.conn = sqlite3.connect(str(self.path), timeout=10, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.executescript(_SCHEMA)
+
+    # ---------- 생성/열기 ----------
+    @classmethod
+    def create(cls, path, reviewer: str, columns: Sequence[str], source: str = ""):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        st = cls(path)
+        st.set_meta(reviewer=reviewer, columns=list(columns), source=source, cursor=0,
+                    created_at=time.time(), status="loading", done=0, total=None, skipped=0, error=None)
+        return st
+
+    @classmethod
+    def open(cls, path) -> Optional["UploadStore"]:
+        return cls(path) if Path(path).exists() else None
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------- meta ----------
+    def set_meta(self, **kv):
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO meta (k, v) VALUES (?, ?)",
+                                  [(k, json.dumps(v, ensure_ascii=False)) for k, v in kv.items()])
+
+    def get_meta(self, k, default=None):
+        r = self.conn.execute("SELECT v FROM meta WHERE k=?", (k,)).fetchone()
+        return json.loads(r[0]) if r else default
+
+    def meta(self) -> dict:
+        return {k: json.loads(v) for k, v in self.conn.execute("SELECT k, v FROM meta")}
+
+    def progress(self) -> dict:
+        m = self.meta()
+        return {k: m.get(k) for k in ("status", "done", "total", "skipped", "error")}
+
+    # ---------- rows ----------
+    def append_rows(self, rows: Iterable[Tuple[str, dict, str]]) -> int:
+        """rows: (ad_idx, data, addr_full) — idx 는 이어서 부여. 추가된 행 수 반환"""
+        start = self.count()
+        batch = [(start + i, ad, json.dumps(d, ensure_ascii=False), addr or "")
+                 for i, (ad, d, addr) in enumerate(rows)]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO rows (idx, ad_idx, data, addr_full) VALUES (?, ?, ?, ?)", batch)
+        return len(batch)
+
+    def count(self) -> int:
+        # idx 는 0부터 연속 → MAX(idx)+1 (PK 끝 탐색, 전체 스캔 없음)
+        return self.conn.execute("SELECT COALESCE(MAX(idx) + 1, 0) FROM rows").fetchone()[0]
+
+    def row(self, idx: int) -> Optional[dict]:
+        r = self.conn.execute(
+            "SELECT ad_idx, data, addr_full, status, comment FROM rows WHERE idx=?", (idx,)).fetchone()
+        if r is None:
+            return None
+        return {"index": idx, "ad_idx": r[0], "row": json.loads(r[1]), "addr_full": r[2],
+                "status": r[3], "comment": r[4]}
+
+    def find(self, ad_idx) -> List[int]:
+        return [r[0] for r in self.conn.execute(
+            "SELECT idx FROM rows WHERE ad_idx=? ORDER BY idx", (str(ad_idx),))]
+
+    # ---------- cursor / 검수 상태 ----------
+    def cursor(self) -> int:
+        return int(self.get_meta("cursor", 0) or 0)
+
+    def move(self, index: int = None, step: int = 0, reviewer: str = None) -> int:
+        """cursor 를 index 로(또는 step 만큼) 옮기고 [0, count-1] 로 고정 → 새 cursor"""
+        n = self.count()
+        i = self.cursor() + step if index is None else index
+        i = max(0, min(i, n - 1)) if n else 0
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (k, v) VALUES ('cursor', ?)", (json.dumps(i),))
+            self.conn.execute("INSERT INTO events (idx, kind, value, reviewer, at) VALUES (?, 'nav', NULL, ?, ?)",
+                              (i, reviewer, time.time()))
+        return i
+
+    def set_status(self, idx: int, status: str, comment: str = "", reviewer: str = None) -> bool:
+        """검수 결과 기록: events 에 추가 + rows 요약 갱신 (한 트랜잭션)"""
+        now = time.time()
+        with self.conn:
+            cur = self.conn.execute(
+                "UPDATE rows SET status=?, comment=?, updated_at=? WHERE idx=?",
+                (status, comment, now, idx))
+            if not cur.rowcount:
+                return False
+            self.conn.execute(
+                "INSERT INTO events (idx, kind, value, reviewer, at) VALUES (?, 'status', ?, ?, ?)",
+                (idx, json.dumps({"status": status, "comment": comment}, ensure_ascii=False), reviewer, now))
+        return True
+
+    def status_counts(self) -> dict:
+        return {(s or "pending"): n for s, n in
+                self.conn.execute("SELECT status, COUNT(*) FROM rows GROUP BY status")}
+
+    def events(self, idx: int = None, limit: int = 100) -> List[dict]:
+        sql = "SELECT seq, idx, kind, value, reviewer, at FROM events"
+        params: tuple = ()
+        if idx is not None:
+            sql += " WHERE idx=?"
+            params = (idx,)
+        sql += " ORDER BY seq DESC LIMIT ?"
+        return [{"seq": r[0], "index": r[1], "kind": r[2],
+                 "value": json.loads(r[3]) if r[3] else None, "reviewer": r[4], "at": r[5]}
+                for r in self.conn.execute(sql, params + (limit,))]
+
+    def compact(self):
+        """이동(nav) 기록은 마지막 것만 남기고 VACUUM"""
+        with self.conn:
+            self.conn.execute("DELETE FROM events WHERE kind='nav' AND seq < "
+                              "(SELECT COALESCE(MAX(seq), 0) FROM events WHERE kind='nav')")
+        self.conn.execute("VACUUM")
+
+
+# === 예전 JSON 업로드 → SQLite ===
+def migrate_legacy_json(data_dir, upload_id: str, id_col: str) -> Optional[UploadStore]:
+    """{upload_id}.json ({rows, addr_full, reviewer}) 이 있으면 store 로 옮기고 JSON 삭제"""
+    src = legacy_json_path(data_dir, upload_id)
+    if not src.exists():
+        return None
+    with src.open("r", encoding="utf-8") as f:
+        data = json.load(f)
+    rows = data.get("rows") or []
+    addr = data.get("addr_full") or []
+    dst = store_path(data_dir, upload_id)
+    tmp = dst.with_suffix(".tmp")
+    tmp.unlink(missing_ok=True)
+    st = UploadStore.create(tmp, data.get("reviewer", ""), list(rows[0].keys()) if rows else [],
+                            source=src.name)
+    st.append_rows((str(r.get(id_col, "")), r, str(addr[i]) if i < len(addr) else "")
+                   for i, r in enumerate(rows))
+    st.set_meta(status="done", done=len(rows), total=len(rows), created_at=src.stat().st_mtime)
+    st.close()
+    os.replace(tmp, dst)
+    src.unlink()
+    return UploadStore(dst)
+
+
+# === 오래된 업로드 정리 ===
+def expire_uploads(data_dir, upload_folder, max_age_days: float, id_col: str) -> dict:
+    """
+    • 보관 기간 지난 store / 예전 JSON / 원본 엑셀 삭제
+    • 남은 예전 JSON 은 SQLite 로 옮김 (재파싱 비용 제거)
+    • 하루 이상 쉬고 있는 store 는 nav 기록 압축 + VACUUM
+    """
+    data_dir = Path(data_dir)
+    cutoff = time.time() - max_age_days * 86400
+    stats = {"expired": 0, "migrated": 0, "compacted": 0}
+
+    for p in list(data_dir.glob("*.json")):
+        upload_id = p.stem
+        if len(upload_id) != 32 or not all(c in "0123456789abcdef" for c in upload_id):
+            continue                                  # upload_id(uuid hex) 형식만
+        if p.stat().st_mtime < cutoff:
+            p.unlink(missing_ok=True)
+            stats["expired"] += 1
+        else:
+            try:
+                st = migrate_legacy_json(data_dir, upload_id, id_col)
+                if st:
+                    st.close()
+                    stats["migrated"] += 1
+            except (ValueError, OSError):
+                pass
+
+    for p in list((data_dir / "uploads").glob("*.sqlite3")):
+        wal = p.with_name(p.name + "-wal")
+        touched = max(p.stat().st_mtime, wal.stat().st_mtime if wal.exists() else 0)
+        if touched >= cutoff:
+            if touched < time.time() - 86400:       # 하루 이상 손대지 않은 업로드 → nav 기록 압축
+                with UploadStore(p) as st:
+                    if st.conn.execute("SELECT COUNT(*) FROM events WHERE kind='nav'").fetchone()[0] > 1:
+                        st.compact()
+                        stats["compacted"] += 1
+            continue
+        for side in (p, p.with_name(p.name + "-wal"), p.with_name(p.name + "-shm")):
+            side.unlink(missing_ok=True)
+        for src in Path(upload_folder).glob(f"{p.stem}.*"):
+            src.unlink(missing_ok=True)
+        stats["expired"] += 1
+    return stats
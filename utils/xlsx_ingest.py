@@ -0,0 +1,104 @@
+# utils/xlsx_ingest.py
+"""
+검수 엑셀 → UploadStore 스트리밍 적재
+
+• .xlsx : openpyxl read_only + iter_rows(values_only) → 한 번에 한 행만 메모리에
+• .xls  : openpyxl 미지원 → pandas.read_excel 후 같은 경로로 청크 처리 (구형 포맷 한정)
+• 헤더 행에서 컬럼 위치를 찾고(앞뒤 공백·대소문자 무시), 없는 확장 컬럼은 "" 로 채움
+• ad_idx 가 빈 행은 건너뜀(skipped), 7800.0 같은 정수형 실수는 "7800" 으로 정규화
+• chunk 행마다 store.append_rows + 진행 상황(done/total) 기록
+"""
+import math
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+class IngestError(Exception):
+    """필수 컬럼 누락 등 적재 불가"""
+
+
+def _cell(v) -> str:
+    if v is None:
+        return ""
+    if isinstance(v, float):
+        if math.isnan(v):
+            return ""
+        if v.is_integer():
+            return str(int(v))
+    return str(v).strip()
+
+
+def _iter_xlsx(path) -> Tuple[Optional[int], Iterator[Sequence]]:
+    from openpyxl import load_workbook
+    wb = load_workbook(path, read_only=True, data_only=True)
+    ws = wb.worksheets[0]
+    total = (ws.max_row - 1) if ws.max_row else None
+
+    def rows():
+        try:
+            yield from ws.iter_rows(values_only=True)
+        finally:
+            wb.close()
+    return total, rows()
+
+
+def _iter_xls(path) -> Tuple[Optional[int], Iterator[Sequence]]:
+    import pandas as pd
+    df = pd.read_excel(path, header=None, dtype=object)
+
+    def rows():
+        for rec in df.itertuples(index=False, name=None):
+            yield rec
+    return len(df) - 1, rows()
+
+
+def iter_sheet(path) -> Tuple[Optional[int], Iterator[Sequence]]:
+    """(데이터 행 수 추정치, 헤더 포함 행 iterator)"""
+    if str(path).lower().endswith(".xls"):
+        return _iter_xls(path)
+    return _iter_xlsx(path)
+
+
+def _locate(header: Sequence, wanted: Sequence[str]) -> Dict[str, Optional[int]]:
+    pos = {}
+    for i, h in enumerate(header):
+        key = _cell(h).lower()
+        if key and key not in pos:
+            pos[key] = i
+    return {w: pos.get(w.lower()) for w in wanted}
+
+
+def ingest(path, store, id_col: str, view_cols: Sequence[str], addr_col: str,
+           chunk: int = 1000, on_progress: Callable[[int, Optional[int]], None] = None) -> int:
+    """path 를 읽어 store 에 적재 → 적재 행 수. 필수 컬럼(id_col) 없으면 IngestError"""
+    total, it = iter_sheet(path)
+    header = next(it, None)
+    if header is None:
+        raise IngestError("빈 시트입니다.")
+    where = _locate(header, list(view_cols) + [addr_col])
+    if where[id_col] is None:
+        raise IngestError(f"필수 컬럼 '{id_col}' 이(가) 없습니다.")
+
+    def get(r, col):
+        i = where.get(col)
+        return _cell(r[i]) if i is not None and i < len(r) else ""
+
+    done = skipped = 0
+    buf: List[Tuple[str, dict, str]] = []
+    for r in it:
+        ad = get(r, id_col)
+        if not ad:
+            skipped += 1
+            continue
+        buf.append((ad, {c: get(r, c) for c in view_cols}, get(r, addr_col)))
+        if len(buf) >= chunk:
+            done += store.append_rows(buf)
+            buf = []
+            store.set_meta(done=done, total=total, skipped=skipped)
+            if on_progress:
+                on_progress(done, total)
+    if buf:
+        done += store.append_rows(buf)
+    store.set_meta(done=done, total=done + skipped, skipped=skipped)
+    if on_progress:
+        on_progress(done, done + skipped)
+    return done